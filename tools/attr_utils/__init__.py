@@ -3,5 +3,6 @@
 from .arr_attrs import ArrAttrs
 from .seg_attrs import SegAttrs
 from .grp_attrs import GrpAttrs
+from .heating_program import HeatingPrograms
 
-__all__ = ['ArrAttrs', 'SegAttrs', 'GrpAttrs']
+__all__ = ['ArrAttrs', 'SegAttrs', 'GrpAttrs', 'HeatingPrograms']
@@ -1,6 +1,9 @@
 '''Support for array attributes.'''
 
-from typing import TypeAlias, ClassVar, Union, Optional, Any
+from typing import TypeAlias, ClassVar, Union, Optional, Any, Iterable
+from collections import defaultdict
+import json
+import os
 import re
 
 import numpy as np
@@ -12,6 +15,8 @@ from gemd import (
 )
 from gemd.entity.template.attribute_template import AttributeTemplate
 from gemd.entity.attribute.base_attribute import BaseAttribute
+from gemd.entity.bounds_validation import WarningLevel, get_validation_level, validation_level
+from gemd.units import parse_units
 
 from .base_special_attrs import BaseSpecialAttrs
 from .utils import AttrTypes, attr_template_dict, generate_tags, generate_source
@@ -29,13 +34,20 @@ class ArrAttrs(BaseSpecialAttrs):
 
     If there are multiple arrays, each array must have the same attributes
     and the same length.
+
+    Multiple attributes can also be kept out of the measurement, in a compact
+    NumPy side file linked by a ``FileLink`` (see `write_side_file`). They are
+    only turned into GEMD attributes when the attribute ``DataFrame``s are
+    accessed or `materialize` is called, while `values`, `units`, and
+    `origins` read the side file directly.
     '''
 
     ARR: ClassVar[str] = '_arr'
     IDX: ClassVar[str] = '_idx'
     RE: ClassVar[re.Pattern] = re.compile(f'^(.+){ARR}(\\d+)(?:{IDX}(\\d+))?$')
+    SIDE_FILE_SUFFIX: ClassVar[str] = '.arr.npz'
 
-    def __init__(self, measurement: Measurement) -> None:
+    def __init__(self, measurement: Measurement, dump_dir: Optional[str] = None) -> None:
         '''
         Parse a measurement's array attributes and create ``DataFrame``s
         for the conditions, parameters, and properties.
@@ -47,6 +59,10 @@ class ArrAttrs(BaseSpecialAttrs):
         ----------
         measurement: MeasurementSpec or MeasurementRun
             Measurement containing appropriately-named array attributes.
+        dump_dir: str, optional
+            Folder the measurement was dumped to or loaded from. Relative urls
+            of side files are resolved against it, see `write_side_file`.
+            Defaults to the current directory.
         '''        
 
         self._measurement = measurement
@@ -76,6 +92,18 @@ class ArrAttrs(BaseSpecialAttrs):
 
         self._reindex_all_dfs()
 
+        # (kind, multiple) -> (nominal values, units, origins), see values()
+        self._values_cache: dict[tuple[str, bool], tuple[pd.DataFrame, ...]] = {}
+
+        # whether attribute names lag behind their position in the DataFrames, see update_object()
+        self._names_stale: bool = False
+
+        # side files whose attributes are not created yet, see materialize()
+        self._side_files: list[str] = [
+            os.path.join(dump_dir or '', link.url) for link in measurement.file_links
+            if link.filename.endswith(self.SIDE_FILE_SUFFIX)
+        ]
+
     @property
     def measurement(self) -> Measurement:
         '''The measurement containing these attributes.'''
@@ -84,11 +112,13 @@ class ArrAttrs(BaseSpecialAttrs):
     @property
     def single_conditions(self) -> pd.DataFrame:
         '''Conditions that apply to entire arrays.'''
+        self.materialize()
         return self._single_conds.copy()
 
     @property
     def multiple_conditions(self) -> pd.DataFrame:
         '''Conditions with multiple values per array.'''
+        self.materialize()
         return self._multiple_conds.copy()
 
     @property
@@ -99,11 +129,13 @@ class ArrAttrs(BaseSpecialAttrs):
     @property
     def single_parameters(self) -> pd.DataFrame:
         '''Parameters that apply to entire arrays.'''
+        self.materialize()
         return self._single_params.copy()
 
     @property
     def multiple_parameters(self) -> pd.DataFrame:
         '''Parameters with multiple values per array.'''
+        self.materialize()
         return self._multiple_params.copy()
 
     @property
@@ -114,11 +146,13 @@ class ArrAttrs(BaseSpecialAttrs):
     @property
     def single_properties(self) -> pd.DataFrame:
         '''Properties that apply to entire arrays.'''
+        self.materialize()
         return self._single_props.copy()
 
     @property
     def multiple_properties(self) -> pd.DataFrame:
         '''Properties with multiple values per array.'''
+        self.materialize()
         return self._multiple_props.copy()
 
     @property
@@ -126,6 +160,178 @@ class ArrAttrs(BaseSpecialAttrs):
         '''Non-array properties.'''
         return self._other_props.copy()
 
+    KINDS: ClassVar[tuple[str, ...]] = ('conditions', 'parameters', 'properties')
+
+    def values(
+        self,
+        kind: str = 'properties',
+        dtype: Any = np.float64,
+        multiple: bool = True
+        ) -> pd.DataFrame:
+        '''
+        Nominal values of the array attributes as a numeric ``DataFrame``.
+
+        The frame has the same index and columns as the attribute ``DataFrame``,
+        so e.g. ``values()['intensity'].to_numpy()`` is a contiguous array that
+        can be plotted or fitted directly. Missing attributes and attributes
+        without a nominal value (e.g. ``UniformReal``) are ``NaN``.
+
+        Values, units, and origins are extracted once and cached until the
+        attributes change through ``concat`` or ``remove``.
+
+        Parameters
+        ----------
+        kind: {'conditions', 'parameters', 'properties'}, default 'properties'
+            Which attributes to return.
+        dtype: numpy dtype, default numpy.float64
+            Type of the returned values. Integer types require every cell to
+            hold a value.
+        multiple: bool, default True
+            If ``True``, return the multiple attributes (_arr and _idx),
+            otherwise the single attributes (_arr only).
+        '''
+
+        return self._extract_values(kind, multiple)[0].astype(dtype)
+
+    def units(self, kind: str = 'properties', multiple: bool = True) -> pd.DataFrame:
+        '''Units of the array attributes, ``None`` where missing. See `values`.'''
+        return self._extract_values(kind, multiple)[1].copy()
+
+    def origins(self, kind: str = 'properties', multiple: bool = True) -> pd.DataFrame:
+        '''Origins of the array attributes, ``None`` where missing. See `values`.'''
+        return self._extract_values(kind, multiple)[2].copy()
+
+    def _extract_values(self, kind: str, multiple: bool) -> tuple[pd.DataFrame, ...]:
+        '''
+        Extract the nominal values, units, and origins of one ``DataFrame`` of
+        attributes, and of the side files not materialized yet, once.
+        '''
+
+        if kind not in self.KINDS:
+            raise ValueError(f'kind must be one of {self.KINDS}, but found {kind}.')
+
+        key = (kind, bool(multiple))
+        if key in self._values_cache:
+            return self._values_cache[key]
+
+        dfs = self._multiple_df_list() if multiple else self._single_df_list()
+        df = dfs[self.KINDS.index(kind)]
+
+        cells = df.to_numpy(dtype=object).ravel()
+        present = ~pd.isna(cells)
+        attrs = cells[present]
+
+        nominals = np.full(cells.shape, np.nan)
+        units = np.full(cells.shape, None, dtype=object)
+        origins = np.full(cells.shape, None, dtype=object)
+        nominals[present] = [getattr(attr.value, 'nominal', np.nan) for attr in attrs]
+        units[present] = [getattr(attr.value, 'units', None) for attr in attrs]
+        origins[present] = [attr.origin for attr in attrs]
+
+        frames = tuple(
+            pd.DataFrame(arr.reshape(df.shape), index=df.index, columns=df.columns)
+            for arr in (nominals, units, origins)
+        )
+
+        if multiple and self._side_files:
+            side_frames = self._read_side_values(kind)
+            if len(side_frames[0].columns) > 0:
+                frames = tuple(
+                    side.combine_first(frame) if len(frame.columns) > 0 else side
+                    for side, frame in zip(side_frames, frames)
+                )
+
+        self._values_cache[key] = frames
+
+        return self._values_cache[key]
+
+    def _read_side_values(self, kind: str) -> tuple[pd.DataFrame, ...]:
+        '''Nominal values, units, and origins of the `kind` arrays of the pending side files.'''
+
+        nominals, units, origins = defaultdict(list), defaultdict(list), defaultdict(list)
+
+        for path in self._side_files:
+            with np.load(path) as npz:
+                for key, meta in json.loads(str(npz['__meta__'])).items():
+                    if meta['kind'] != kind:
+                        continue
+                    values = npz[key]
+                    index = pd.MultiIndex.from_arrays(
+                        (np.full(len(values), meta['arr']), np.arange(len(values)))
+                    )
+                    nominals[meta['name']].append(pd.Series(values.astype(np.float64), index=index))
+                    units[meta['name']].append(pd.Series(meta['units'], index=index, dtype=object))
+                    origins[meta['name']].append(pd.Series(meta['origin'], index=index, dtype=object))
+
+        return tuple(
+            pd.DataFrame({name: pd.concat(series) for name, series in columns.items()}).sort_index()
+            for columns in (nominals, units, origins)
+        )
+
+    def materialize(self) -> None:
+        '''
+        Create the GEMD attributes held by the side files of the measurement
+        and add them to the attribute ``DataFrame``s.
+
+        Called when the attribute ``DataFrame``s are first accessed. Call
+        `update_object` afterwards to write them to the measurement, e.g.
+        before a full dump.
+        '''
+
+        if not self._side_files:
+            return
+
+        template = self._measurement.template
+        template_dict = defaultdict(lambda: None)
+        if isinstance(template, MeasurementTemplate):
+            template_dict.update(attr_template_dict(template))
+
+        attr_types = {'conditions': Condition, 'parameters': Parameter, 'properties': Property}
+        arrays = []
+
+        for path in self._side_files:
+            with np.load(path) as npz:
+                for key, meta in json.loads(str(npz['__meta__'])).items():
+                    arrays.append((key, meta, pd.DataFrame({key: npz[key]})))
+
+        # as in object_from_file, values within bounds are not validated one by one
+        within_bounds = all(
+            template_dict[meta['name']] is not None and self._within_bounds(
+                df.loc[:, key], template_dict[meta['name']], template,
+                attr_types[meta['kind']], meta['units']
+            )
+            for key, meta, df in arrays
+        )
+
+        new_attrs = {kind: [] for kind in self.KINDS}
+
+        with validation_level(WarningLevel.IGNORE if within_bounds else get_validation_level()):
+            for key, meta, df in arrays:
+                created = self._create_attrs_from_df(
+                    df, template_dict, [attr_types[meta['kind']]], [key], [meta['name']],
+                    [meta['units']], [meta['origin']], meta['arr']
+                )
+                new_attrs[meta['kind']].extend(created[self.KINDS.index(meta['kind'])])
+
+        self._side_files = []
+
+        if not isinstance(self._measurement, MeasurementRun):
+            new_attrs['properties'] = []
+
+        multiple_dfs = []
+        for kind, df in zip(self.KINDS, self._multiple_df_list()):
+            new_df = self._parse(new_attrs[kind])[1]
+            if len(new_df.columns) == 0:
+                multiple_dfs.append(df)
+            elif len(df.columns) == 0:
+                multiple_dfs.append(new_df)
+            else:
+                multiple_dfs.append(new_df.combine_first(df))
+        self._multiple_conds, self._multiple_params, self._multiple_props = multiple_dfs
+
+        self._reindex_all_dfs()
+        self._values_cache.clear()
+
     def concat(
         self,
         single_df: Optional[pd.DataFrame] = None,
@@ -147,6 +353,8 @@ class ArrAttrs(BaseSpecialAttrs):
 
         if single_df is None and multiple_df is None:
             raise ValueError('At least on of single_df and multiple_df must not be None.')
+
+        self.materialize()
         
         if single_df is not None:
 
@@ -169,24 +377,71 @@ class ArrAttrs(BaseSpecialAttrs):
             self._multiple_props = multiple_attrs.loc[:, self._multiple_props.columns]
 
         self._reindex_all_dfs()
-        self._reindex_all_attrs()
+        self._names_stale = True
+        self._values_cache.clear()
 
-    def remove(self, index: int) -> None:
-        '''Remove a row from the attributes by index, then reindex.'''
+    def remove(self, index: Union[int, Iterable[int]]) -> None:
+        '''
+        Remove one or more rows (i.e., arrays) from the attributes by index,
+        then reindex the following arrays.
+
+        Attributes are renamed after their new position by `update_object`.
+        '''
 
-        new_index = np.arange(len(self._single_conds)-1)
+        self.materialize()
 
-        for df in self._single_df_list():
-            df.drop(index=index, inplace=True)
-            df.index = new_index
+        removed = np.unique(np.atleast_1d(np.asarray(index, dtype=np.int64)))
+
+        self._single_conds, self._single_params, self._single_props = [
+            df[~df.index.isin(removed)].set_axis(np.arange(len(df) - df.index.isin(removed).sum()))
+            for df in self._single_df_list()
+        ]
+
+        multiple_dfs = []
+        for df in self._multiple_df_list():
+            arrs = df.index.get_level_values(0).to_numpy()
+            keep = ~np.isin(arrs, removed)
+            # each array moves down by the number of removed arrays before it
+            arrs = arrs[keep] - np.searchsorted(removed, arrs[keep])
+            multiple_dfs.append(df[keep].set_axis(
+                pd.MultiIndex.from_arrays((arrs, df.index.get_level_values(1).to_numpy()[keep]))
+            ))
+        self._multiple_conds, self._multiple_params, self._multiple_props = multiple_dfs
+
+        self._names_stale = True
+        self._values_cache.clear()
+
+    def remove_points(self, points: Iterable[tuple[int, int]]) -> None:
+        '''
+        Remove points, given as ``(array, index)`` pairs, from the multiple
+        attributes, e.g. outliers. The following points of each array are
+        moved down to keep the indices contiguous.
+
+        Attributes are renamed after their new position by `update_object`.
+        '''
+
+        points = list(points)
+        if not points:
+            return
 
+        self.materialize()
+
+        # from_tuples cannot infer the levels of an empty list, hence the check above
+        removed = pd.MultiIndex.from_tuples(points)
+
+        multiple_dfs = []
         for df in self._multiple_df_list():
-            df.drop(index=index, inplace=True)
-            new_codes = np.array(df.index.codes)
-            new_codes[0][new_codes[0] > index] -= 1
-            df.index = pd.MultiIndex.from_arrays(new_codes)
+            keep = ~df.index.isin(removed)
+            arrs = df.index.get_level_values(0).to_numpy()[keep]
+            # within each array, the position of each kept point among the kept points
+            starts = np.r_[0, np.flatnonzero(np.diff(arrs)) + 1]
+            idxs = np.arange(len(arrs)) - np.repeat(starts, np.diff(np.r_[starts, len(arrs)]))
+            multiple_dfs.append(df[keep].set_axis(pd.MultiIndex.from_arrays((arrs, idxs))))
+        self._multiple_conds, self._multiple_params, self._multiple_props = multiple_dfs
 
-        self._reindex_all_attrs()
+        self._reindex_all_dfs()
+        self._names_stale = True
+        self._values_cache.clear()
 
     def update_object(self) -> None:
         '''
@@ -195,8 +450,19 @@ class ArrAttrs(BaseSpecialAttrs):
 
         This is performed in-place on the existing measurement and will
         overwrite any attributes added after ``ArrAttrs`` initialization.
+        Side files are materialized and their links removed, since the
+        measurement then holds all of their attributes.
         '''
 
+        self.materialize()
+        if self._names_stale:
+            self._reindex_all_attrs()
+            self._names_stale = False
+        self._measurement.file_links = [
+            link for link in self._measurement.file_links
+            if not link.filename.endswith(self.SIDE_FILE_SUFFIX)
+        ]
+
         single_conds = self._extract_attrs_from_df(self._single_conds)
         multiple_conds = self._extract_attrs_from_df(self._multiple_conds)
         single_params = self._extract_attrs_from_df(self._single_params)
@@ -213,8 +479,8 @@ class ArrAttrs(BaseSpecialAttrs):
     @classmethod
     def object_from_file(
         cls,
-        filename: str,
-        url: str,
+        filename: Union[str, list[str]],
+        url: Union[str, list[str]],
         material_run: MaterialRun,
         measurement_template: MeasurementTemplate,
         attr_types: AttrTypes,
@@ -222,23 +488,34 @@ class ArrAttrs(BaseSpecialAttrs):
         names: list[str],
         units: list[Union[str, None]],
         origins: list[str],
-        arr_pos: int = 0,
+        arr_pos: Union[int, list[int]] = 0,
         brand: Optional[str] = None,
         model: Optional[str] = None,
         instr_id: Optional[str] = None,
         email: Optional[str] = None,
         iso_date: Optional[str] = None,
+        side_file: Optional[str] = None,
+        dump_dir: Optional[str] = None,
         **read_csv_kwargs: Any
         ) -> tuple[MeasurementSpec, MeasurementRun]:
         '''
-        Create an empty ``MeasurementSpec`` and filled ``MeasurementRun`` from a delimited file.
+        Create an empty ``MeasurementSpec`` and filled ``MeasurementRun`` from
+        one or more delimited files.
+
+        Columns are read with explicit dtypes (``float64`` for ``NominalReal``,
+        ``int64`` for ``NominalInteger``) and a memory-mapped file, unless
+        `dtype` or `memory_map` are passed. Pass `chunksize` to read huge files
+        in chunks. The values of each column are checked against the attribute
+        and measurement template bounds at once (minimum and maximum) rather
+        than attribute by attribute. If a column is out of bounds, every
+        attribute is validated individually as usual.
 
         Parameters
         ----------
-        filename: str
-            The name of the file.
-        url: str
-            The URL or file path leading to `filename`.
+        filename: str or list[str]
+            The name of the file, or of several files holding the same columns.
+        url: str or list[str]
+            The URL or file path leading to each of `filename`.
         material_run: str
             The relevant ``MaterialRun``.
         measurement_template: MeasurementTemplate
@@ -253,8 +530,10 @@ class ArrAttrs(BaseSpecialAttrs):
             The units of the attribute values. str for NominalReal, None for NominalInteger.
         origins: list[str]
             The origins of the attribute values.
-        arr_pos: int, default 0
-            The integer array position to use in the generated attribute names.
+        arr_pos: int or list[int], default 0
+            The integer array position to use in the generated attribute names,
+            or one per column to fill several arrays from one file. Each
+            additional file is placed after the arrays of the previous one.
         brand: str, optional
             The brand of the instrument used for the measurement.
         model: str, optional
@@ -267,11 +546,21 @@ class ArrAttrs(BaseSpecialAttrs):
             Email of the person who performed the measurement.
         iso_date: str, optional
             Date the measurement was performed, in ISO format.
+        side_file: str, optional
+            If given, the values are written to this NumPy side file, linked
+            to the run, instead of being turned into attributes up front.
+            See `write_side_file`.
+        dump_dir: str, optional
+            Folder the run will be dumped to, see `write_side_file`.
         **read_csv_kwargs: Any
             Passed to ``pandas.read_csv()``.
         '''
 
-        df = pd.read_csv(filename, **read_csv_kwargs)
+        filenames = [filename] if isinstance(filename, str) else list(filename)
+        urls = [url] if isinstance(url, str) else list(url)
+
+        if len(filenames) != len(urls):
+            raise ValueError('filename and url must be equal in length.')
 
         tags = generate_tags(brand, model, instr_id)
 
@@ -279,37 +568,149 @@ class ArrAttrs(BaseSpecialAttrs):
 
         template_dict = attr_template_dict(measurement_template)
 
-        arr_pos = int(arr_pos)
-        if arr_pos < 0:
+        if np.ndim(arr_pos) == 0:
+            arr_pos = [arr_pos] * len(columns)
+        arr_pos = [int(pos) for pos in arr_pos]
+        if any(pos < 0 for pos in arr_pos):
             raise ValueError('arr_pos must be a non-negative integer.')
 
-        if not (len(attr_types) == len(columns) == len(names) == len(units) == len(origins)):
+        if not (
+            len(attr_types) == len(columns) == len(names) == len(units) == len(origins)
+            == len(arr_pos)
+        ):
             raise ValueError('Iterable inputs must be equal in length.')
 
-        conditions, parameters, properties = cls._create_attrs_from_df(
-            df, template_dict, attr_types, columns, names, units, origins, arr_pos
-        )
+        cls._check_attr_types(attr_types)
 
-        spec = MeasurementSpec(
-            name=measurement_template.name,
-            template=measurement_template,
-            tags=tags
-        )
+        dfs = [cls._read_file(f, columns, units, **read_csv_kwargs) for f in filenames]
+        file_links = [FileLink(filename=f, url=u) for f, u in zip(filenames, urls)]
+
+        if side_file is not None:
+            file_links.append(
+                cls.write_side_file(
+                    side_file, dfs, attr_types, columns, names, units, origins, arr_pos, dump_dir
+                )
+            )
+            dfs = []
 
-        run = MeasurementRun(
-            name=measurement_template.name,
-            spec=spec,
-            tags=tags,
-            material=material_run,
-            source=source,
-            conditions=conditions,
-            parameters=parameters,
-            properties=properties,
-            file_links=[FileLink(filename=filename, url=url)]
+        # values within bounds need not be checked again by each attribute and by the run
+        within_bounds = all(
+            cls._within_bounds(df.loc[:, c], template_dict[n], measurement_template, a, u)
+            for df in dfs
+            for a, c, n, u in zip(attr_types, columns, names, units)
         )
 
+        conditions, parameters, properties = [], [], []
+        span = cls._arr_span(arr_pos)
+
+        with validation_level(WarningLevel.IGNORE if within_bounds else get_validation_level()):
+
+            for i, df in enumerate(dfs):
+                file_attrs = cls._create_attrs_from_df(
+                    df, template_dict, attr_types, columns, names, units, origins,
+                    [pos + i * span for pos in arr_pos]
+                )
+                conditions.extend(file_attrs[0])
+                parameters.extend(file_attrs[1])
+                properties.extend(file_attrs[2])
+
+            spec = MeasurementSpec(
+                name=measurement_template.name,
+                template=measurement_template,
+                tags=tags
+            )
+
+            run = MeasurementRun(
+                name=measurement_template.name,
+                spec=spec,
+                tags=tags,
+                material=material_run,
+                source=source,
+                conditions=conditions,
+                parameters=parameters,
+                properties=properties,
+                file_links=file_links
+            )
+
         return spec, run
 
+    @classmethod
+    def write_side_file(
+        cls,
+        path: str,
+        df: Union[pd.DataFrame, list[pd.DataFrame]],
+        attr_types: AttrTypes,
+        columns: list[str],
+        names: list[str],
+        units: list[Union[str, None]],
+        origins: list[str],
+        arr_pos: Union[int, list[int]] = 0,
+        dump_dir: Optional[str] = None
+        ) -> FileLink:
+        '''
+        Write the values of multiple attributes to a compact NumPy side file
+        rather than creating a GEMD attribute per value.
+
+        Add the returned ``FileLink`` to a measurement to have ``ArrAttrs``
+        read the values, and create the attributes when they are requested.
+        The arguments are the same as for `object_from_file`. Units are
+        normalized as GEMD values normalize them (e.g. 'deg' to 'degree').
+
+        Parameters
+        ----------
+        path: str
+            Path of the side file, suffixed with ``.arr.npz`` if needed.
+        df: DataFrame or list[DataFrame]
+            The data, one ``DataFrame`` per file. Each additional ``DataFrame``
+            is placed after the arrays of the previous one.
+        dump_dir: str, optional
+            Folder the measurement linking the side file will be dumped to,
+            e.g. the workflow's output folder. Defaults to the current directory.
+
+        Returns
+        -------
+        file_link: FileLink
+            Link to the side file, with its path relative to `dump_dir` as url,
+            so that the dump and the side file can be moved together. Pass the
+            same folder to ``ArrAttrs`` to resolve it.
+        '''
+
+        if not path.endswith(cls.SIDE_FILE_SUFFIX):
+            path = f'{path}{cls.SIDE_FILE_SUFFIX}'
+
+        dfs = [df] if isinstance(df, pd.DataFrame) else list(df)
+
+        if np.ndim(arr_pos) == 0:
+            arr_pos = [arr_pos] * len(columns)
+        span = cls._arr_span(arr_pos)
+
+        kinds = {Condition: 'conditions', Parameter: 'parameters', Property: 'properties'}
+        arrays = {}
+        meta = {}
+
+        for i, data in enumerate(dfs):
+            for a, c, n, u, o, p in zip(attr_types, columns, names, units, origins, arr_pos):
+                if a not in kinds:
+                    raise ValueError(
+                        'attr_types must consist of Type[Condition], Type[Parameter], '
+                        f'or Type[Property], but found {type(a)}.'
+                    )
+                key = f'{n}{cls.ARR}{int(p) + i * span}'
+                arrays[key] = data.loc[:, c].to_numpy(dtype=(np.int64 if u is None else np.float64))
+                meta[key] = {
+                    'kind': kinds[a], 'name': n, 'arr': int(p) + i * span,
+                    'units': None if u is None else parse_units(u), 'origin': o
+                }
+
+        np.savez(path, __meta__=np.array(json.dumps(meta)), **arrays)
+
+        return FileLink(filename=os.path.basename(path), url=os.path.relpath(path, dump_dir or '.'))
+
+    @staticmethod
+    def _arr_span(arr_pos: list[int]) -> int:
+        '''Number of array positions taken by one file.'''
+        return max(arr_pos) - min(arr_pos) + 1 if len(arr_pos) > 0 else 1
+
     @classmethod
     def _parse(
         cls,
@@ -322,10 +723,15 @@ class ArrAttrs(BaseSpecialAttrs):
         value determines the row. For multiple attributes (_arr and _idx),
         array value determines the first row level in the row ``MultiIndex``
         and index value determines the second row level.
+
+        Matches are collected in one pass and each ``DataFrame`` is built at
+        once, rather than growing it one cell at a time. If several attributes
+        share a name, the last one is kept.
         '''
 
-        single_df = pd.DataFrame()
-        multiple_df = pd.DataFrame(index=pd.MultiIndex.from_arrays([[],[]]))
+        # (base, arr) -> attribute and (base, arr, idx) -> attribute
+        single_attrs: dict[tuple[str, int], BaseAttribute] = {}
+        multiple_attrs: dict[tuple[str, int, int], BaseAttribute] = {}
         other_attrs = []
 
         for attr in attrs:
@@ -333,10 +739,19 @@ class ArrAttrs(BaseSpecialAttrs):
             match = cls.RE.match(attr.name)
 
             if match is not None:
-                cls._add_attr_to_df(attr, match, single_df, multiple_df)
+                cls._add_attr_to_df(attr, match, single_attrs, multiple_attrs)
             else:
                 other_attrs.append(attr)
 
+        single_df = pd.DataFrame()
+        multiple_df = pd.DataFrame(index=pd.MultiIndex.from_arrays([[],[]]))
+
+        if single_attrs:
+            single_df = cls._build_df(single_attrs)
+
+        if multiple_attrs:
+            multiple_df = cls._build_df(multiple_attrs)
+
         reindexed_dfs = cls._reindex_df(single_df, multiple_df)
 
         return (*reindexed_dfs, other_attrs)
@@ -346,31 +761,23 @@ class ArrAttrs(BaseSpecialAttrs):
         cls,
         attr: BaseAttribute,
         match: re.Match[str],
-        single_df: pd.DataFrame,
-        multiple_df: pd.DataFrame
+        single_attrs: dict[tuple[str, int], BaseAttribute],
+        multiple_attrs: dict[tuple[str, int, int], BaseAttribute]
         ) -> None:
-        '''Given a matching attribute, add it to `single_df` or `multiple_df` as appropriate.'''
+        '''
+        Given a matching attribute, add it to `single_attrs` or `multiple_attrs`
+        as appropriate, from which ``_build_df`` creates the ``DataFrame``s.
+        '''
 
         # regular expression groups
-        match_groups = match.groups()
-        base_name = match_groups[0]
-        arr = int(match_groups[1])
+        base_name, arr, idx = match.groups()
 
         # _arr<array> case
-        if match_groups[2] is None:
-            df = single_df
-            row_pos = arr
+        if idx is None:
+            single_attrs[base_name, int(arr)] = attr
         # _arr<array>_idx<index> case
         else:
-            df = multiple_df
-            row_pos = (arr, int(match_groups[2]))
-  
-        # add column if not there
-        if base_name not in df.columns:
-            df[base_name] = np.nan
-
-        # place attribute in appropriate df
-        df.loc[row_pos, base_name] = attr
+            multiple_attrs[base_name, int(arr), int(idx)] = attr
 
     @classmethod
     def _reindex_df(
@@ -409,10 +816,12 @@ class ArrAttrs(BaseSpecialAttrs):
         ):
             return
 
+        # measurements from object_from_file only hold multiple attributes
         arr_max = int(np.nanmax([
             self._single_conds.index.max(),
             self._single_params.index.max(),
-            self._single_props.index.max()
+            self._single_props.index.max(),
+            *(df.index.get_level_values(0).max() for df in self._multiple_df_list() if len(df) > 0)
         ]))
 
         self._single_conds = self._single_conds.reindex(np.arange(arr_max+1))
@@ -425,13 +834,13 @@ class ArrAttrs(BaseSpecialAttrs):
         idx_max = 0
         
         if len(self._multiple_conds) > 0:
-            idx_max = max(idx_max, self._multiple_conds.index.levels[1].max())
+            idx_max = max(idx_max, self._multiple_conds.index.get_level_values(1).max())
 
         if len(self._multiple_params) > 0:
-            idx_max = max(idx_max, self._multiple_params.index.levels[1].max())
+            idx_max = max(idx_max, self._multiple_params.index.get_level_values(1).max())
 
         if len(self._multiple_props) > 0:
-            idx_max = max(idx_max, self._multiple_props.index.levels[1].max())
+            idx_max = max(idx_max, self._multiple_props.index.get_level_values(1).max())
 
         self._multiple_conds = self._multiple_conds.reindex(
             pd.MultiIndex.from_product((np.arange(arr_max+1), np.arange(idx_max+1)))
@@ -443,20 +852,19 @@ class ArrAttrs(BaseSpecialAttrs):
             pd.MultiIndex.from_product((np.arange(arr_max+1), np.arange(idx_max+1)))
         )
 
-        idx_row_maxes=[
-            max(
-                self._multiple_conds.loc[arr_val, :].last_valid_index() or 0,
-                self._multiple_params.loc[arr_val, :].last_valid_index() or 0,
-                self._multiple_props.loc[arr_val, :].last_valid_index() or 0,
-            )
-            for arr_val in range(arr_max+1)
-        ]
-
-        to_drop = [(arr_val, idx_row_max) for i, arr_val in enumerate(range(arr_max+1)) for idx_row_max in range(idx_row_maxes[i]+1, idx_max+1)]
+        # keep each array up to its last valid index in any of the DataFrames (at least index 0)
+        arrs = self._multiple_conds.index.get_level_values(0).to_numpy()
+        idxs = self._multiple_conds.index.get_level_values(1).to_numpy()
+        valid = np.zeros(len(arrs), dtype=bool)
+        for df in self._multiple_df_list():
+            valid |= df.notna().to_numpy().any(axis=1)
+        last_valid = np.zeros(arr_max+1, dtype=np.int64)
+        np.maximum.at(last_valid, arrs[valid], idxs[valid])
+        keep = idxs <= last_valid[arrs]
 
-        self._multiple_conds.drop(index=to_drop, inplace=True)
-        self._multiple_params.drop(index=to_drop, inplace=True)
-        self._multiple_props.drop(index=to_drop, inplace=True)
+        self._multiple_conds = self._multiple_conds[keep]
+        self._multiple_params = self._multiple_params[keep]
+        self._multiple_props = self._multiple_props[keep]
 
     def _single_df_list(self) -> list[pd.DataFrame]:
         '''Return a list of the single attributes ``DataFrame``s.'''
@@ -471,15 +879,15 @@ class ArrAttrs(BaseSpecialAttrs):
 
         for df in self._single_df_list():
             for name, series in df.items():
-                for i, attr in series.items():
-                    if not pd.isna(attr):
-                        attr.name = f'{name}{self.ARR}{i}'
+                present = series.notna().to_numpy()
+                for i, attr in zip(series.index[present], series.to_numpy()[present]):
+                    attr.name = f'{name}{self.ARR}{i}'
 
         for df in self._multiple_df_list():
             for name, series in df.items():
-                for i, attr in series.items():
-                    if not pd.isna(attr):
-                        attr.name = f'{name}{self.ARR}{i[0]}{self.IDX}{i[1]}'
+                present = series.notna().to_numpy()
+                for (arr, idx), attr in zip(series.index[present], series.to_numpy()[present]):
+                    attr.name = f'{name}{self.ARR}{arr}{self.IDX}{idx}'
 
     @classmethod
     def _create_attrs_from_df(
@@ -491,15 +899,18 @@ class ArrAttrs(BaseSpecialAttrs):
         names: list[str],
         units: list[Union[str, None]],
         origins: list[str],
-        arr_pos: int
+        arr_pos: Union[int, list[int]]
         ) -> tuple[list[Condition], list[Parameter], list[Property]]:
-        '''Create conditions, parameters, and properties from the `df` values.'''
+        '''Create conditions, parameters, and properties from the `df` values, a column at a time.'''
 
         conditions = []
         parameters = []
         properties = []
 
-        for a, c, n, u, o in zip(attr_types, columns, names, units, origins):
+        if np.ndim(arr_pos) == 0:
+            arr_pos = [arr_pos] * len(columns)
+
+        for a, c, n, u, o, p in zip(attr_types, columns, names, units, origins, arr_pos):
             if a is Condition:
                 to_append = conditions
             elif a is Parameter:
@@ -511,12 +922,16 @@ class ArrAttrs(BaseSpecialAttrs):
                     'attr_types must consist of Type[Condition], Type[Parameter], '
                     f'or Type[Property], but found {type(a)}.'
                 )
-            for i, val in enumerate(df.loc[:, c]):
-                to_append.append(a(
-                    name=f'{n}{cls.ARR}{arr_pos}{cls.IDX}{i}',
+            template = template_dict[n]
+            prefix = f'{n}{cls.ARR}{p}{cls.IDX}'
+            to_append.extend(
+                a(
+                    name=f'{prefix}{i}',
                     value=(NominalInteger(val) if u is None else NominalReal(val, u)),
-                    template=template_dict[n],
+                    template=template,
                     origin=o
-                ))
+                )
+                for i, val in enumerate(df.loc[:, c].tolist())
+            )
 
         return conditions, parameters, properties
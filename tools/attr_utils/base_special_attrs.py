@@ -1,15 +1,18 @@
 '''Base for special attribute classes.'''
 
-from typing import ClassVar, Union
+from typing import ClassVar, Union, Any
 from abc import ABC, abstractmethod
 import re
 
 import numpy as np
 import pandas as pd
 
+from gemd import Condition, Parameter, Property, NominalInteger, NominalReal
 from gemd.entity.template.attribute_template import AttributeTemplate
+from gemd.entity.template.base_template import BaseTemplate
 from gemd.entity.attribute.base_attribute import BaseAttribute
 from gemd.entity.object.base_object import BaseObject
+from gemd.entity.value.base_value import BaseValue
 
 from .utils import AttrTypes
 
@@ -85,11 +88,123 @@ class BaseSpecialAttrs(ABC):
     def _reindex_all_attrs(self) -> None:
         '''Rename all attributes according to where they are in their ``DataFrame``.'''
 
+    @staticmethod
+    def _build_df(attrs: dict[tuple, BaseAttribute]) -> pd.DataFrame:
+        '''
+        Build an object ``DataFrame`` from ``(base, position)`` or
+        ``(base, position, index)`` keys, with a column per base name (in order
+        of appearance) and a row per position, or per ``(position, index)``
+        pair. Missing cells are ``NaN``.
+        '''
+
+        keys = list(attrs)
+        base_names = [key[0] for key in keys]
+        columns = list(dict.fromkeys(base_names))
+        col_codes = pd.Index(columns).get_indexer(base_names)
+
+        # rows are sorted by position (and index), flattened to a single integer key
+        positions = np.array([key[1:] for key in keys], dtype=np.int64).T
+        shape = positions.max(axis=1) + 1
+        rows, row_codes = np.unique(np.ravel_multi_index(positions, shape), return_inverse=True)
+        levels = np.unravel_index(rows, shape)
+
+        if len(levels) == 1:
+            index = pd.Index(levels[0])
+        else:
+            index = pd.MultiIndex.from_arrays(levels)
+
+        values = np.full((len(rows), len(columns)), np.nan, dtype=object)
+        values[row_codes, col_codes] = np.fromiter(attrs.values(), dtype=object, count=len(attrs))
+
+        return pd.DataFrame(values, index=index, columns=columns)
+
+    @staticmethod
+    def _dtype(unit: Union[str, None]) -> Any:
+        '''Type of the column read for a given unit: ``int64`` for ``NominalInteger``, ``float64`` otherwise.'''
+        return np.int64 if unit is None else np.float64
+
+    @staticmethod
+    def _make_value(val: Any, unit: Union[str, None]) -> BaseValue:
+        '''``NominalInteger`` if `unit` is ``None``, ``NominalReal`` otherwise.'''
+        return NominalInteger(val) if unit is None else NominalReal(val, unit)
+
+    @classmethod
+    def _read_file(
+        cls,
+        filename: str,
+        columns: list[str],
+        units: list[Union[str, None]],
+        **read_csv_kwargs: Any
+        ) -> pd.DataFrame:
+        '''Read the needed columns of a delimited file with explicit dtypes, in chunks if `chunksize` is passed.'''
+
+        read_csv_kwargs.setdefault('usecols', list(dict.fromkeys(columns)))
+        read_csv_kwargs.setdefault('dtype', {c: cls._dtype(u) for c, u in zip(columns, units)})
+        read_csv_kwargs.setdefault('memory_map', True)
+
+        if read_csv_kwargs.get('chunksize') is None:
+            return pd.read_csv(filename, **read_csv_kwargs)
+
+        with pd.read_csv(filename, **read_csv_kwargs) as reader:
+            return pd.concat(list(reader), ignore_index=True)
+
+    @staticmethod
+    def _check_attr_types(attr_types: AttrTypes) -> None:
+        '''
+        Raise a ``ValueError`` if `attr_types` holds anything but ``Condition``,
+        ``Parameter``, or ``Property``, before any value is read as one.
+        '''
+
+        for a in attr_types:
+            if a not in (Condition, Parameter, Property):
+                raise ValueError(
+                    'attr_types must consist of Type[Condition], Type[Parameter], '
+                    f'or Type[Property], but found {type(a)}.'
+                )
+
+    @classmethod
+    def _within_bounds(
+        cls,
+        values: pd.Series,
+        template: AttributeTemplate,
+        object_template: BaseTemplate,
+        attr_type: type[BaseAttribute],
+        unit: Union[str, None]
+        ) -> bool:
+        '''
+        Whether all `values` are within the bounds of their attribute template
+        and of the object template, by checking their minimum and maximum, or
+        their unique values if they are not numeric.
+        '''
+
+        if len(values) == 0:
+            return True
+        if values.isna().any():
+            return False
+
+        kind = {Condition: 'conditions', Parameter: 'parameters', Property: 'properties'}.get(attr_type)
+
+        bounds = [template.bounds]
+        for attr_template, object_bounds in getattr(object_template, kind, None) or []:
+            if object_bounds is not None and attr_template == template:
+                bounds.append(object_bounds)
+                break
+
+        if pd.api.types.is_numeric_dtype(values):
+            extremes = [values.min().item(), values.max().item()]
+        else:
+            extremes = values.unique().tolist()
+        extremes = [cls._make_value(v, unit) for v in extremes]
+
+        return all(b.contains(v) for b in bounds for v in extremes)
+
     @staticmethod
     def _extract_attrs_from_df(df: pd.DataFrame) -> list[BaseAttribute]:
         '''Return a list of attributes from a ``DataFrame``.'''
 
-        return [attr for col in df for attr in col if not pd.isna(attr)]
+        # column by column, as iterating over a DataFrame itself yields its column names
+        attrs = df.to_numpy(dtype=object).ravel(order='F')
+        return attrs[~pd.isna(attrs)].tolist()
 
     @classmethod
     @abstractmethod
@@ -1,7 +1,8 @@
 '''Support for group attributes.'''
 
-from typing import TypeAlias, ClassVar, Union, Optional, Any
+from typing import TypeAlias, ClassVar, Union, Optional, Any, Mapping, Callable
 import re
+import warnings
 
 import numpy as np
 import pandas as pd
@@ -13,6 +14,8 @@ from gemd import (
 )
 from gemd.entity.template.attribute_template import AttributeTemplate
 from gemd.entity.attribute.base_attribute import BaseAttribute
+from gemd.entity.value.base_value import BaseValue
+from gemd.entity.bounds_validation import WarningLevel, get_validation_level, validation_level
 
 from .base_special_attrs import BaseSpecialAttrs
 from .utils import AttrTypes, attr_template_dict, generate_tags, generate_source
@@ -28,6 +31,10 @@ class GrpAttrs(BaseSpecialAttrs):
 
     Each row of the ``DataFrame``s represents a group of attributes. Each column
     is an attribute name.
+
+    The values, units, and origins of the attributes are also available as
+    typed columns (see `values`), from which group statistics are computed
+    without going through the GEMD attributes again.
     '''
 
     GRP: ClassVar[str] = '_grp'
@@ -68,6 +75,9 @@ class GrpAttrs(BaseSpecialAttrs):
 
         self._reindex_all_dfs()
 
+        # kind -> (values, units, origins), see _extract_values()
+        self._values_cache: dict[str, tuple[pd.DataFrame, ...]] = {}
+
     @property
     def measurement(self) -> Measurement:
         '''The measurement containing these attributes.'''
@@ -103,6 +113,138 @@ class GrpAttrs(BaseSpecialAttrs):
         '''Non-group properties.'''
         return self._other_props
 
+    KINDS: ClassVar[tuple[str, ...]] = ('conditions', 'parameters', 'properties')
+
+    def values(self, kind: str = 'properties', dtype: Any = None) -> pd.DataFrame:
+        '''
+        Values of the group attributes as a typed ``DataFrame``.
+
+        The frame has the same index and columns as the attribute ``DataFrame``.
+        Columns of ``NominalReal`` values are ``float64``, of ``NominalInteger``
+        values ``int64`` (``float64`` if a group is missing), and of
+        ``NominalCategorical`` values or ``EmpiricalFormula`` categorical.
+        Missing attributes and attributes without a nominal value (e.g.
+        ``UniformReal``) are ``NaN``.
+
+        Values, units, and origins are extracted once and cached until the
+        attributes change through ``concat`` or ``remove``.
+
+        Parameters
+        ----------
+        kind: {'conditions', 'parameters', 'properties'}, default 'properties'
+            Which attributes to return.
+        dtype: numpy dtype, optional
+            If given, type of all the returned values.
+        '''
+
+        values = self._extract_values(kind)[0]
+
+        return values.copy() if dtype is None else values.astype(dtype)
+
+    def units(self, kind: str = 'properties') -> pd.DataFrame:
+        '''Units of the group attributes, ``None`` where missing. See `values`.'''
+        return self._extract_values(kind)[1].copy()
+
+    def origins(self, kind: str = 'properties') -> pd.DataFrame:
+        '''Origins of the group attributes, ``None`` where missing. See `values`.'''
+        return self._extract_values(kind)[2].copy()
+
+    _STATS: ClassVar[dict[str, Callable[[np.ndarray], np.ndarray]]] = {
+        'mean': lambda a: np.nanmean(a, axis=0),
+        'std': lambda a: np.nanstd(a, axis=0, ddof=1),
+        'min': lambda a: np.nanmin(a, axis=0),
+        'max': lambda a: np.nanmax(a, axis=0),
+        'median': lambda a: np.nanmedian(a, axis=0),
+        'sum': lambda a: np.nansum(a, axis=0),
+        'count': lambda a: (~np.isnan(a)).sum(axis=0),
+    }
+
+    def statistics(
+        self,
+        kind: str = 'properties',
+        stats: tuple[str, ...] = ('mean', 'std')
+        ) -> pd.DataFrame:
+        '''
+        Statistics of each numeric column over the groups, e.g. the mean and
+        standard deviation of each tensile property over all specimens.
+
+        Parameters
+        ----------
+        kind: {'conditions', 'parameters', 'properties'}, default 'properties'
+            Which attributes to summarize.
+        stats: tuple[str], default ('mean', 'std')
+            Names of the statistics, passed to ``DataFrame.agg()``.
+
+        Returns
+        -------
+        statistics: DataFrame
+            A row per statistic and a column per numeric attribute.
+        '''
+
+        numeric = self._extract_values(kind)[0].select_dtypes('number')
+
+        # common statistics straight from the NumPy array, skipping NaN as pandas does
+        if not all(stat in self._STATS for stat in stats):
+            return numeric.agg(list(stats))
+
+        array = numeric.to_numpy(dtype=np.float64)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            rows = [self._STATS[stat](array) for stat in stats]
+
+        return pd.DataFrame(rows, index=list(stats), columns=numeric.columns)
+
+    def _extract_values(self, kind: str) -> tuple[pd.DataFrame, ...]:
+        '''Extract the values, units, and origins of one ``DataFrame`` of attributes, once.'''
+
+        if kind not in self.KINDS:
+            raise ValueError(f'kind must be one of {self.KINDS}, but found {kind}.')
+
+        if kind in self._values_cache:
+            return self._values_cache[kind]
+
+        df = self._df_list()[self.KINDS.index(kind)]
+
+        cells = df.to_numpy(dtype=object).reshape(df.shape)
+        present = ~pd.isna(cells)
+        attrs = cells[present]
+
+        values = np.full(cells.shape, np.nan, dtype=object)
+        units = np.full(cells.shape, None, dtype=object)
+        origins = np.full(cells.shape, None, dtype=object)
+        values[present] = [self._value_of(attr.value) for attr in attrs]
+        units[present] = [getattr(attr.value, 'units', None) for attr in attrs]
+        origins[present] = [attr.origin for attr in attrs]
+
+        columns = {}
+        for j, name in enumerate(df.columns):
+            column = values[:, j]
+            column_types = {type(val) for val in column[present[:, j]]}
+            if column_types <= {int} and present[:, j].all():
+                columns[name] = column.astype(np.int64)
+            elif column_types <= {int, float}:
+                columns[name] = column.astype(np.float64)
+            else:
+                columns[name] = pd.Categorical(column)
+
+        self._values_cache[kind] = (
+            pd.DataFrame(columns, index=df.index, columns=df.columns),
+            pd.DataFrame(units, index=df.index, columns=df.columns),
+            pd.DataFrame(origins, index=df.index, columns=df.columns),
+        )
+
+        return self._values_cache[kind]
+
+    @staticmethod
+    def _value_of(value: BaseValue) -> Any:
+        '''Nominal value, category, or formula of a value, ``NaN`` if it has none.'''
+
+        for field in ('nominal', 'category', 'formula'):
+            if hasattr(value, field):
+                return getattr(value, field)
+
+        return np.nan
+
     def concat(self, df: pd.DataFrame) -> None:
         '''
         Concatenate group attribute data.
@@ -127,6 +269,7 @@ class GrpAttrs(BaseSpecialAttrs):
 
         self._reindex_all_dfs()
         self._reindex_all_attrs()
+        self._values_cache.clear()
 
     def remove(self, index: int) -> None:
         '''Remove a row from the attributes by index, then reindex.'''
@@ -138,6 +281,7 @@ class GrpAttrs(BaseSpecialAttrs):
             df.index = new_index
 
         self._reindex_all_attrs()
+        self._values_cache.clear()
 
     def update_object(self) -> None:
         '''
@@ -180,6 +324,10 @@ class GrpAttrs(BaseSpecialAttrs):
         '''
         Create an empty ``MeasurementSpec`` and filled ``MeasurementRun`` from a delimited file.
 
+        Columns are read with explicit dtypes and their values are checked
+        against the attribute and measurement template bounds at once, as in
+        `objects_from_file`.
+
         Parameters
         ----------
         filename: str
@@ -218,7 +366,98 @@ class GrpAttrs(BaseSpecialAttrs):
             Passed to ``pandas.read_csv()``.
         '''
 
-        df = pd.read_csv(filename, **read_csv_kwargs)
+        objects = cls._objects_from_file(
+            filename, url, {None: material_run}, measurement_template, attr_types, columns,
+            names, units, origins, None, brand, model, instr_id, email, iso_date, **read_csv_kwargs
+        )
+
+        return objects[None]
+
+    @classmethod
+    def objects_from_file(
+        cls,
+        filename: str,
+        url: str,
+        material_runs: Mapping[Any, MaterialRun],
+        measurement_template: MeasurementTemplate,
+        attr_types: AttrTypes,
+        columns: list[str],
+        names: list[str],
+        units: list[Union[str, None]],
+        origins: list[str],
+        group_by: str,
+        brand: Optional[str] = None,
+        model: Optional[str] = None,
+        instr_id: Optional[str] = None,
+        email: Optional[str] = None,
+        iso_date: Optional[str] = None,
+        **read_csv_kwargs: Any
+        ) -> dict[Any, tuple[MeasurementSpec, MeasurementRun]]:
+        '''
+        Create an empty ``MeasurementSpec`` and filled ``MeasurementRun`` per
+        value of the `group_by` column of a delimited file, e.g. the tensile
+        results of many samples, with a row per specimen, in one file.
+
+        The file is read once, with explicit dtypes (``float64`` for
+        ``NominalReal``, ``int64`` for ``NominalInteger``, ``str`` otherwise).
+        The values of each column are checked against the attribute and
+        measurement template bounds at once (minimum and maximum, or unique
+        values) rather than attribute by attribute. If a column is out of
+        bounds, every attribute is validated individually as usual.
+
+        Parameters
+        ----------
+        filename: str
+            The name of the file.
+        url: str
+            The URL or file path leading to `filename`.
+        material_runs: Mapping[Any, MaterialRun]
+            The relevant ``MaterialRun`` of each value of the `group_by` column.
+        measurement_template: MeasurementTemplate
+            The measurement template for these measurements.
+        attr_types, columns, names, units, origins:
+            See `object_from_file`.
+        group_by: str
+            The name of the column identifying the measurement of each row.
+            The rows of each measurement are its groups, in order.
+        brand, model, instr_id, email, iso_date: str, optional
+            See `object_from_file`.
+        **read_csv_kwargs: Any
+            Passed to ``pandas.read_csv()``.
+
+        Returns
+        -------
+        objects: dict
+            The ``(spec, run)`` of each value of the `group_by` column, in
+            order of appearance.
+        '''
+
+        return cls._objects_from_file(
+            filename, url, material_runs, measurement_template, attr_types, columns,
+            names, units, origins, group_by, brand, model, instr_id, email, iso_date, **read_csv_kwargs
+        )
+
+    @classmethod
+    def _objects_from_file(
+        cls,
+        filename: str,
+        url: str,
+        material_runs: Mapping[Any, MaterialRun],
+        measurement_template: MeasurementTemplate,
+        attr_types: AttrTypes,
+        columns: list[str],
+        names: list[str],
+        units: list[Union[str, None]],
+        origins: list[str],
+        group_by: Optional[str],
+        brand: Optional[str],
+        model: Optional[str],
+        instr_id: Optional[str],
+        email: Optional[str],
+        iso_date: Optional[str],
+        **read_csv_kwargs: Any
+        ) -> dict[Any, tuple[MeasurementSpec, MeasurementRun]]:
+        '''Shared by `object_from_file` and `objects_from_file`, with a single ``None`` group if `group_by` is ``None``.'''
 
         tags = generate_tags(brand, model, instr_id)
 
@@ -229,29 +468,73 @@ class GrpAttrs(BaseSpecialAttrs):
         if not (len(attr_types) == len(columns) == len(names) == len(units) == len(origins)):
             raise ValueError('Iterable inputs must be equal in length.')
 
-        conditions, parameters, properties = cls._create_attrs_from_df(
-            df, template_dict, attr_types, columns, names, units, origins
-        )
+        cls._check_attr_types(attr_types)
+
+        if group_by is not None:
+            read_csv_kwargs.setdefault('usecols', list(dict.fromkeys([*columns, group_by])))
+        df = cls._read_file(filename, columns, units, **read_csv_kwargs)
+
+        # position of each row in its measurement, and rows of each measurement
+        if group_by is None:
+            keys = [None]
+            codes = np.zeros(len(df), dtype=np.int64)
+        else:
+            codes, keys = pd.factorize(df.loc[:, group_by])
+            keys = keys.tolist()
+            missing = [key for key in keys if key not in material_runs]
+            if missing:
+                raise ValueError(
+                    f'material_runs must contain a MaterialRun for each value of {group_by}, '
+                    f'but found none for {missing}.'
+                )
+        grp_pos = pd.Series(codes).groupby(codes).cumcount().to_numpy()
+        rows = np.split(np.argsort(codes, kind='stable'), np.cumsum(np.bincount(codes, minlength=len(keys)))[:-1])
 
-        spec = MeasurementSpec(
-            name=measurement_template.name,
-            template=measurement_template,
-            tags=tags
+        # values within bounds need not be checked again by each attribute and by the runs
+        within_bounds = all(
+            cls._within_bounds(df.loc[:, c], template_dict[n], measurement_template, a, u)
+            for a, c, n, u in zip(attr_types, columns, names, units)
         )
 
-        run = MeasurementRun(
-            name=measurement_template.name,
-            spec=spec,
-            tags=tags,
-            material=material_run,
-            source=source,
-            conditions=conditions,
-            parameters=parameters,
-            properties=properties,
-            file_links=[FileLink(filename=filename, url=url)]
-        )
+        objects = {}
+
+        with validation_level(WarningLevel.IGNORE if within_bounds else get_validation_level()):
+
+            conditions, parameters, properties = cls._create_attrs_from_df(
+                df, template_dict, attr_types, columns, names, units, origins, grp_pos
+            )
+
+            # attributes are created column by column, a row at a time
+            nb_columns = {
+                kind: len(attrs) // max(len(df), 1)
+                for kind, attrs in zip(cls.KINDS, (conditions, parameters, properties))
+            }
+            attrs = {
+                kind: np.array(attrs, dtype=object).reshape(nb_columns[kind], len(df))
+                for kind, attrs in zip(cls.KINDS, (conditions, parameters, properties))
+            }
+
+            for key, key_rows in zip(keys, rows):
+
+                spec = MeasurementSpec(
+                    name=measurement_template.name,
+                    template=measurement_template,
+                    tags=tags
+                )
+
+                objects[key] = spec, MeasurementRun(
+                    name=measurement_template.name,
+                    spec=spec,
+                    tags=tags,
+                    material=material_runs[key],
+                    source=source,
+                    conditions=attrs['conditions'][:, key_rows].ravel().tolist(),
+                    parameters=attrs['parameters'][:, key_rows].ravel().tolist(),
+                    properties=attrs['properties'][:, key_rows].ravel().tolist(),
+                    file_links=[FileLink(filename=filename, url=url)]
+                )
 
-        return spec, run
+        return objects
 
     @classmethod
     def _parse(cls, attrs: list[BaseAttribute]) -> tuple[pd.DataFrame, list[BaseAttribute]]:
@@ -259,9 +542,12 @@ class GrpAttrs(BaseSpecialAttrs):
         Match each attribute's name with regular expression.
 
         Base name determines the column. _grp value determines the row.
+        Matches are collected in one pass and the ``DataFrame`` is built at
+        once. If several attributes share a name, the last one is kept.
         '''
 
-        grp_df = pd.DataFrame()
+        # (base, grp) -> attribute
+        grp_attrs: dict[tuple[str, int], BaseAttribute] = {}
         other_attrs = []
 
         for attr in attrs:
@@ -269,10 +555,12 @@ class GrpAttrs(BaseSpecialAttrs):
             match = cls.RE.match(attr.name)
 
             if match is not None:
-                cls._add_attr_to_df(attr, match, grp_df)
+                cls._add_attr_to_df(attr, match, grp_attrs)
             else:
                 other_attrs.append(attr)
 
+        grp_df = cls._build_df(grp_attrs) if grp_attrs else pd.DataFrame()
+
         reindexed_df = cls._reindex_df(grp_df)
 
         return reindexed_df, other_attrs
@@ -282,21 +570,14 @@ class GrpAttrs(BaseSpecialAttrs):
         cls,
         attr: BaseAttribute,
         match: re.Match[str],
-        grp_df: pd.DataFrame
+        grp_attrs: dict[tuple[str, int], BaseAttribute]
         ) -> None:
-        '''Given a matching attribute, add it to `grp_df`.'''
+        '''Given a matching attribute, add it to `grp_attrs`, from which ``_build_df`` creates the ``DataFrame``.'''
 
         # regular expression groups
-        match_groups = match.groups()
-        base_name = match_groups[0]
-        grp_val = int(match_groups[1])
-  
-        # add column if not there
-        if base_name not in grp_df.columns:
-            grp_df[base_name] = np.nan
+        base_name, grp_val = match.groups()
 
-        # place attribute in appropriate df
-        grp_df.loc[grp_val, base_name] = attr
+        grp_attrs[base_name, int(grp_val)] = attr
 
     @classmethod
     def _reindex_df(cls, grp_df: pd.DataFrame) -> pd.DataFrame:
@@ -310,10 +591,10 @@ class GrpAttrs(BaseSpecialAttrs):
     def _reindex_all_dfs(self) -> None:
         '''Ensure that each ``DataFrame`` has the same (maximum) number of groups.'''
 
-        if len(self._grp_conds) == len(self._grp_params):
+        if len(self._grp_conds) == len(self._grp_params) == len(self._grp_props):
             return
 
-        grp_max = int(np.nanmax([self._grp_conds.index.max(), self._grp_params.index.max()]))
+        grp_max = int(np.nanmax([df.index.max() for df in self._df_list()]))
 
         self._grp_conds = self._grp_conds.reindex(np.arange(grp_max+1))
         self._grp_params = self._grp_params.reindex(np.arange(grp_max+1))
@@ -332,6 +613,28 @@ class GrpAttrs(BaseSpecialAttrs):
                     if not pd.isna(attr):
                         attr.name = f'{name}{self.GRP}{i}'
 
+    @staticmethod
+    def _dtype(unit: Union[str, None]) -> Any:
+        '''Type of the column read for a given unit.'''
+
+        if unit in (GrpAttrs.CAT_STR, GrpAttrs.FORM_STR):
+            return str
+
+        return np.int64 if unit is None else np.float64
+
+    @staticmethod
+    def _make_value(val: Any, unit: Union[str, None]) -> BaseValue:
+        '''Create the value of an attribute according to its unit.'''
+
+        if unit == GrpAttrs.CAT_STR:
+            return NominalCategorical(val)
+        elif unit == GrpAttrs.FORM_STR:
+            return EmpiricalFormula(val)
+        elif unit is None:
+            return NominalInteger(val)
+        else:
+            return NominalReal(val, unit)
+
     @classmethod
     def _create_attrs_from_df(
         cls,
@@ -341,14 +644,24 @@ class GrpAttrs(BaseSpecialAttrs):
         columns: list[str],
         names: list[str],
         units: list[Union[str, None]],
-        origins: list[str]
+        origins: list[str],
+        grp_pos: Optional[np.ndarray] = None
         ) -> tuple[list[Condition], list[Parameter], list[Property]]:
-        '''Create conditions, parameters, and properties from the `df` values.'''
+        '''
+        Create conditions, parameters, and properties from the `df` values, a
+        column at a time. Each row is the group of its position in `grp_pos`,
+        which defaults to its position in `df`. Each attribute gets its own
+        value object, so that changing one value never changes another.
+        '''
 
         conditions = []
         parameters = []
         properties = []
 
+        if grp_pos is None:
+            grp_pos = np.arange(len(df))
+        grp_pos = grp_pos.tolist()
+
         for a, c, n, u, o in zip(attr_types, columns, names, units, origins):
 
             if a is Condition:
@@ -363,22 +676,18 @@ class GrpAttrs(BaseSpecialAttrs):
                     f'or Type[Property], but found {type(a)}.'
                 )
 
-            for i, val in enumerate(df.loc[:, c]):
-
-                if u == cls.CAT_STR:
-                    value = NominalCategorical(val)
-                elif u == cls.FORM_STR:
-                    value = EmpiricalFormula(val)
-                elif u is None:
-                    value = NominalInteger(val)
-                else:
-                    value = NominalReal(val, u)
-
-                to_append.append(a(
-                    name=f'{n}{cls.GRP}{i}',
-                    value=value,
-                    template=template_dict[n],
+            template = template_dict[n]
+            prefix = f'{n}{cls.GRP}'
+            vals = df.loc[:, c].tolist()
+
+            to_append.extend(
+                a(
+                    name=f'{prefix}{i}',
+                    value=cls._make_value(val, u),
+                    template=template,
                     origin=o
-                ))
+                )
+                for i, val in zip(grp_pos, vals)
+            )
 
         return conditions, parameters, properties
@@ -0,0 +1,528 @@
+'''Vectorized ramp/hold segments of heating programs.'''
+
+from typing import ClassVar, Union, Optional, Iterable
+import re
+
+import numpy as np
+import pandas as pd
+
+from gemd import ProcessSpec, ProcessRun, NominalComposition
+from gemd.entity.attribute.base_attribute import BaseAttribute
+from gemd.units import convert_units
+
+from .seg_attrs import SegAttrs, Process
+
+__all__ = ['HeatingPrograms']
+
+Step = dict[str, Union[str, float]]
+
+class HeatingPrograms:
+    '''
+    Represent the ramp/hold segments of one or more heating programs as
+    typed arrays of start temperature, end temperature, duration, and rate.
+
+    Programs are padded to the same number of segments, so that each array
+    has shape ``(n_programs, n_segments)``. Padding segments last 0 hours at
+    the final temperature of their program and do not change any result.
+    Temperatures are in degC, durations in hours, and rates in degC/hr.
+
+    Programs can come from ``build_heating_program`` (lists of steps such as
+    ``{'Type': 'Hold', 'Temp': 650.0, 'Duration': 24.0}``), from the
+    ``Step <n>`` ``NominalComposition`` parameters of heating processes, or
+    from ``SegAttrs``.
+    '''
+
+    TEMP_UNITS: ClassVar[str] = 'degC'
+    TIME_UNITS: ClassVar[str] = 'hr'
+    INIT: ClassVar[str] = 'init'
+    RAMP: ClassVar[str] = 'ramp'
+    HOLD: ClassVar[str] = 'hold'
+    END: ClassVar[str] = 'end'
+    STEP_RE: ClassVar[re.Pattern] = re.compile(r'^Step (\d+)$')
+
+    def __init__(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        duration: np.ndarray,
+        types: Optional[np.ndarray] = None,
+        names: Optional[list[str]] = None
+        ) -> None:
+        '''
+        Wrap already-padded segment arrays. See `from_programs`,
+        `from_processes`, and `from_seg_attrs` to build them.
+
+        Parameters
+        ----------
+        start, end, duration: ndarray
+            Start temperature, end temperature, and duration of each segment,
+            with shape ``(n_programs, n_segments)``.
+        types: ndarray, optional
+            Type of each segment (``'ramp'``, ``'hold'``, or ``''`` for
+            padding), with the same shape.
+        names: list[str], optional
+            Name of each program. Defaults to their positions.
+        '''
+
+        self._start = np.atleast_2d(np.asarray(start, dtype=np.float64))
+        self._end = np.atleast_2d(np.asarray(end, dtype=np.float64))
+        self._duration = np.atleast_2d(np.asarray(duration, dtype=np.float64))
+
+        if not (self._start.shape == self._end.shape == self._duration.shape):
+            raise ValueError('start, end, and duration must have the same shape.')
+
+        if types is None:
+            types = np.where(self._start == self._end, self.HOLD, self.RAMP).astype(object)
+            types[self._duration == 0] = ''
+        self._types = np.atleast_2d(np.asarray(types, dtype=object))
+
+        self._names = list(range(len(self))) if names is None else list(names)
+
+        if len(self._names) != len(self):
+            raise ValueError('names must contain one name per program.')
+
+    def __len__(self) -> int:
+        return self._start.shape[0]
+
+    @property
+    def names(self) -> list[str]:
+        '''Name of each program.'''
+        return self._names
+
+    @property
+    def types(self) -> np.ndarray:
+        '''Type of each segment, ``''`` for padding.'''
+        return self._types
+
+    @property
+    def start(self) -> np.ndarray:
+        '''Start temperature of each segment in degC.'''
+        return self._start
+
+    @property
+    def end(self) -> np.ndarray:
+        '''End temperature of each segment in degC.'''
+        return self._end
+
+    @property
+    def duration(self) -> np.ndarray:
+        '''Duration of each segment in hours.'''
+        return self._duration
+
+    @property
+    def rate(self) -> np.ndarray:
+        '''Signed rate of each segment in degC/hr, 0 for holds and padding.'''
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self._duration > 0, (self._end - self._start) / self._duration, 0.)
+
+    @property
+    def total_duration(self) -> np.ndarray:
+        '''Total duration of each program in hours.'''
+        return self._duration.sum(axis=1)
+
+    @property
+    def max_temperature(self) -> np.ndarray:
+        '''Maximum temperature reached by each program in degC.'''
+        return np.fmax(self._start, self._end).max(axis=1, initial=-np.inf)
+
+    @classmethod
+    def from_programs(
+        cls,
+        programs: Union[list[Step], list[list[Step]]],
+        names: Optional[list[str]] = None,
+        initial_temperature: Optional[float] = None
+        ) -> 'HeatingPrograms':
+        '''
+        Create from one or more lists of steps, as returned by
+        ``build_heating_program``.
+
+        ``'Init'`` and ``'End'`` steps only mark the start and end of a
+        program. A ramp starts from the temperature reached by the previous
+        step, or from the ``'Init'`` temperature for the first one.
+
+        Parameters
+        ----------
+        programs: list[dict] or list[list[dict]]
+            The steps of one program, or of several programs.
+        names: list[str], optional
+            Name of each program. Defaults to their positions.
+        initial_temperature: float, optional
+            Start temperature of each program in degC, overriding the
+            ``'Init'`` steps. If neither is given, a program starts at the
+            temperature of its first step.
+        '''
+
+        if len(programs) > 0 and isinstance(programs[0], dict):
+            programs = [programs]
+
+        return cls._from_segments(
+            [cls._segments_from_steps(steps, initial_temperature) for steps in programs],
+            names
+        )
+
+    @classmethod
+    def from_processes(
+        cls,
+        processes: Iterable[Process],
+        initial_temperature: Optional[float] = None,
+        **seg_attrs_kwargs: str
+        ) -> 'HeatingPrograms':
+        '''
+        Create from heating processes, named after them.
+
+        Processes holding ``Step <n>`` ``NominalComposition`` parameters
+        (see ``build_heating_material_proc_spec``) are read as steps, the
+        others as segment attributes (see `from_seg_attrs`). A ``ProcessRun``
+        without either is read from its spec.
+
+        Parameters
+        ----------
+        processes: iterable of ProcessSpec or ProcessRun
+            The heating processes.
+        initial_temperature: float, optional
+            See `from_programs`.
+        **seg_attrs_kwargs: str
+            Attribute names passed to `from_seg_attrs`.
+        '''
+
+        segments = []
+        names = []
+
+        for process in processes:
+            steps = cls._steps_from_process(process)
+            if not steps and isinstance(process, ProcessRun) and isinstance(process.spec, ProcessSpec):
+                steps = cls._steps_from_process(process.spec)
+
+            if steps:
+                segments.append(cls._segments_from_steps(steps, initial_temperature))
+            else:
+                segments.append(cls._segments_from_seg_attrs(
+                    SegAttrs(process), initial_temperature=initial_temperature, **seg_attrs_kwargs
+                ))
+            names.append(process.name)
+
+        return cls._from_segments(segments, names)
+
+    @classmethod
+    def from_seg_attrs(
+        cls,
+        seg_attrs: Union[SegAttrs, list[SegAttrs]],
+        temperature: str = 'Furnace Temperature',
+        duration: str = 'Duration',
+        rate: str = 'Furnace Rate',
+        initial_temperature: Optional[float] = None
+        ) -> 'HeatingPrograms':
+        '''
+        Create from the segments of one or more ``SegAttrs``, named after
+        their processes.
+
+        Each segment holds its ``"Segment type"`` and its (end) temperature.
+        The duration of a ramp without a duration is derived from its rate.
+
+        Parameters
+        ----------
+        seg_attrs: SegAttrs or list[SegAttrs]
+            The segment attributes of each program.
+        temperature: str, default 'Furnace Temperature'
+            Base name of the segment temperature attributes.
+        duration: str, default 'Duration'
+            Base name of the segment duration attributes.
+        rate: str, default 'Furnace Rate'
+            Base name of the segment rate attributes, in degC/hr.
+        initial_temperature: float, optional
+            Start temperature of each program in degC. Defaults to the
+            temperature of its first segment.
+        '''
+
+        if isinstance(seg_attrs, SegAttrs):
+            seg_attrs = [seg_attrs]
+
+        return cls._from_segments(
+            [
+                cls._segments_from_seg_attrs(s, temperature, duration, rate, initial_temperature)
+                for s in seg_attrs
+            ],
+            [s.process.name for s in seg_attrs]
+        )
+
+    def profile(
+        self,
+        times: Optional[np.ndarray] = None,
+        num: int = 500
+        ) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Compute the temperature of every program at the same times.
+
+        A program holds its final temperature after it ends.
+
+        Parameters
+        ----------
+        times: ndarray, optional
+            Times in hours since the start of the programs. Defaults to `num`
+            evenly spaced times over the longest program.
+        num: int, default 500
+            Number of times when `times` is not given.
+
+        Returns
+        -------
+        times: ndarray
+            The times, with shape ``(n_times,)``.
+        temperatures: ndarray
+            Temperatures in degC, with shape ``(n_programs, n_times)``.
+        '''
+
+        if times is None:
+            times = np.linspace(0., self.total_duration.max(initial=0.), num)
+        times = np.clip(np.asarray(times, dtype=np.float64), 0., None)
+
+        n, m = self._duration.shape
+        if m == 0:
+            return times, np.full((n, len(times)), np.nan)
+
+        # one more padding segment holds the final temperature after each program ends
+        final = self._end[:, -1:]
+        duration = np.hstack((self._duration, np.zeros((n, 1))))
+        starts = np.cumsum(duration, axis=1) - duration
+        m += 1
+
+        # temperature is linear in time within a segment: intercept + slope * time
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = np.where(duration > 0, (np.hstack((self._end, final)) - np.hstack((self._start, final))) / duration, 0.)
+        intercept = np.where(duration > 0, np.hstack((self._start, final)) - slope * starts, np.hstack((self._end, final)))
+
+        # each time falls in the last segment started at or before it: count the segment
+        # starts (after the first one) up to each time, with one cumsum over all programs
+        order = np.argsort(times, kind='stable')
+        positions = np.searchsorted(times[order], starts[:, 1:], side='left')
+        positions += np.arange(n)[:, np.newaxis] * (len(times) + 1)
+        marks = np.bincount(positions.ravel(), minlength=n * (len(times) + 1)).reshape(n, -1)
+        seg = np.empty((n, len(times)), dtype=np.int64)
+        seg[:, order] = np.cumsum(marks[:, :-1], axis=1)
+        seg += np.arange(n)[:, np.newaxis] * m
+
+        return times, intercept.ravel()[seg] + slope.ravel()[seg] * times
+
+    def time_above(self, threshold: Union[float, np.ndarray]) -> np.ndarray:
+        '''
+        Time each program spends above a temperature.
+
+        Parameters
+        ----------
+        threshold: float or ndarray
+            Temperature in degC, or one temperature per program.
+
+        Returns
+        -------
+        time_above: ndarray
+            Time in hours, with shape ``(n_programs,)``.
+        '''
+
+        return (self._duration * self._frac_above(threshold)).sum(axis=1)
+
+    def thermal_budget(self, reference: Optional[Union[float, np.ndarray]] = None) -> np.ndarray:
+        '''
+        Integral of the temperature over time of each program.
+
+        Parameters
+        ----------
+        reference: float or ndarray, optional
+            If given, only the excess temperature above `reference` (in degC,
+            or one temperature per program) is integrated.
+
+        Returns
+        -------
+        thermal_budget: ndarray
+            Thermal budget in degC*hr, with shape ``(n_programs,)``.
+        '''
+
+        if reference is None:
+            budget = self._duration * (self._start + self._end) / 2
+        else:
+            reference = self._per_program(reference)
+            low = np.fmin(self._start, self._end)
+            high = np.fmax(self._start, self._end)
+            # excess temperature rises linearly from max(low, reference) to high
+            # while the segment is above reference
+            excess = (high + np.maximum(low, reference)) / 2 - reference
+            budget = self._duration * self._frac_above(reference) * excess
+
+        return np.where(self._duration > 0, budget, 0.).sum(axis=1)
+
+    def to_frame(self) -> pd.DataFrame:
+        '''
+        Return the segments, without padding, as a ``DataFrame`` indexed by
+        program name and segment.
+        '''
+
+        program, segment = np.nonzero(self._types != '')
+
+        return pd.DataFrame(
+            {
+                'type': self._types[program, segment],
+                'start': self._start[program, segment],
+                'end': self._end[program, segment],
+                'duration': self._duration[program, segment],
+                'rate': self.rate[program, segment],
+            },
+            index=pd.MultiIndex.from_arrays(
+                (np.asarray(self._names, dtype=object)[program], segment),
+                names=('program', 'segment')
+            )
+        )
+
+    def _per_program(self, value: Union[float, np.ndarray]) -> np.ndarray:
+        '''Broadcast a scalar or one value per program against the segments.'''
+
+        value = np.asarray(value, dtype=np.float64)
+
+        if value.ndim == 1:
+            if len(value) != len(self):
+                raise ValueError(f'Expected one value per program ({len(self)}), but found {len(value)}.')
+            value = value[:, np.newaxis]
+
+        return value
+
+    def _frac_above(self, threshold: Union[float, np.ndarray]) -> np.ndarray:
+        '''Fraction of each segment spent above `threshold`.'''
+
+        threshold = self._per_program(threshold)
+        low = np.fmin(self._start, self._end)
+        high = np.fmax(self._start, self._end)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frac = np.clip((high - threshold) / (high - low), 0., 1.)
+
+        return np.where(high > low, frac, low > threshold)
+
+    @classmethod
+    def _from_segments(
+        cls,
+        segments: list[list[tuple[str, float, float, float]]],
+        names: Optional[list[str]] = None
+        ) -> 'HeatingPrograms':
+        '''Pad lists of ``(type, start, end, duration)`` segments into arrays.'''
+
+        n = len(segments)
+        m = max((len(s) for s in segments), default=0)
+
+        types = np.full((n, m), '', dtype=object)
+        values = np.zeros((3, n, m))
+
+        for i, program in enumerate(segments):
+            if len(program) > 0:
+                types[i, :len(program)] = [s[0] for s in program]
+                values[:, i, :len(program)] = np.array([s[1:] for s in program], dtype=np.float64).T
+                # padding holds the final temperature for no time
+                values[:2, i, len(program):] = program[-1][2]
+            else:
+                values[:2, i] = np.nan
+
+        return cls(values[0], values[1], values[2], types, names)
+
+    @classmethod
+    def _segments_from_steps(
+        cls,
+        steps: list[Step],
+        initial_temperature: Optional[float] = None
+        ) -> list[tuple[str, float, float, float]]:
+        '''Turn ``build_heating_program`` steps into segments.'''
+
+        temp = initial_temperature
+        segments = []
+
+        for step in steps:
+            step_type = str(step['Type']).lower()
+            step_temp = float(step['Temp'])
+
+            if step_type == cls.INIT:
+                if initial_temperature is None:
+                    temp = step_temp
+                continue
+            elif step_type == cls.END:
+                continue
+            elif step_type not in (cls.RAMP, cls.HOLD):
+                raise ValueError(
+                    f'Step types must be one of {(cls.INIT, cls.RAMP, cls.HOLD, cls.END)}, '
+                    f'but found {step["Type"]}.'
+                )
+
+            if temp is None or step_type == cls.HOLD:
+                temp = step_temp
+
+            segments.append((step_type, temp, step_temp, float(step['Duration'])))
+            temp = step_temp
+
+        return segments
+
+    @classmethod
+    def _steps_from_process(cls, process: Process) -> list[Step]:
+        '''Return the steps held by ``Step <n>`` parameters, in order.'''
+
+        steps = {}
+
+        for param in process.parameters:
+            match = cls.STEP_RE.match(param.name)
+            if match is not None and isinstance(param.value, NominalComposition):
+                steps[int(match.group(1))] = param.value.quantities
+
+        return [steps[i] for i in sorted(steps)]
+
+    @classmethod
+    def _segments_from_seg_attrs(
+        cls,
+        seg_attrs: SegAttrs,
+        temperature: str = 'Furnace Temperature',
+        duration: str = 'Duration',
+        rate: str = 'Furnace Rate',
+        initial_temperature: Optional[float] = None
+        ) -> list[tuple[str, float, float, float]]:
+        '''Turn segment attributes into segments.'''
+
+        attrs = pd.concat((seg_attrs.segment_conditions, seg_attrs.segment_parameters), axis=1)
+
+        if len(attrs) == 0:
+            return []
+
+        if SegAttrs.SEG_PARAM_NAME not in attrs.columns or temperature not in attrs.columns:
+            raise ValueError(
+                f'Segment attributes must contain "{SegAttrs.SEG_PARAM_NAME}" and "{temperature}".'
+            )
+
+        types = [
+            str(attr.value.category).lower() if not pd.isna(attr) else cls.HOLD
+            for attr in attrs[SegAttrs.SEG_PARAM_NAME]
+        ]
+        end = cls._nominals(attrs[temperature], cls.TEMP_UNITS)
+        durations = cls._nominals(attrs.get(duration), cls.TIME_UNITS, len(attrs))
+        rates = cls._nominals(attrs.get(rate), None, len(attrs))
+
+        start = np.roll(end, 1)
+        start[0] = end[0] if initial_temperature is None else initial_temperature
+        start = np.where(np.array(types) == cls.HOLD, end, start)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            durations = np.where(np.isnan(durations), np.abs(end - start) / np.abs(rates), durations)
+
+        return list(zip(types, start, end, np.nan_to_num(durations)))
+
+    @staticmethod
+    def _nominals(
+        attrs: Optional[pd.Series],
+        units: Optional[str],
+        length: int = 0
+        ) -> np.ndarray:
+        '''Nominal values of attributes in `units`, ``NaN`` where missing.'''
+
+        if attrs is None:
+            return np.full(length, np.nan)
+
+        values = np.full(len(attrs), np.nan)
+
+        for i, attr in enumerate(attrs):
+            if isinstance(attr, BaseAttribute):
+                value = attr.value
+                values[i] = value.nominal
+                if units is not None and getattr(value, 'units', None) not in (None, '', units):
+                    values[i] = convert_units(value.nominal, value.units, units)
+
+        return values
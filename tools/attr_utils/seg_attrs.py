@@ -124,6 +124,21 @@ class SegAttrs(BaseSpecialAttrs):
 
         self._reindex_all_attrs()
 
+    def heating_program(self, **kwargs: Any) -> 'HeatingPrograms':
+        '''
+        Return the segments as typed arrays of start temperature, end
+        temperature, duration, and rate.
+
+        Parameters
+        ----------
+        **kwargs: Any
+            Passed to ``HeatingPrograms.from_seg_attrs()``.
+        '''
+
+        from .heating_program import HeatingPrograms  # heating_program imports this module
+
+        return HeatingPrograms.from_seg_attrs(self, **kwargs)
+
     def update_object(self) -> None:
         '''
         Update the ``ProcessSpec`` or ``ProcessRun`` used to initialize
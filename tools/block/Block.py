@@ -26,6 +26,15 @@ class Block:
         self.measurements = measurements
         pass
 
+    def base_nodes(self):
+        # yields the block's nodes in the same order they are dumped
+        yield from self.ingredients
+        if self.process:
+            yield self.process
+        if self.material:
+            yield self.material
+        yield from self.measurements
+
     def thin_dumps(self, encoder, destination):
         for ingredient in self.ingredients:
             ingredient.thin_dumps(encoder, destination)
@@ -36,6 +45,22 @@ class Block:
         for measurement in self.measurements:
             measurement.thin_dumps(encoder, destination)
 
+    def incremental_thin_dumps(self, encoder, store, namespace=None):
+        # writes to the shared ContentStore only the objects whose thin JSON is not there yet,
+        # and returns manifest entries for ContentStore.write_manifest.
+        # With a namespace (e.g., the dump folder name), objects without a uid get one that is stable across re-runs
+        entries = []
+        nodes = list(self.base_nodes())
+        if namespace is not None:
+            for i, node in enumerate(nodes):
+                store.stamp(node.spec, encoder.scope, namespace, self.name, i, "spec")
+                store.stamp(node.run, encoder.scope, namespace, self.name, i, "run")
+        for node in nodes:
+            for obj in (node.spec, node.run):
+                entry, _ = store.put_object(encoder, obj)
+                entries.append(entry)
+        return entries
+
     def dumps(self, encoder, destination):
         for ingredient in self.ingredients:
             ingredient.dumps(encoder, destination)
@@ -4,5 +4,7 @@ from .material import Material
 from .process import Process
 from .measurement import Measurement
 from .ingredient import Ingredient
+from .node_registry import NodeRegistry
+from .template_store import TemplateStore, LazyTemplates, TEMPLATES
 
-__all__ = ['Material', 'Process', 'Measurement', 'Ingredient']
+__all__ = ['Material', 'Process', 'Measurement', 'Ingredient', 'NodeRegistry', 'TemplateStore', 'LazyTemplates', 'TEMPLATES']
@@ -18,6 +18,7 @@ from gemd.entity.value.base_value import BaseValue
 from gemd.enumeration import Origin
 
 from .typing import Temp, Spec, Run, SpecOrRun, SpecRunLiteral
+from .template_store import TEMPLATES
 
 
 class AttrDict(TypedDict):
@@ -62,6 +63,10 @@ class AttrsDict(TypedDict, total=False):
     properties: dict[str, PropDict]
 
 
+# keys of the attribute templates in the dicts of AttrsDict
+_ATTR_DICT_KEYS = {"conditions": "cond", "parameters": "param", "properties": "prop"}
+
+
 def define_attribute(
     cls_attrs: AttrsDict,
     template: AttributeTemplate,
@@ -102,13 +107,24 @@ def define_attribute(
     }
 
 
-def finalize_template(cls_attrs: AttrsDict, cls_template: Temp) -> None:
+def finalize_template(cls_attrs: AttrsDict, cls_template: Temp) -> Temp:
     """
-    Add conditions, parameters, and properties to ``cls_template``.
+    Add conditions, parameters, and properties to ``cls_template`` and return
+    its canonical template.
+
+    Use in subclasses after all ``define_attribute`` calls, as
+    ``TEMPLATE = finalize_template(_ATTRS, TEMPLATE)``.
 
-    Use in subclasses after all ``define_attribute`` calls.
+    Attribute templates are replaced by their canonical templates in
+    ``TEMPLATES``, and ``cls_template`` is interned. The returned template is
+    the one interned first with the same content, so that subclasses with
+    equal templates share a single template object.
     """
 
+    for attr_type, attr_dict_key in _ATTR_DICT_KEYS.items():
+        for attr_dict in cls_attrs.get(attr_type, {}).values():
+            attr_dict[attr_dict_key] = TEMPLATES.intern(attr_dict[attr_dict_key])
+
     if cls_attrs.get("conditions") is not None:
         cls_template.conditions = [
             (cond_dict["cond"], cond_dict["bounds"])
@@ -127,6 +143,8 @@ def finalize_template(cls_attrs: AttrsDict, cls_template: Temp) -> None:
             for prop_dict in cls_attrs["properties"].values()
         ]
 
+    return TEMPLATES.intern(cls_template)
+
 
 def update_attrs(
     attrs: AttrsDict,
@@ -46,8 +46,9 @@ class BaseNode(ABC):
     ``define_attribute(_ATTRS, ...)`` from the ``qf_gemd.base.attributes``
     module.
 
-    4. Call ``finalize_template(_ATTRS, TEMPLATE)``, found in the
-    ``qf_gemd.base.attributes`` module, to add attributes to ``TEMPLATE``.
+    4. Assign ``TEMPLATE = finalize_template(_ATTRS, TEMPLATE)``, found in
+    the ``qf_gemd.base.attributes`` module, to add attributes to ``TEMPLATE``
+    and replace it by its canonical template.
 
     5. Follow any additional subclass directions.
     """
@@ -97,6 +98,20 @@ class BaseNode(ABC):
         and the run's spec will be set to this spec.
         """
 
+    @classmethod
+    def wrap(cls, spec: Spec, run: Run) -> "BaseNode":
+        """
+        Wrap an existing spec and run, e.g. loaded from JSON, as a `BaseNode`.
+
+        Unlike `from_spec_or_run`, nothing is validated or renamed and the
+        spec keeps its own template, so `TEMPLATE` need not be defined.
+        """
+
+        node = cls.__new__(cls)
+        node._spec = spec
+        node._run = run
+        return node
+
     def _update_attributes(
         self,
         AttrType: Type[BaseAttribute],
@@ -366,7 +381,13 @@ class BaseNode(ABC):
 
     def dump_loop(self, encoder_func, destination):
         for obj in [self._spec, self._run]:
-            encoder_func(obj, indent=3)  # trigger uids assignment
-            fn = "_".join([obj.__class__.__name__, obj.name, obj.uids["auto"],'.json'])
-            with open(os.path.join(destination, fn), "w") as fp:
-                fp.write(encoder_func(obj, indent=3))
+            # serializing assigns uids as a side effect, so the file name can
+            # only be built afterwards; encode once and reuse the result
+            serialized = encoder_func(obj, indent=3)
+            with open(os.path.join(destination, self.dump_filename(obj)), "w") as fp:
+                fp.write(serialized)
+
+    @staticmethod
+    def dump_filename(obj: SpecOrRun) -> str:
+        """Return the JSON file name used when dumping a spec or run."""
+        return "_".join([obj.__class__.__name__, obj.name, obj.uids["auto"],'.json'])
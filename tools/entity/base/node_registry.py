@@ -0,0 +1,82 @@
+"""Registry of ``BaseNode`` subclasses built once and shared by their builders."""
+
+from typing import Callable, Iterator, Type
+
+from .base_node import BaseNode
+from .typing import Temp
+
+__all__ = ["NodeRegistry"]
+
+NodeFactory = Callable[[], Type[BaseNode]]
+
+
+class NodeRegistry:
+    """
+    Lazy registry of ``BaseNode`` subclasses.
+
+    Builders that define a ``BaseNode`` subclass inside their body run
+    ``define_attribute`` and ``finalize_template`` again, and create a new
+    template, at every call. Registering the class definition as a factory
+    instead builds the class, and its ``TEMPLATE``, on first use only; every
+    later lookup returns the same class, so that all the nodes built from it
+    share one template.
+
+    Usage::
+
+        NODE_CLASSES = NodeRegistry()
+
+        @NODE_CLASSES.register
+        def _grinding_process() -> type[Process]:
+            class GrindingProcess(Process):
+                TEMPLATE: ClassVar[ProcessTemplate] = ProcessTemplate(name=__name__)
+                ...
+            return GrindingProcess
+
+        process = NODE_CLASSES['grinding_process'].from_spec_or_run(...)
+    """
+
+    def __init__(self) -> None:
+        self._factories: dict[str, NodeFactory] = {}
+        self._classes: dict[str, Type[BaseNode]] = {}
+
+    def register(self, factory: NodeFactory) -> NodeFactory:
+        """
+        Register a function returning a ``BaseNode`` subclass under its name,
+        without leading underscores.
+
+        The function is only called on the first lookup of its name.
+        """
+
+        name = factory.__name__.lstrip("_")
+        if name in self._factories:
+            raise ValueError(f'A node class named "{name}" is already registered.')
+
+        self._factories[name] = factory
+        return factory
+
+    def __getitem__(self, name: str) -> Type[BaseNode]:
+        """Return the class registered under `name`, building it on first use."""
+
+        if name not in self._classes:
+            if name not in self._factories:
+                raise KeyError(f'No node class named "{name}" is registered.')
+            self._classes[name] = self._factories[name]()
+
+        return self._classes[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def built(self) -> dict[str, Type[BaseNode]]:
+        """Return the classes built so far, by name."""
+        return dict(self._classes)
+
+    def templates(self) -> dict[str, Temp]:
+        """Return the templates of the classes built so far, by name."""
+        return {name: cls.TEMPLATE for name, cls in self._classes.items()}
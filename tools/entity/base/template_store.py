@@ -0,0 +1,245 @@
+"""Store interning GEMD templates by content so that equal templates share one uid."""
+
+import json
+import os
+import uuid
+from collections.abc import MutableMapping
+from typing import Callable, Iterator, Optional, TypeVar, Union
+
+from gemd.entity.link_by_uid import LinkByUID
+from gemd.entity.template.attribute_template import AttributeTemplate
+from gemd.entity.template.base_template import BaseTemplate
+
+__all__ = ["TemplateStore", "LazyTemplates", "TEMPLATES"]
+
+# attribute templates do not derive from BaseTemplate
+Template = Union[BaseTemplate, AttributeTemplate]
+AnyTemp = TypeVar("AnyTemp", BaseTemplate, AttributeTemplate)
+
+
+class TemplateStore:
+    """
+    Canonical store of templates, keyed by their content.
+
+    Builders and ``BaseNode`` subclasses that create a template at every call,
+    or in every notebook, produce templates that are equal but have different
+    uids, so their specs and runs never link to the same template. `intern`
+    returns the first template stored with the same content, so equal templates
+    are a single object within a process, and gives it a uid derived from its
+    type and name (see `identity`), so the same template gets the same uid in
+    every notebook, whatever order they build templates in, and keeps it when,
+    e.g., a category is added to its bounds.
+
+    The content of an object template includes the content of its attribute
+    templates, which are interned along with it. Templates should only be
+    interned once complete, as later changes are not reflected in their key.
+    """
+
+    # uuid5 namespace of the uids given to interned templates, must never change
+    NAMESPACE = uuid.UUID("0b1e9f2c-5d52-4c1e-9a53-2f0f3b8de6a1")
+
+    _ATTR_TYPES = ("conditions", "parameters", "properties")
+
+    def __init__(self, scope: str = "auto") -> None:
+        """
+        Parameters
+        ----------
+        scope: str, default 'auto'
+            Scope of the uids given to interned templates, i.e. that of the
+            ``GEMDJson`` encoder used to dump them.
+        """
+
+        self.scope = scope
+        self._templates: dict[str, Template] = {}
+        self._uids: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, template: Template) -> str:
+        """Return the content key of `template`, which ignores its uids."""
+
+        content = {
+            "type": template.typ,
+            "name": template.name,
+            "description": template.description,
+            "tags": sorted(template.tags),
+        }
+
+        if isinstance(template, AttributeTemplate):
+            content["bounds"] = template.bounds.dump()
+        else:
+            for attr_type in self._ATTR_TYPES:
+                if hasattr(template, attr_type):
+                    content[attr_type] = [
+                        [self._attr_key(attr), None if bounds is None else bounds.dump()]
+                        for attr, bounds in getattr(template, attr_type)
+                    ]
+            for allowed in ("allowed_names", "allowed_labels"):
+                if getattr(template, allowed, None):
+                    content[allowed] = sorted(getattr(template, allowed))
+
+        return json.dumps(content, sort_keys=True)
+
+    def identity(self, template: Template) -> str:
+        """
+        Return the key the uid of `template` is derived from.
+
+        Unlike `key`, it only holds the type and name of the template, the type
+        of the bounds of an attribute template, and the identities of the
+        attribute templates of an object template (whose name is often only
+        that of its module), so that the uid does not change with descriptions,
+        tags or category lists.
+        """
+
+        content = {"type": template.typ, "name": template.name}
+        if isinstance(template, AttributeTemplate):
+            content["bounds"] = template.bounds.typ
+        else:
+            for attr_type in self._ATTR_TYPES:
+                if getattr(template, attr_type, None):
+                    content[attr_type] = sorted(
+                        self._attr_key(attr) if isinstance(attr, LinkByUID) else self.identity(attr)
+                        for attr, _ in getattr(template, attr_type)
+                    )
+        return json.dumps(content, sort_keys=True)
+
+    def _attr_key(self, attr: Union[AttributeTemplate, LinkByUID]) -> str:
+        """Return the key of an attribute template referenced by an object template."""
+
+        if isinstance(attr, LinkByUID):
+            return json.dumps({"scope": attr.scope.lower(), "id": attr.id})
+        return self.key(attr)
+
+    def intern(self, template: AnyTemp) -> AnyTemp:
+        """
+        Return the canonical template with the same content as `template`.
+
+        If there is none yet, `template` becomes canonical and is given a uid
+        derived from its `identity`, unless it already has a uid in `scope`
+        (e.g. it was loaded from a dump). If another canonical template already
+        has that uid, i.e. two different templates share a type and name in the
+        same process, the uid is derived from the full content instead. The
+        attribute templates of an object template are replaced by their
+        canonical templates.
+        """
+
+        if not isinstance(template, AttributeTemplate):
+            for attr_type in self._ATTR_TYPES:
+                attrs = getattr(template, attr_type, None)
+                if not attrs:
+                    continue
+                interned = [
+                    (attr if isinstance(attr, LinkByUID) else self.intern(attr), bounds)
+                    for attr, bounds in attrs
+                ]
+                if any(new is not old for (new, _), (old, _) in zip(interned, attrs)):
+                    setattr(template, attr_type, interned)
+
+        key = self.key(template)
+        canonical = self._templates.get(key)
+        if canonical is not None:
+            self.hits += 1
+            return canonical
+
+        self.misses += 1
+        if self.scope not in template.uids:
+            uid = str(uuid.uuid5(self.NAMESPACE, self.identity(template)))
+            if uid in self._uids:
+                uid = str(uuid.uuid5(self.NAMESPACE, key))
+            template.add_uid(self.scope, uid)
+        self._uids.add(template.uids[self.scope])
+        self._templates[key] = template
+        return template
+
+    def get(self, template: Template) -> Optional[Template]:
+        """Return the canonical template equal to `template`, or None if not interned."""
+        return self._templates.get(self.key(template))
+
+    def __contains__(self, template: Template) -> bool:
+        return self.get(template) is not None
+
+    def __iter__(self) -> Iterator[Template]:
+        return iter(self._templates.values())
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of canonical templates and of intern calls that found one."""
+        return {"templates": len(self), "hits": self.hits, "misses": self.misses}
+
+    def thin_dumps(self, encoder, destination: str) -> int:
+        """
+        Write the thin JSON of every canonical template to `destination` once.
+
+        Meant to be called once per dump folder, next to the ``thin_dumps`` of
+        the blocks, so that the template links of their specs and runs resolve.
+        Returns the number of templates written.
+        """
+
+        from .base_node import BaseNode  # base_node imports this module through attributes
+
+        os.makedirs(destination, exist_ok=True)
+        for template in self:
+            serialized = encoder.thin_dumps(template, indent=3)
+            with open(os.path.join(destination, BaseNode.dump_filename(template)), "w") as fp:
+                fp.write(serialized)
+        return len(self)
+
+
+# store shared by finalize_template and the template dicts of utils.templates
+TEMPLATES = TemplateStore()
+
+
+class LazyTemplates(MutableMapping):
+    """
+    Dict of templates built on first access, e.g. ``ATTR_TEMPL``.
+
+    A key may be set to a template or to a function returning one. The
+    function is only called on the first lookup of its key, and the template
+    it returns is interned in `store`, as is a template set directly, so that
+    importing a module full of templates does not build those it never uses.
+    Iterating over values or items builds every template.
+    """
+
+    def __init__(self, store: Optional[TemplateStore] = None) -> None:
+        self._store = TEMPLATES if store is None else store
+        self._entries: dict[str, Union[Template, Callable[[], Template]]] = {}
+
+    def __getitem__(self, name: str) -> Template:
+        entry = self._entries[name]
+        if not isinstance(entry, (BaseTemplate, AttributeTemplate)):
+            entry = self._entries[name] = self._store.intern(entry())
+        return entry
+
+    def __setitem__(
+        self, name: str, value: Union[Template, Callable[[], Template]]
+    ) -> None:
+        if isinstance(value, (BaseTemplate, AttributeTemplate)):
+            value = self._store.intern(value)
+        elif not callable(value):
+            raise TypeError(
+                f"{name} must be set to a template or a function returning one, "
+                f"but found {type(value).__name__}."
+            )
+        self._entries[name] = value
+
+    def __delitem__(self, name: str) -> None:
+        del self._entries[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def built(self) -> list[str]:
+        """Return the names of the templates built so far."""
+        return [
+            name
+            for name, entry in self._entries.items()
+            if isinstance(entry, (BaseTemplate, AttributeTemplate))
+        ]
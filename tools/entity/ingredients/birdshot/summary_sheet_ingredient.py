@@ -27,4 +27,4 @@ class SummarySheetIngredient(Ingredient):
     #     default_value=NominalCategorical('')
     # )
 
-    # finalize_template(_ATTRS, TEMPLATE)
+    # TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
@@ -49,4 +49,4 @@ class Alloy(Material):
     #     default_value=NominalReal(0.0, "g"),
     # )
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
@@ -75,4 +75,4 @@ class Composition(Material):
     # )
     
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
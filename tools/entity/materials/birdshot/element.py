@@ -47,4 +47,4 @@ class Element(Material):
     
     
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
@@ -28,7 +28,7 @@ class SummarySheet(Material):
     #     default_value=NominalCategorical('')
     # )
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
     
     
         
@@ -25,4 +25,4 @@ class Traveler(Material):
     #     default_value=NominalCategorical('')
     # )
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
@@ -26,4 +26,4 @@ class TravelerSample(Material):
     #     default_value=NominalCategorical('')
     # )
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
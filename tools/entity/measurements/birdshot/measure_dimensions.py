@@ -54,4 +54,4 @@ class MeasureDimensions(Measurement):
         ),
     )
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
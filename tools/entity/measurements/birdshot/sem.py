@@ -23,4 +23,4 @@ class SEM(Measurement):
 
     
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
@@ -65,4 +65,4 @@ class Tensile(Measurement):
         # default_value=NominalReal(0, "MPa"),
     )
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
@@ -37,4 +37,4 @@ class Weighting(Measurement):
         default_value=NominalReal(0.0, "g"),
     )
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
@@ -52,4 +52,4 @@ class XRD(Measurement):
         # default_value=NominalReal(0, "Pa"),
     )
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
@@ -68,4 +68,4 @@ class ArcMelting(Process):
         default_value=NominalReal(0, ""),
     )
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
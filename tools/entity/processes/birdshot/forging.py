@@ -43,4 +43,4 @@ class Forging(Process):
         ),
     )
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
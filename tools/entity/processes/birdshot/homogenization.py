@@ -66,4 +66,4 @@ class Homogenization(Process):
         ),
     )
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
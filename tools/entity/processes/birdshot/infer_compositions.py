@@ -26,4 +26,4 @@ class InferCompositions(Process):
 
     _ATTRS: ClassVar[AttrsDict] = {"conditions": {}, "parameters": {}}
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
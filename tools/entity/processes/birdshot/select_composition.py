@@ -24,4 +24,4 @@ class SelectComposition(Process):
 
     _ATTRS: ClassVar[AttrsDict] = {"conditions": {}, "parameters": {}}
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
@@ -18,4 +18,4 @@ class SettingTravelerSample(Process):
 
     _ATTRS: ClassVar[AttrsDict] = {'conditions': {}, 'parameters': {}}
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
@@ -25,4 +25,4 @@ class BuyStartingMaterials(Process):
         default_value=NominalCategorical('')
     )
 
-    finalize_template(_ATTRS, TEMPLATE)
+    TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
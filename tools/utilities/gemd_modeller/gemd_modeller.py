@@ -1,8 +1,16 @@
 import json
 import networkx as nx
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 import shutil
 import os
+import time
+import hashlib
+import bisect
+import re
+import subprocess
+import difflib
+import numpy as np
 from gemd.util.impl import recursive_foreach
 from gemd.json import GEMDJson
 
@@ -16,6 +24,719 @@ import matplotlib.pyplot as plt
 import argparse
 import pathlib
 
+try:  # faster JSON parser, used when installed
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # columnar tables, see GemdTables
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:  # graphviz bindings, see map_to_graphviz; render_graph writes the .dot itself when missing
+    import pygraphviz
+except ImportError:
+    pygraphviz = None
+
+try:  # parquet files, see GemdTables.write
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class GraphCache:
+    """
+    Class that caches what GemdModeller.build_graph derives from a folder of GEMD thin JSONs: the built graphs
+    with their name mappings, keyed by the build options and a fingerprint of every (path, size, mtime), and,
+    in a separate file only read when a graph has to be rebuilt, the parsed record of every JSON. Only new or
+    modified JSONs are parsed again, and a graph is rebuilt only when the fingerprint changed.
+
+    The cache is written as plain JSON (graphs as node and edge tables), so loading it never runs code, and
+    kept out of the dump folder, in .gemd_cache/<folder name> next to it by default (e.g., ./.gemd_cache/dumps
+    for ./dumps), which .gitignore excludes.
+    """
+
+    CACHE_DIRNAME = ".gemd_cache"
+    GRAPHS_FILENAME = "graphs.json"
+    RECORDS_FILENAME = "records.json"
+    VERSION = 4
+    # keys of a thin JSON read by GemdModeller.handle_gemd_obj and GemdTables, the rest is not cached
+    RECORD_KEYS = (
+        "type",
+        "uids",
+        "name",
+        "spec",
+        "template",
+        "process",
+        "material",
+        "parameters",
+        "properties",
+        "conditions",
+        "file_links",
+        "tags",
+        "absolute_quantity",
+        "mass_fraction",
+        "number_fraction",
+        "volume_fraction",
+    )
+
+    def __init__(self, dirpath, cache_dir=None):
+        """
+        loads the cached graphs of a folder, or starts an empty cache if there is none or it is outdated
+        :param dirpath: folder of GEMD thin JSONs
+        :param cache_dir: folder holding the cache, see default_cache_dir
+        """
+        self.dirpath = dirpath
+        self.cache_dir = cache_dir or self.default_cache_dir(dirpath)
+        self.graphs = self._load(self.GRAPHS_FILENAME) or {}
+        self.files = None
+        self.stats = {}
+        self.fingerprint = None
+        self.nb_parsed = 0
+
+    @classmethod
+    def default_cache_dir(cls, dirpath):
+        """returns .gemd_cache/<folder name> next to a folder of thin JSONs"""
+        dirpath = os.path.abspath(dirpath)
+        return os.path.join(os.path.dirname(dirpath), cls.CACHE_DIRNAME, os.path.basename(dirpath))
+
+    def _load(self, filename):
+        path = os.path.join(self.cache_dir, filename)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as fp:
+                cached = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        if isinstance(cached, dict) and cached.get("version") == self.VERSION:
+            return cached["content"]
+        return None
+
+    def _save(self, filename, content):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, filename)
+        # write then rename so that an interrupted save never leaves a truncated cache behind
+        with open(path + ".tmp", "w") as fp:
+            json.dump({"version": self.VERSION, "content": content}, fp)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def _dump_data(cls, data):
+        """
+        returns node or edge data that survives JSON. Its keys are not always strings (e.g., the tags and file
+        links added by add_to_graph are dicts keyed by position), so every dict is stored as [key, value] pairs
+        """
+        if isinstance(data, dict):
+            return {"__items__": [[key, cls._dump_data(value)] for key, value in data.items()]}
+        return data
+
+    @classmethod
+    def _load_data(cls, data):
+        if isinstance(data, dict) and "__items__" in data:
+            return {key: cls._load_data(value) for key, value in data["__items__"]}
+        return data
+
+    @classmethod
+    def slim(cls, obj_data):
+        return {key: obj_data[key] for key in cls.RECORD_KEYS if key in obj_data}
+
+    def scan(self, paths):
+        """
+        records the size and mtime of the JSONs of the folder and computes its fingerprint
+        :param paths: paths of the JSON files in the folder
+        """
+        self.stats = {}
+        # paths come from os.walk(dirpath), so stripping the prefix is enough and much cheaper than relpath
+        prefix = os.path.join(str(self.dirpath), "")
+        for path in paths:
+            st = os.stat(path)
+            rel = path[len(prefix) :] if path.startswith(prefix) else os.path.relpath(path, self.dirpath)
+            self.stats[rel] = (st.st_size, st.st_mtime_ns)
+        sha = hashlib.sha256()
+        for rel in sorted(self.stats):
+            sha.update("{}\0{}\0{}\n".format(rel, *self.stats[rel]).encode("utf-8"))
+        self.fingerprint = sha.hexdigest()
+
+    def records(self, parse):
+        """
+        returns the records of the scanned JSONs in order, parsing only those that are new or were modified
+        since they were cached, and forgets the JSONs that were removed.
+        :param parse: function taking a list of paths and returning an iterable of their parsed JSONs
+        """
+        self.files = self._load(self.RECORDS_FILENAME) or {}
+        # JSON stores the (size, mtime) tuples as lists
+        stale = [
+            rel for rel, stat in self.stats.items() if tuple(self.files.get(rel, (None,))[0] or ()) != stat
+        ]
+        parsed = parse([os.path.join(self.dirpath, rel) for rel in stale])
+        for rel, obj_data in zip(stale, parsed):
+            self.files[rel] = (self.stats[rel], self.slim(obj_data))
+        for rel in set(self.files) - set(self.stats):
+            del self.files[rel]
+        self.nb_parsed = len(stale)
+        return [self.files[rel][1] for rel in self.stats]
+
+    def get_graph(self, options):
+        """
+        returns the cached (graph, name_mapping, nb_disregarded, node_info) built with the given options,
+        or None if there is none or the folder changed since. scan() must be called first.
+        :param options: build options that JSON can dump, e.g., obj_state and assets_to_add
+        """
+        cached = self.graphs.get(json.dumps(options))
+        if cached is None or cached["fingerprint"] != self.fingerprint:
+            return None
+        G = nx.DiGraph()
+        G.add_nodes_from((node, self._load_data(data)) for node, data in cached["nodes"])
+        G.add_edges_from((u, v, self._load_data(data)) for u, v, data in cached["edges"])
+        return (
+            G,
+            dict(cached["name_mapping"]),
+            cached["nb_disregarded"],
+            cached["node_info"],
+        )
+
+    def put_graph(self, options, G, name_mapping, nb_disregarded, node_info):
+        """
+        caches a graph built from the current content of the folder, as node and edge tables
+        :param options: build options that JSON can dump, e.g., obj_state and assets_to_add
+        """
+        self.graphs[json.dumps(options)] = {
+            "fingerprint": self.fingerprint,
+            "nodes": [[node, self._dump_data(data)] for node, data in G.nodes(data=True)],
+            "edges": [[u, v, self._dump_data(data)] for u, v, data in G.edges(data=True)],
+            "name_mapping": dict(name_mapping),
+            "nb_disregarded": nb_disregarded,
+            "node_info": node_info,
+        }
+
+    def save(self):
+        """writes the cache, dropping graphs built from an older content of the folder"""
+        self.graphs = {
+            options: cached
+            for options, cached in self.graphs.items()
+            if cached["fingerprint"] == self.fingerprint
+        }
+        self._save(self.GRAPHS_FILENAME, self.graphs)
+        if self.files is not None:
+            self._save(self.RECORDS_FILENAME, self.files)
+
+
+class GraphDiagnostics:
+    """
+    Class that summarizes a graph built by GemdModeller, in time linear in the size of the graph.
+
+    Cycles are detected with a single depth-first search rather than enumerated, and at most max_cycles of
+    them are sampled, one per strongly connected component. Components are counted without copying them.
+    Dangling links are nodes created by an edge to a link_by_uid whose JSON was not among the parsed
+    objects, e.g., a material from a notebook that was not dumped in the same folder.
+    """
+
+    def __init__(self, G, nb_objects, nb_disregarded, name_mapping=None, max_cycles=10):
+        """
+        :param G: graph returned by GemdModeller.build_graph
+        :param nb_objects: number of JSONs the graph was built from
+        :param nb_disregarded: number of JSONs that were not added to the graph (i.e., attributes)
+        :param name_mapping: uid -> label of every parsed object, dangling links are not computed without it
+        :param max_cycles: maximum number of cycles to sample
+        """
+        self.nb_objects = nb_objects
+        self.nb_disregarded = nb_disregarded
+        self.nb_nodes = G.number_of_nodes()
+        self.is_dag = nx.is_directed_acyclic_graph(G)
+
+        self.nb_strongly_connected = 0
+        self.cycles = []
+        for component in nx.strongly_connected_components(G):
+            self.nb_strongly_connected += 1
+            if self.is_dag or len(self.cycles) >= max_cycles:
+                continue
+            node = next(iter(component))
+            if len(component) > 1 or G.has_edge(node, node):
+                cycle = nx.find_cycle(G.subgraph(component), source=node)
+                self.cycles.append([u for u, v in cycle])
+        self.nb_weakly_connected = nx.number_weakly_connected_components(G)
+        self.nb_isolates = nx.number_of_isolates(G)
+
+        self.dangling_links = None
+        if name_mapping is not None:
+            # attribute, file link and tag nodes added with add_separate_node are rectangles
+            self.dangling_links = [
+                node
+                for node, data in G.nodes(data=True)
+                if node not in name_mapping and data.get("shape") != "rectangle"
+            ]
+
+    def report(self):
+        print("is a DAG: {}".format(self.is_dag))
+        if not self.is_dag:
+            print("sample of cycles in the graph: {}".format(self.cycles))
+        print(
+            "nb of disregarded elements (i.e., templates/specs): {}/{}".format(
+                self.nb_disregarded, self.nb_objects
+            )
+        )
+        print("number of connected components: {}".format(self.nb_strongly_connected))
+        print("number of weakly connected components: {}".format(self.nb_weakly_connected))
+        print("nb of isolates: {}".format(self.nb_isolates))
+        if self.dangling_links is not None:
+            print("nb of dangling links: {}".format(len(self.dangling_links)))
+
+
+class LineageIndex:
+    """
+    Class that precomputes the lineage of every node of a graph built by GemdModeller, so that ancestors,
+    descendants and connected components are looked up instead of traversed.
+
+    The graph is condensed into the DAG of its strongly connected components. Each weakly connected
+    component gets its own bit positions, in topological order, and every strongly connected component
+    stores the bitsets (python ints) of the components upstream and downstream of it. A query reads the
+    bitset of each node and decodes the union once, so its cost depends on the size of the answer rather
+    than the size of the graph.
+
+    The bitsets of a weakly connected component of k strongly connected components hold up to k**2 bits,
+    one per pair of components linked by a path, i.e., memory is quadratic in the size of the components.
+    Components of more than MAX_BITSET_SCCS strongly connected components therefore get no bitsets and are
+    traversed (BFS on the condensation) at each query instead, which bounds the bitsets to
+    MAX_BITSET_SCCS**2 / 8 bytes (12.5 MB) per component.
+    """
+
+    # size (in strongly connected components) above which a weakly connected component is traversed
+    MAX_BITSET_SCCS = 10000
+
+    def __init__(self, G, max_bitset_sccs=None):
+        """
+        :param G: graph returned by GemdModeller.build_graph
+        :param max_bitset_sccs: overrides MAX_BITSET_SCCS, e.g., 0 to traverse every component
+        """
+        self.nb_nodes = G.number_of_nodes()
+        if max_bitset_sccs is None:
+            max_bitset_sccs = self.MAX_BITSET_SCCS
+
+        C = nx.condensation(G)
+        self.condensation = C
+        self.scc_of = C.graph["mapping"]
+        self.scc_members = [C.nodes[c]["members"] for c in range(len(C))]
+
+        components = list(nx.weakly_connected_components(C))
+        self.wcc_of_scc = [None] * len(C)
+        for w, component in enumerate(components):
+            for c in component:
+                self.wcc_of_scc[c] = w
+        self.wcc_sccs = [[] for _ in components]
+        self._wcc_members = {}
+        self.position = [None] * len(C)
+        order = list(nx.topological_sort(C))
+        for c in order:
+            sccs = self.wcc_sccs[self.wcc_of_scc[c]]
+            self.position[c] = len(sccs)
+            sccs.append(c)
+
+        # None marks the components that are traversed at each query
+        indexed = [len(sccs) <= max_bitset_sccs for sccs in self.wcc_sccs]
+        self.downstream = [0 if indexed[w] else None for w in self.wcc_of_scc]
+        self.upstream = list(self.downstream)
+        for c in reversed(order):
+            if self.downstream[c] is not None:
+                for d in C.successors(c):
+                    self.downstream[c] |= (1 << self.position[d]) | self.downstream[d]
+        for c in order:
+            if self.upstream[c] is not None:
+                for a in C.predecessors(c):
+                    self.upstream[c] |= (1 << self.position[a]) | self.upstream[a]
+
+    def is_stale(self, G):
+        """
+        whether G gained or lost nodes since the index was built.
+        Only the number of nodes is compared, since counting edges is linear in networkx.
+        """
+        return G.number_of_nodes() != self.nb_nodes
+
+    def _scc(self, node):
+        try:
+            return self.scc_of[node]
+        except KeyError:
+            raise nx.NetworkXError("The node {} is not in the graph.".format(node))
+
+    def _collect(self, nodes, bitsets, neighbors):
+        bits_by_wcc = defaultdict(int)
+        traversed = []
+        result = set()
+        for node in nodes:
+            c = self._scc(node)
+            if bitsets[c] is None:
+                traversed.append(c)
+            else:
+                bits_by_wcc[self.wcc_of_scc[c]] |= bitsets[c]
+            # the other nodes of a cycle are both upstream and downstream of the node
+            if len(self.scc_members[c]) > 1:
+                result.update(self.scc_members[c] - {node})
+        for w, bits in bits_by_wcc.items():
+            sccs = self.wcc_sccs[w]
+            while bits:
+                low = bits & -bits
+                result.update(self.scc_members[sccs[low.bit_length() - 1]])
+                bits ^= low
+
+        # components above MAX_BITSET_SCCS, traversed from all the given nodes at once
+        stack = [d for c in traversed for d in neighbors(c)]
+        reached = set()
+        while stack:
+            d = stack.pop()
+            if d not in reached:
+                reached.add(d)
+                stack.extend(neighbors(d))
+        for d in reached:
+            result.update(self.scc_members[d])
+        return result
+
+    def ancestors(self, *nodes):
+        """returns the nodes upstream of any of the given nodes, like nx.ancestors for a single node"""
+        return self._collect(nodes, self.upstream, self.condensation.predecessors)
+
+    def descendants(self, *nodes):
+        """returns the nodes downstream of any of the given nodes, like nx.descendants for a single node"""
+        return self._collect(nodes, self.downstream, self.condensation.successors)
+
+    def lineage(self, *nodes):
+        """returns the given nodes with everything upstream and downstream of them"""
+        return self.ancestors(*nodes) | self.descendants(*nodes) | set(nodes)
+
+    def strongly_cc(self, node):
+        """returns the strongly connected component of a node"""
+        return set(self.scc_members[self._scc(node)])
+
+    def weakly_cc(self, node):
+        """returns the weakly connected component of a node"""
+        w = self.wcc_of_scc[self._scc(node)]
+        if w not in self._wcc_members:
+            self._wcc_members[w] = frozenset().union(
+                *(self.scc_members[c] for c in self.wcc_sccs[w])
+            )
+        return set(self._wcc_members[w])
+
+
+class IdentifierIndex:
+    """
+    Class that resolves identifiers typed by a user, e.g., a uid prefix or part of a node name, to the nodes
+    of a graph built by GemdModeller, without scanning every node at each query.
+
+    The uids of the nodes, their labels from name_mapping and their tags are lower-cased and kept in a sorted
+    list, searched with bisect for prefixes, and in an inverted index of their trigrams for substrings.
+    Tags are read from the parsed records (node_info), so they are indexed whether or not add_tags put them
+    on the graph.
+    """
+
+    def __init__(self, G, name_mapping=None, node_info=None):
+        """
+        :param G: graph returned by GemdModeller.build_graph
+        :param name_mapping: uid -> label of the parsed objects, as returned by GemdModeller.build_graph
+        :param node_info: uid -> record of the parsed objects, i.e., GemdModeller.node_info after build_graph
+        """
+        name_mapping = name_mapping or {}
+        node_info = node_info or {}
+        nodes_by_key = defaultdict(set)
+        for node, data in G.nodes(data=True):
+            keys = [str(node)]
+            if node in name_mapping:
+                keys.append(name_mapping[node])
+            if node in node_info:
+                keys.extend(str(tag) for tag in node_info[node]["tags"])
+            tags = data.get("tags")
+            if isinstance(tags, dict):
+                keys.extend(str(tag) for tag in tags.values())
+            elif isinstance(tags, (list, tuple, set)):
+                keys.extend(str(tag) for tag in tags)
+            elif tags:
+                keys.append(str(tags))
+            for key in keys:
+                nodes_by_key[key.lower()].add(node)
+
+        self.keys = sorted(nodes_by_key)
+        self.nodes = [nodes_by_key[key] for key in self.keys]
+        self.exact = dict(zip(self.keys, self.nodes))
+        self.trigrams = defaultdict(set)
+        for i, key in enumerate(self.keys):
+            for j in range(len(key) - 2):
+                self.trigrams[key[j : j + 3]].add(i)
+
+    def prefix(self, query):
+        """returns the nodes with a uid, label or tag starting with query (case insensitive)"""
+        query = query.lower()
+        result = set()
+        i = bisect.bisect_left(self.keys, query)
+        while i < len(self.keys) and self.keys[i].startswith(query):
+            result |= self.nodes[i]
+            i += 1
+        return result
+
+    def search(self, query):
+        """returns the nodes with a uid, label or tag containing query (case insensitive)"""
+        query = query.lower()
+        if len(query) < 3:  # too short to be indexed by trigrams
+            candidates = range(len(self.keys))
+        else:
+            postings = sorted(
+                (self.trigrams.get(query[j : j + 3], set()) for j in range(len(query) - 2)),
+                key=len,
+            )
+            candidates = postings[0].intersection(*postings[1:])
+        result = set()
+        for i in candidates:
+            if query in self.keys[i]:
+                result |= self.nodes[i]
+        return result
+
+    def resolve(self, identifier, strict=False):
+        """
+        returns the nodes an identifier refers to: the node with this exact uid, label or tag if there is one,
+        otherwise those starting with it, otherwise those containing it
+
+        :param strict: raise a ValueError listing the near misses (see near_misses) if nothing matches
+        """
+        key = identifier.lower()
+        if key in self.exact:
+            return set(self.exact[key])
+        matches = self.prefix(key) or self.search(key)
+        if strict and not matches:
+            near = self.near_misses(identifier)
+            raise ValueError(
+                "identifier {} matches no node{}".format(
+                    identifier, ", did you mean: {}".format("; ".join(near)) if near else ""
+                )
+            )
+        return matches
+
+    def near_misses(self, query, limit=5):
+        """returns up to limit uids, labels or tags sharing the most trigrams with query, the closest first"""
+        query = query.lower()
+        trigrams = {query[j : j + 3] for j in range(len(query) - 2)}
+        shared = defaultdict(int)
+        for trigram in trigrams:
+            for i in self.trigrams.get(trigram, ()):
+                shared[i] += 1
+        if not shared:  # too short or too far off to share a trigram
+            return difflib.get_close_matches(query, self.keys, n=limit)
+        best = sorted(shared, key=lambda i: (-shared[i], len(self.keys[i])))[:limit]
+        return [self.keys[i] for i in best]
+
+
+class AggregatedGraph:
+    """
+    Class that holds a graph collapsed by GemdModeller.aggregate_graph, along with the nodes of each cluster.
+    """
+
+    def __init__(self, G, graph, name_mapping, members):
+        """
+        :param G: the full graph
+        :param graph: the graph of clusters
+        :param name_mapping: cluster -> label
+        :param members: cluster -> set of nodes of G
+        """
+        self.full_graph = G
+        self.graph = graph
+        self.name_mapping = name_mapping
+        self.members = members
+
+    def drill_down(self, *clusters, with_neighbors=False):
+        """
+        returns the subgraph of the full graph made of the nodes of the given clusters
+
+        :param with_neighbors: also include the nodes directly linked to them, e.g., attributes and the
+        ingredients or materials of the neighboring clusters
+        """
+        nodes = set().union(*(self.members[cluster] for cluster in clusters))
+        if with_neighbors:
+            for node in list(nodes):
+                nodes.update(self.full_graph.predecessors(node))
+                nodes.update(self.full_graph.successors(node))
+        return self.full_graph.subgraph(nodes)
+
+
+class GemdTables:
+    """
+    Class that flattens GEMD thin JSONs into three columnar tables, so that they can be queried with vectorized
+    scans (e.g., pandas or pyarrow) instead of walking JSON files or NetworkX dicts:
+    - nodes: one row per spec or run (uid, type, name, spec, template, tags)
+    - edges: one row per link_by_uid between them (uid -> target, relation is the linking field)
+    - attributes: one row per attribute value, owned by a node (owner_uid). Conditions of a
+    property_and_conditions are rows of their own, ingredient quantities are attributes of type "quantity",
+    and compositions (e.g., a heating step {"Temp": 650.0, "Type": "Hold"}) give one row per component,
+    whose value is held in nominal or category.
+    """
+
+    EDGE_FIELDS = ("spec", "template", "process", "material")
+    ATTRIBUTE_FIELDS = ("parameters", "conditions", "properties")
+    QUANTITY_FIELDS = ("absolute_quantity", "mass_fraction", "number_fraction", "volume_fraction")
+    ATTRIBUTE_COLUMNS = (
+        "owner_uid",
+        "owner_type",
+        "attribute_type",
+        "name",
+        "value_type",
+        "component",
+        "nominal",
+        "lower_bound",
+        "upper_bound",
+        "std",
+        "units",
+        "category",
+        "origin",
+        "template_uid",
+    )
+
+    def __init__(self):
+        self.nodes = {
+            column: [] for column in ("uid", "type", "name", "spec_uid", "template_uid", "tags")
+        }
+        self.edges = {column: [] for column in ("uid", "target", "relation")}
+        self.attributes = {column: [] for column in self.ATTRIBUTE_COLUMNS}
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        :param records: iterable of parsed thin JSONs, e.g., GemdModeller.iter_json_records
+        """
+        tables = cls()
+        for obj_data in records:
+            tables.add_record(obj_data)
+        return tables
+
+    @staticmethod
+    def _link(obj_data, field):
+        link = obj_data.get(field)
+        return link.get("id") if isinstance(link, dict) else None
+
+    def add_record(self, obj_data):
+        obj_type = obj_data["type"]
+        if not obj_type.endswith(("_spec", "_run")):  # attribute templates and other objects
+            return
+        uid = obj_data["uids"]["auto"]
+        self.nodes["uid"].append(uid)
+        self.nodes["type"].append(obj_type)
+        self.nodes["name"].append(obj_data.get("name"))
+        self.nodes["spec_uid"].append(self._link(obj_data, "spec"))
+        self.nodes["template_uid"].append(self._link(obj_data, "template"))
+        self.nodes["tags"].append(list(obj_data.get("tags") or []))
+
+        for field in self.EDGE_FIELDS:
+            target = self._link(obj_data, field)
+            if target is not None:
+                self.edges["uid"].append(uid)
+                self.edges["target"].append(target)
+                self.edges["relation"].append(field)
+
+        for field in self.ATTRIBUTE_FIELDS:
+            for attr in obj_data.get(field) or []:
+                if attr["type"] == "property_and_conditions":
+                    self.add_attribute(uid, obj_type, attr["property"])
+                    for condition in attr.get("conditions") or []:
+                        self.add_attribute(uid, obj_type, condition)
+                else:
+                    self.add_attribute(uid, obj_type, attr)
+        for field in self.QUANTITY_FIELDS:
+            if obj_data.get(field):
+                self.add_attribute(
+                    uid, obj_type, {"type": "quantity", "name": field, "value": obj_data[field]}
+                )
+
+    def add_attribute(self, owner_uid, owner_type, attr):
+        value = attr.get("value") or {}
+        value_type = value.get("type")
+        row = {
+            "owner_uid": owner_uid,
+            "owner_type": owner_type,
+            "attribute_type": attr["type"],
+            "name": attr.get("name"),
+            "value_type": value_type,
+            "units": value.get("units"),
+            "origin": attr.get("origin"),
+            "template_uid": self._link(attr, "template"),
+        }
+        if value_type in ("nominal_real", "nominal_integer"):
+            row["nominal"] = value["nominal"]
+        elif value_type in ("uniform_real", "uniform_integer"):
+            row["lower_bound"] = value["lower_bound"]
+            row["upper_bound"] = value["upper_bound"]
+        elif value_type == "normal_real":
+            row["nominal"] = value["mean"]
+            row["std"] = value["std"]
+        elif value_type == "nominal_categorical":
+            row["category"] = value["category"]
+        elif value_type == "empirical_formula":
+            row["category"] = value["formula"]
+        elif value_type in ("nominal_composition", "discrete_categorical"):
+            components = value.get("quantities") or value.get("probabilities") or {}
+            for component, amount in components.items():
+                self._append_attribute(dict(row, component=component, **self._split(amount)))
+            return
+        self._append_attribute(row)
+
+    @staticmethod
+    def _split(amount):
+        # composition amounts are numbers, but heating steps also hold their type (e.g., "Hold") as a string
+        if isinstance(amount, (int, float)) and not isinstance(amount, bool):
+            return {"nominal": float(amount)}
+        return {"category": str(amount)}
+
+    def _append_attribute(self, row):
+        for column in self.ATTRIBUTE_COLUMNS:
+            self.attributes[column].append(row.get(column))
+
+    def tables(self):
+        return {"nodes": self.nodes, "edges": self.edges, "attributes": self.attributes}
+
+    def to_pandas(self):
+        """
+        returns the nodes, edges and attributes tables as pandas DataFrames, e.g., the heating steps holding
+        above 600 with
+        steps = tables["attributes"].pivot_table(index=["owner_uid", "name"], columns="component",
+        values=["nominal", "category"], aggfunc="first")
+        steps[(steps["category", "Type"] == "Hold") & (steps["nominal", "Temp"] > 600)]
+        """
+        if pd is None:
+            raise ImportError("pandas is required to build DataFrames")
+        frames = {name: pd.DataFrame(columns) for name, columns in self.tables().items()}
+        for column in ("nominal", "lower_bound", "upper_bound", "std"):
+            frames["attributes"][column] = frames["attributes"][column].astype(float)
+        return frames
+
+    def write(self, dest, fmt="auto"):
+        """
+        writes the tables to dest as nodes, edges and attributes files
+
+        :param fmt: "parquet" (requires pyarrow), "csv" (requires pandas), or "auto" to write parquet files
+        when pyarrow is installed and csv files otherwise
+
+        :return: the paths of the written files
+        """
+        if fmt == "auto":
+            fmt = "parquet" if pyarrow is not None else "csv"
+        os.makedirs(dest, exist_ok=True)
+        paths = []
+        if fmt == "parquet":
+            if pyarrow is None:
+                raise ImportError("pyarrow is required to write parquet files")
+            for name, columns in self.tables().items():
+                path = os.path.join(dest, "{}.parquet".format(name))
+                pyarrow.parquet.write_table(pyarrow.table(columns), path)
+                paths.append(path)
+        elif fmt == "csv":
+            for name, frame in self.to_pandas().items():
+                path = os.path.join(dest, "{}.csv".format(name))
+                frame.to_csv(path, index=False)
+                paths.append(path)
+        else:
+            raise ValueError("cannot write tables as {}".format(fmt))
+        print(
+            "-- Wrote {} nodes, {} edges and {} attribute values to {}".format(
+                len(self.nodes["uid"]), len(self.edges["uid"]), len(self.attributes["owner_uid"]), dest
+            )
+        )
+        return paths
+
 
 # TODO: add flag to open visualization tool?
 # TODO: add file links and tags
@@ -39,6 +760,11 @@ class GemdModeller:
         self.dirpath = pathlib.Path(dirpath)
         self.svg_path = None
         self.dot_path = None
+        self.last_diagnostics = None
+        self.node_info = {}
+        self.aggregated = None
+        self._lineage_index = None
+        self._lineage_graph = None
 
     # instance method
     def build_graph(
@@ -48,6 +774,13 @@ class GemdModeller:
         add_separate_node=False,
         update=True,
         assets_to_add={},
+        max_workers=8,
+        chunk_size=256,
+        report_every=5.0,
+        use_cache=True,
+        render="auto",
+        time_budget=300,
+        aggregate=None,
     ):
         """
         creates a NetworkX graph representation of the GEMD relationships by reading every object
@@ -59,6 +792,15 @@ class GemdModeller:
         :param dirpath: source of graph
         :param obj_state: to plot a graph of specs, runs or templates
         :param full_json_path: path to json file containing all objects in full format (!= )
+        :param max_workers: number of threads reading and parsing the JSONs
+        :param chunk_size: number of JSONs handed to a thread at once
+        :param report_every: seconds between two progress reports
+        :param use_cache: reuse the records and graph cached for the folder by a previous build (see GraphCache),
+        parsing only new or modified JSONs
+        :param render: layout engine used to draw the svg, see render_graph
+        :param time_budget: seconds allowed to draw the svg before falling back to a summary, see render_graph
+        :param aggregate: draw the graph collapsed by "block", "notebook" or "template" rather than every node,
+        see aggregate_graph. The clusters are kept in self.aggregated for drilling down.
 
         :return: graph
         """
@@ -88,12 +830,140 @@ class GemdModeller:
         if len(gemd_objects) == 0:
             return
 
-        # adding objects to graph one by one
-        for i, obj in enumerate(gemd_objects):
-            if "raw_jsons" in obj:
-                continue
-            fp = open(obj, "r")
-            obj_data = json.load(fp)
+        # adding objects to graph one by one, as they are parsed
+        paths = [obj for obj in gemd_objects if "raw_jsons" not in obj]
+        parse = lambda paths: self.iter_json_records(
+            paths, max_workers=max_workers, chunk_size=chunk_size
+        )
+        cached = None
+        if use_cache:
+            cache = GraphCache(self.dirpath)
+            cache.scan(paths)
+            options = (
+                obj_state,
+                add_separate_node,
+                tuple(sorted((k, bool(v)) for k, v in assets_to_add.items())),
+            )
+            cached = cache.get_graph(options)
+            records = None if cached else cache.records(parse)
+            print(
+                "-- Graph cache: {} of {} JSONs parsed, graph {}".format(
+                    cache.nb_parsed, len(paths), "reused" if cached else "rebuilt"
+                )
+            )
+        else:
+            records = parse(paths)
+
+        if cached:
+            G, name_mapping, nb_disregarded, self.node_info = cached
+        else:
+            self.node_info = {}
+            nb_disregarded = self.add_records(
+                G,
+                name_mapping,
+                records,
+                len(paths),
+                obj_state,
+                assets_to_add,
+                add_separate_node,
+                report_every,
+                node_info=self.node_info,
+            )
+            if use_cache:
+                cache.put_graph(options, G, name_mapping, nb_disregarded, self.node_info)
+                cache.save()
+
+        # converting to grapviz and plotting
+        if aggregate:
+            self.aggregated = self.aggregate_graph(G, by=aggregate, name_mapping=name_mapping)
+            to_render, render_mapping, render_name = (
+                self.aggregated.graph,
+                self.aggregated.name_mapping,
+                "{}_graph_by_{}".format(obj_state, aggregate),
+            )
+        else:
+            to_render, render_mapping, render_name = (
+                G,
+                name_mapping,
+                "{}_graph".format(obj_state),
+            )
+        dot_path, svg_path, relabeled_G = self.render_graph(
+            self.dirpath,
+            to_render,
+            render_name,
+            render_mapping,
+            mode=render,
+            time_budget=time_budget,
+        )
+        if update:
+            self.update_paths(svg_path, dot_path)
+
+        # info
+        self.diagnostics(G, gemd_objects, nb_disregarded, name_mapping)
+
+        return G, relabeled_G, name_mapping
+
+    def json_paths(self):
+        """returns the paths of the thin JSONs of the folder, raw_jsons excluded"""
+        return [
+            os.path.join(dp, f)
+            for dp, dn, filenames in os.walk(self.dirpath)
+            for f in filenames
+            if f.endswith(".json") and "raw_jsons" not in os.path.join(dp, f)
+        ]
+
+    def export_tables(self, dest=None, fmt="auto", max_workers=8, chunk_size=256, use_cache=True):
+        """
+        writes the nodes, edges and attributes of the thin JSONs of the folder as columnar tables, see GemdTables
+
+        :param dest: folder to write the tables to, defaults to a tables folder next to the JSONs
+        :param fmt: "parquet", "csv" or "auto", see GemdTables.write
+        :param use_cache: reuse the records cached for the folder by a previous build (see GraphCache),
+        parsing only new or modified JSONs
+
+        :return: the GemdTables
+        """
+        paths = self.json_paths()
+        parse = lambda paths: self.iter_json_records(
+            paths, max_workers=max_workers, chunk_size=chunk_size
+        )
+        if use_cache:
+            cache = GraphCache(self.dirpath)
+            cache.scan(paths)
+            records = cache.records(parse)
+            cache.save()
+        else:
+            records = parse(paths)
+        tables = GemdTables.from_records(records)
+        tables.write(dest or os.path.join(self.dirpath, "tables"), fmt=fmt)
+        return tables
+
+    def add_records(
+        self,
+        G,
+        name_mapping,
+        records,
+        nb_records,
+        obj_state,
+        assets_to_add,
+        add_separate_node,
+        report_every=5.0,
+        node_info=None,
+    ):
+        """
+        adds parsed thin JSONs to the graph and the name mapping
+
+        :param records: iterable of parsed thin JSONs
+        :param nb_records: number of records, for progress reports
+        :param report_every: seconds between two progress reports
+        :param node_info: dict to fill with the type, tags, spec and template of every object, by uid
+
+        :return: the number of disregarded records (i.e., attributes)
+        """
+        nb_disregarded = 0
+        i = 0
+        start = last_report = time.perf_counter()
+        for i, obj_data in enumerate(records, 1):
             obj_type = obj_data["type"]
             if (
                 obj_type.startswith("parameter")
@@ -105,6 +975,14 @@ class GemdModeller:
             obj_uid = obj_data["uids"]["auto"]
             obj_name = obj_data["name"]
             name_mapping[obj_uid] = "{},  {}".format(obj_name, obj_uid[:3])
+            if node_info is not None:
+                node_info[obj_uid] = {
+                    "type": obj_type,
+                    "name": obj_name,
+                    "tags": obj_data.get("tags", []),
+                    "spec": (obj_data.get("spec") or {}).get("id"),
+                    "template": (obj_data.get("template") or {}).get("id"),
+                }
             self.handle_gemd_obj(
                 G,
                 obj_uid,
@@ -114,23 +992,53 @@ class GemdModeller:
                 assets_to_add,
                 add_separate_node,
             )
-            if i % 1000 == 0:
-                print("{} gemd objects processed...".format(i))
+            if time.perf_counter() - last_report >= report_every:
+                last_report = time.perf_counter()
+                self.report_progress(i, nb_records, last_report - start)
+        self.report_progress(i, nb_records, time.perf_counter() - start)
+        return nb_disregarded
 
-        # converting to grapviz
-        relabeled_G = self.map_to_graphviz(G, name_mapping)
+    @staticmethod
+    def read_json(path):
+        """reads and parses one JSON file, with orjson when it is installed, and closes it"""
+        if orjson is not None:
+            with open(path, "rb") as fp:
+                return orjson.loads(fp.read())
+        with open(path, "r") as fp:
+            return json.load(fp)
 
-        # # plotting
-        dot_path, svg_path = self.save_graph(
-            self.dirpath, relabeled_G, name="{}_graph".format(obj_state)
-        )
-        if update:
-            self.update_paths(svg_path, dot_path)
+    @classmethod
+    def read_json_chunk(cls, paths):
+        return [cls.read_json(path) for path in paths]
 
-        # info
-        self.diagnostics(G, gemd_objects, nb_disregarded)
+    @classmethod
+    def iter_json_records(cls, paths, max_workers=8, chunk_size=256):
+        """
+        yields the parsed content of each JSON file, in order, while the next files are read and parsed
+        in a thread pool. Each thread holds a single file open at a time, and at most 2 * max_workers
+        chunks are in flight at once, which bounds the number of parsed records held in memory.
 
-        return G, relabeled_G, name_mapping
+        :param paths: paths of the JSON files
+        :param max_workers: number of threads reading and parsing the files
+        :param chunk_size: number of files handed to a thread at once
+        """
+        chunks = (paths[i : i + chunk_size] for i in range(0, len(paths), chunk_size))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = deque()
+            for chunk in chunks:
+                in_flight.append(executor.submit(cls.read_json_chunk, chunk))
+                if len(in_flight) >= 2 * max_workers:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                yield from in_flight.popleft().result()
+
+    @staticmethod
+    def report_progress(nb_done, nb_total, elapsed):
+        print(
+            "{}/{} gemd objects processed in {:.1f}s ({:.0f} objects/sec)...".format(
+                nb_done, nb_total, elapsed, nb_done / elapsed if elapsed > 0 else float("inf")
+            )
+        )
 
     def handle_gemd_obj(
         self,
@@ -232,7 +1140,7 @@ class GemdModeller:
         for att in assets:
             if type(att) in [str]:  # is a gemd tag
                 if "::" in att:
-                    self.add_to_graph(G, uid, att, "tags", add_separate_node=False)
+                    self.add_to_graph(G, uid, "tags", False, att)
             elif att["type"]:  # is a gemd object
                 # reading gemd file links
                 if att["type"] == "file_link":
@@ -264,6 +1172,9 @@ class GemdModeller:
             G.add_edge(uid, node_name)
         else:  # add as an attribute of the node
             if att_name in G.nodes[uid].keys():  # already exists, append to it
+                if isinstance(G.nodes[uid][att_name], dict):  # tags and file links, by position
+                    G.nodes[uid][att_name][len(G.nodes[uid][att_name])] = node_name
+                    return
                 if not type(G.nodes[uid][att_name]) == list:
                       G.nodes[uid][att_name] = [G.nodes[uid][att_name]]
                 if type(G.nodes[uid][att_name]) == list:
@@ -276,34 +1187,169 @@ class GemdModeller:
             else:
                 G.nodes[uid][att_name] = node_name
 
+    # tag holding the notebook keeper's initials, see utils.provenance.Provenance
+    NOTEBOOK_TAG_PREFIX = "provenance::"
+    # notebook page in the name of an untagged node, e.g., GBM1009 in GBM1009_Flux_Medium Heating Process
+    SAMPLE_NAME_RE = re.compile(r"GBM\d+")
+    # colors given by handle_gemd_obj
+    COLOR_TYPES = {
+        "red": "process",
+        "blue": "ingredient",
+        "green": "material",
+        "purple": "measurement",
+    }
+
+    def cluster_key(self, G, node, by):
+        """
+        returns the cluster of a node for aggregate_graph, or None for attribute nodes:
+        - block: the process the node belongs to, like a Block (ingredients, process, material, measurements)
+        - notebook: the notebook the node comes from, i.e., its provenance tag followed by the page number
+        read from its name or the name of its process (e.g., GBM1005 for a provenance::GBM node named
+        GBM1005A Heated Material). Runs usually carry no tags, so the tags of their spec are used instead,
+        and nodes without a provenance tag fall back to a sample name (see SAMPLE_NAME_RE)
+        - template: the template of the node, or of its spec for runs
+        """
+        data = G.nodes[node]
+        if data.get("shape") == "rectangle":
+            return None
+        info = self.node_info.get(node)
+        if info is None:
+            return "unresolved"
+        if by == "block":
+            kind = self.COLOR_TYPES.get(data.get("color"))
+            if kind == "measurement":
+                node = next(iter(G.successors(node)), node)
+                kind = self.COLOR_TYPES.get(G.nodes[node].get("color"))
+            if kind == "material":
+                node = next(
+                    (p for p in G.predecessors(node) if G.nodes[p].get("color") == "red"), node
+                )
+            elif kind == "ingredient":
+                node = next(
+                    (s for s in G.successors(node) if G.nodes[s].get("color") == "red"), node
+                )
+            return node
+        if by == "notebook":
+            tags = info["tags"]
+            if not tags and info["spec"] in self.node_info:
+                tags = self.node_info[info["spec"]]["tags"]
+            # ingredients are often named after their material, the process names the sample
+            process = self.node_info.get(self.cluster_key(G, node, "block"), info)
+            for tag in tags:
+                if tag.startswith(self.NOTEBOOK_TAG_PREFIX):
+                    initials = tag[len(self.NOTEBOOK_TAG_PREFIX) :]
+                    for name in (info["name"], process["name"]):
+                        match = re.match(re.escape(initials) + r"\d+", name)
+                        if match:
+                            return match.group(0)
+                    return initials
+            for name in (info["name"], process["name"]):
+                match = self.SAMPLE_NAME_RE.search(name)
+                if match:
+                    return match.group(0)
+            return "untagged"
+        if by == "template":
+            template = info["template"]
+            if template is None and info["spec"] in self.node_info:
+                template = self.node_info[info["spec"]]["template"]
+            return template or "no template"
+        raise ValueError("cannot aggregate by {}".format(by))
+
+    def aggregate_graph(self, G, by="block", name_mapping=None):
+        """
+        collapses a graph built by build_graph into one node per cluster (see cluster_key), so that overviews of
+        large dumps stay small enough to lay out. Each cluster node counts its nodes by kind, and attribute nodes
+        (see add_separate_node) are counted in the clusters of the objects pointing to them rather than drawn.
+        Edges between clusters hold the number of edges between their nodes.
+
+        :param by: "block", "notebook" or "template"
+        :param name_mapping: uid -> label, to label block and template clusters
+
+        :return: an AggregatedGraph, whose drill_down method returns the nodes of a cluster
+        """
+        name_mapping = name_mapping or {}
+        members = defaultdict(set)
+        cluster_of = {}
+        counts = defaultdict(lambda: defaultdict(int))
+        for node, data in G.nodes(data=True):
+            key = self.cluster_key(G, node, by)
+            if key is None:
+                continue
+            cluster_of[node] = key
+            members[key].add(node)
+            counts[key][self.COLOR_TYPES.get(data.get("color"), "other")] += 1
+
+        aggregated = nx.DiGraph()
+        for key, nodes in members.items():
+            aggregated.add_node(key, nb_nodes=len(nodes), **counts[key])
+        for u, v in G.edges():
+            if u in cluster_of and v not in cluster_of:  # attribute node
+                counts[cluster_of[u]]["attribute"] += 1
+                aggregated.nodes[cluster_of[u]]["attribute"] = counts[cluster_of[u]]["attribute"]
+            elif u in cluster_of and cluster_of[u] != cluster_of[v]:
+                cu, cv = cluster_of[u], cluster_of[v]
+                if aggregated.has_edge(cu, cv):
+                    aggregated[cu][cv]["nb_edges"] += 1
+                else:
+                    aggregated.add_edge(cu, cv, nb_edges=1)
+
+        cluster_mapping = {}
+        for key, nodes in members.items():
+            if by == "block" and key in name_mapping:
+                label = name_mapping[key]
+            elif by == "template":
+                label = "{} and {} similar".format(
+                    name_mapping.get(min(nodes, key=str), key), len(nodes) - 1
+                )
+            else:
+                label = str(key)
+            cluster_mapping[key] = "{} ({} nodes)".format(label, len(nodes))
+        return AggregatedGraph(G, aggregated, cluster_mapping, dict(members))
+
+    def lineage_index(self, G):
+        """
+        returns the LineageIndex of G, built on first use and rebuilt for another graph or when G gained or
+        lost nodes. Build a new LineageIndex after adding edges between existing nodes.
+        """
+        if (
+            self._lineage_index is None
+            or self._lineage_graph is not G
+            or self._lineage_index.is_stale(G)
+        ):
+            self._lineage_index = LineageIndex(G)
+            self._lineage_graph = G
+        return self._lineage_index
+
     def get_strongly_cc(self, G, node):
         """get strong connected component of node"""
-
-        for cc in nx.strongly_connected_components(G):
-            lst = []
-            if node in cc:
-                return cc
-        else:
+        if node not in G:
             return []
+        return self.lineage_index(G).strongly_cc(node)
 
     def get_weakly_cc(self, G, node):
         """get weakly connected component of node"""
-        for cc in nx.weakly_connected_components(G):
-            if node in cc:
-                return cc
-        else:
+        if node not in G:
             return []
+        return self.lineage_index(G).weakly_cc(node)
 
-    def diagnostics(self, G, gemd_objects, nb_disregarded):
-        print("cycles in the graph: {}".format(list(nx.simple_cycles(G))))
-        print(
-            "nb of disregarded elements (i.e., templates/specs): {}/{}".format(
-                nb_disregarded, len(gemd_objects)
-            )
+    def diagnostics(self, G, gemd_objects, nb_disregarded, name_mapping=None, max_cycles=10):
+        """
+        computes and prints diagnostics of the graph, in time linear in its size: no cycle enumeration
+        and no copied subgraphs. See GraphDiagnostics.
+
+        :param gemd_objects: paths of the JSONs the graph was built from
+        :param nb_disregarded: number of JSONs that were not added to the graph (i.e., attributes)
+        :param name_mapping: uid -> label of every parsed object, to detect dangling links
+        :param max_cycles: maximum number of cycles to sample, at most one per strongly connected component
+
+        :return: a GraphDiagnostics
+        """
+        diagnostics = GraphDiagnostics(
+            G, len(gemd_objects), nb_disregarded, name_mapping, max_cycles
         )
-        subgraphs = [G.subgraph(c).copy() for c in nx.strongly_connected_components(G)]
-        print("number of connected components: {}".format(len(subgraphs)))
-        print("nb of isolates: {}".format(nx.number_of_isolates(G)))
+        diagnostics.report()
+        self.last_diagnostics = diagnostics
+        return diagnostics
 
     @classmethod
     def launch_notebook(cls, dot_path):
@@ -322,15 +1368,217 @@ class GemdModeller:
         self.dot_path = dot_path
 
     @classmethod
-    def map_to_graphviz(cls, G, name_mapping=None):
-        if name_mapping:
-            G = nx.relabel_nodes(G, name_mapping)
+    def map_to_graphviz(cls, G, name_mapping=None, prog="dot", layout=True):
+        """
+        converts a graph to a pygraphviz AGraph, with node labels from name_mapping
+
+        :param prog: graphviz layout engine, e.g., dot or sfdp, or "layered" to position nodes with
+        layered_positions and let neato keep those positions
+        :param layout: whether to run the layout engine, rather than leaving it to the renderer
+        """
+        G = cls._graphviz_ready(G, name_mapping, prog)
         G = nx.nx_agraph.to_agraph(G)
         G.node_attr.update(nodesep=0.4)
         G.node_attr.update(ranksep=1)
-        G.layout(prog="dot")
+        if layout and prog == "layered":
+            G.layout(prog="neato", args="-n2")
+        elif layout:
+            G.layout(prog=prog)
+        return G
+
+    @classmethod
+    def _graphviz_ready(cls, G, name_mapping, prog):
+        """returns G relabeled with name_mapping, with the positions of layered_positions for the layered prog"""
+        if prog == "layered":
+            G = G.copy()
+            nx.set_node_attributes(
+                G,
+                {
+                    node: "{:.1f},{:.1f}".format(x, y)
+                    for node, (x, y) in cls.layered_positions(G).items()
+                },
+                "pos",
+            )
+        if name_mapping:
+            G = nx.relabel_nodes(G, name_mapping)
         return G
 
+    @classmethod
+    def to_dot(cls, G, name_mapping=None, prog="dot"):
+        """
+        returns the DOT source of a graph without layout, as map_to_graphviz would write it, but without
+        requiring pygraphviz
+
+        :param prog: "layered" to add the positions of layered_positions, as map_to_graphviz does
+        """
+        G = cls._graphviz_ready(G, name_mapping, prog)
+
+        def quote(value):
+            return '"{}"'.format(str(value).replace('"', '\\"'))
+
+        def attributes(data):
+            if not data:
+                return ""
+            return " [{}]".format(
+                ", ".join("{}={}".format(key, quote(value)) for key, value in data.items())
+            )
+
+        strict = nx.number_of_selfloops(G) == 0 and not G.is_multigraph()
+        kind, edge_op = ("digraph", "->") if G.is_directed() else ("graph", "--")
+        lines = ["{}{} {{".format("strict " if strict else "", kind)]
+        for key, value in G.graph.items():
+            if key not in ("graph", "node", "edge"):
+                lines.append("\t{}={};".format(key, quote(value)))
+        lines.append("\tnode [nodesep=0.4, ranksep=1];")
+        for node, data in G.nodes(data=True):
+            lines.append("\t{}{};".format(quote(node), attributes(data)))
+        for u, v, data in G.edges(data=True):
+            lines.append("\t{} {} {}{};".format(quote(u), edge_op, quote(v), attributes(data)))
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    # dot is used up to DOT_MAX_NODES nodes, sfdp up to SFDP_MAX_NODES, and layered_positions beyond
+    DOT_MAX_NODES = 2000
+    SFDP_MAX_NODES = 20000
+
+    @classmethod
+    def choose_layout(cls, G):
+        """returns the layout engine render_graph uses in auto mode for a graph of this size"""
+        if G.number_of_nodes() <= cls.DOT_MAX_NODES:
+            return "dot"
+        if G.number_of_nodes() <= cls.SFDP_MAX_NODES:
+            return "sfdp"
+        return "layered"
+
+    @classmethod
+    def layered_positions(cls, G, spacing=72.0):
+        """
+        returns node -> (x, y) points of a layered layout, computed without graphviz: the rank of a node is its
+        topological depth (on the condensation of G, so the nodes of a cycle share a rank), and the nodes of a
+        rank are spread evenly along it
+
+        :param spacing: distance between two ranks and between two nodes of a rank, in points
+        """
+        nodes = list(G)
+        if not nodes:
+            return {}
+        C = nx.condensation(G)
+        scc_depth = np.empty(len(C), dtype=int)
+        for depth, generation in enumerate(nx.topological_generations(C)):
+            scc_depth[list(generation)] = depth
+        mapping = C.graph["mapping"]
+        depth = scc_depth[[mapping[node] for node in nodes]]
+
+        order = np.argsort(depth, kind="stable")
+        sorted_depth = depth[order]
+        rank_size = np.bincount(depth)
+        # position of each node within its rank
+        within = np.arange(len(nodes)) - np.searchsorted(sorted_depth, sorted_depth)
+        x = (within - (rank_size[sorted_depth] - 1) / 2.0) * spacing
+        y = -sorted_depth * spacing
+        return {nodes[i]: (x[k], y[k]) for k, i in enumerate(order)}
+
+    @classmethod
+    def summarize_graph(cls, G, name_mapping=None):
+        """
+        returns a graph with one node per weakly connected component of G, labelled after its first sink
+        (e.g., the final material of a sample history) and with the number of nodes it holds,
+        and the matching name mapping
+        """
+        name_mapping = name_mapping or {}
+        summary = nx.DiGraph()
+        summary_mapping = {}
+        for i, component in enumerate(nx.weakly_connected_components(G)):
+            sinks = [node for node in component if G.out_degree(node) == 0] or list(component)
+            sink = min(sinks, key=str)
+            summary.add_node(i, nb_nodes=len(component))
+            summary_mapping[i] = "{} (+{} nodes)".format(
+                name_mapping.get(sink, sink), len(component) - 1
+            )
+        return summary, summary_mapping
+
+    @classmethod
+    def render_graph(
+        cls, dest, G, name, name_mapping=None, mode="auto", time_budget=300, summarize=True
+    ):
+        """
+        writes the .dot of a graph and draws it as .svg with a layout engine suited to its size.
+        Graphviz runs in a subprocess, so that a layout exceeding the time budget is stopped and the
+        summary of the graph (see summarize_graph) is drawn instead, to {name}_summary.svg.
+        Once drawn, the .dot is replaced by the laid-out graph, with the node and edge positions the
+        notebook viewer (see launch_notebook) reads. If graphviz is missing, fails, or exceeds the time
+        budget, the .dot keeps the graph without layout.
+
+        :param mode: "auto" (see choose_layout), a graphviz engine (e.g., dot or sfdp), "layered"
+        (see layered_positions), or "none" to only write the .dot, without layout
+        :param time_budget: seconds allowed to graphviz, or None to wait for it
+        :param summarize: whether to draw the summary when the time budget is exceeded
+
+        :return: paths of the .dot and .svg (None if not drawn), and the AGraph (None if pygraphviz is missing)
+        """
+        prog = cls.choose_layout(G) if mode == "auto" else mode
+        if pygraphviz is not None:
+            A = cls.map_to_graphviz(G, name_mapping, prog=prog, layout=False)
+            source = str(A)
+        else:
+            A, source = None, cls.to_dot(G, name_mapping, prog=prog)
+        dot_path = os.path.join(dest, "{}.dot".format(name))
+        with open(dot_path, "w") as f:
+            f.write(source)
+        if mode == "none":
+            print("Saved graph to {}".format(dot_path))
+            return dot_path, None, A
+
+        svg_path = os.path.join(dest, "{}.svg".format(name))
+        laid_out_path = dot_path + ".tmp"
+        cmd = ["neato", "-n2"] if prog == "layered" else [prog]
+        start = time.perf_counter()
+        try:
+            # a single graphviz run writes both the laid-out .dot and the .svg
+            subprocess.run(
+                cmd + ["-Tdot", "-o", laid_out_path, "-Tsvg", "-o", svg_path, dot_path],
+                check=True,
+                timeout=time_budget,
+            )
+        except subprocess.TimeoutExpired:
+            cls._remove_if_exists(laid_out_path, svg_path)
+            print(
+                "-- Drawing {} nodes with {} exceeded {}s".format(
+                    G.number_of_nodes(), prog, time_budget
+                )
+            )
+            if not summarize:
+                return dot_path, None, A
+            summary, summary_mapping = cls.summarize_graph(G, name_mapping)
+            _, svg_path, _ = cls.render_graph(
+                dest,
+                summary,
+                "{}_summary".format(name),
+                summary_mapping,
+                time_budget=time_budget,
+                summarize=False,
+            )
+            return dot_path, svg_path, A
+        except (FileNotFoundError, subprocess.CalledProcessError) as e:
+            cls._remove_if_exists(laid_out_path, svg_path)
+            print("-- Drawing with {} failed ({}), saved graph to {}".format(prog, e, dot_path))
+            return dot_path, None, A
+
+        os.replace(laid_out_path, dot_path)
+        print(
+            "Saved graph to {} and {} ({} layout, {:.1f}s)".format(
+                dot_path, svg_path, prog, time.perf_counter() - start
+            )
+        )
+        return dot_path, svg_path, None if A is None else type(A)(filename=dot_path)
+
+    @staticmethod
+    def _remove_if_exists(*paths):
+        """removes the files left by an interrupted or failed graphviz run"""
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
     @classmethod
     def slice_subgraph(cls, G, uuid, funcs, add_current=True):
         els = set()
@@ -341,14 +1589,37 @@ class GemdModeller:
         return G.subgraph(els)
 
     @classmethod
-    def return_uuid(cls, identifier):
-        return identifier
+    def return_uuid(cls, identifier, index=None):
+        """
+        returns the node an identifier refers to: the identifier itself, or, given an IdentifierIndex,
+        the only node whose uid, label or tag matches it (see IdentifierIndex.resolve)
+        """
+        if index is None:
+            return identifier
+        matches = index.resolve(identifier, strict=True)
+        if len(matches) != 1:
+            raise ValueError(
+                "identifier {} matches {} nodes, expected 1".format(identifier, len(matches))
+            )
+        return next(iter(matches))
 
     @classmethod
     def extract_subgraph(cls, G, identifier, func):
         uuid = cls.return_uuid(identifier)
         return cls.slice_subgraph(G, uuid, func)
 
+    @classmethod
+    def extract_lineage(cls, G, identifiers, index=None):
+        """
+        returns the subgraph of the given identifiers with everything upstream and downstream of them,
+        i.e., the same as extract_subgraph with [nx.ancestors, nx.descendants], for many identifiers at once
+
+        :param identifiers: list of identifiers
+        :param index: LineageIndex of G, to reuse between calls
+        """
+        index = index or LineageIndex(G)
+        return G.subgraph(index.lineage(*[cls.return_uuid(i) for i in identifiers]))
+
     @classmethod
     def save_graph(cls, dest, G, name):
         # svg file
@@ -380,7 +1651,7 @@ class GemdModeller:
         parser.add_argument(
             "--identifier",
             type=str,
-            help="identifier, typically uuid, but can also be passed as partial node name",
+            help="identifier, typically uuid, but can also be passed as uid prefix, partial node name or tag",
         )
         parser.add_argument(
             "--add_attributes",
@@ -406,6 +1677,33 @@ class GemdModeller:
             action="store_true",
             help="option to add attributes, file links and tags as separate nodes on graph",
         )
+        parser.add_argument(
+            "--render",
+            default="auto",
+            help="layout engine drawing the svg: auto (by graph size), dot, sfdp, layered, or none to only write the .dot",
+        )
+        parser.add_argument(
+            "--time_budget",
+            type=float,
+            default=300,
+            help="seconds allowed to draw the svg before drawing a summary of the graph instead",
+        )
+        parser.add_argument(
+            "--aggregate",
+            choices=["block", "notebook", "template"],
+            help="option to draw the graph collapsed by block, notebook or template",
+        )
+        parser.add_argument(
+            "--export_tables",
+            nargs="?",
+            const="",
+            help="option to write the nodes, edges and attributes as parquet (or csv) tables, to the given folder or to dirpath/tables",
+        )
+        parser.add_argument(
+            "--no_cache",
+            action="store_true",
+            help="option to ignore the graph cached in the folder and parse every JSON again",
+        )
         parser.add_argument(
             "--launch_notebook",
             action="store_true",
@@ -431,16 +1729,32 @@ class GemdModeller:
             "add_tags": args.add_tags,
         }
         G, relabeled_G, name_mapping = viewer.build_graph(
-            add_separate_node=args.add_separate_node, assets_to_add=assets_to_add,
+            add_separate_node=args.add_separate_node,
+            assets_to_add=assets_to_add,
+            use_cache=not args.no_cache,
+            render=args.render,
+            time_budget=args.time_budget,
+            aggregate=args.aggregate,
         )
 
+        if args.export_tables is not None:
+            viewer.export_tables(dest=args.export_tables or None, use_cache=not args.no_cache)
+
         if args.identifier:
-            identifier_G = cls.extract_subgraph(
-                G, args.identifier, func=[nx.ancestors, nx.descendants]
+            matches = IdentifierIndex(G, name_mapping, viewer.node_info).resolve(
+                args.identifier, strict=True
+            )
+            print(
+                "-- Identifier {} matches {} nodes".format(args.identifier, len(matches))
             )
-            identifier_G = cls.map_to_graphviz(identifier_G, name_mapping)
-            identifier_G_dot_path, _ = cls.save_graph(
-                viewer.dirpath, identifier_G, "{}".format(args.identifier)
+            identifier_G = cls.extract_lineage(G, matches)
+            identifier_G_dot_path, _, _ = cls.render_graph(
+                viewer.dirpath,
+                identifier_G,
+                "{}".format(args.identifier),
+                name_mapping,
+                mode=args.render,
+                time_budget=args.time_budget,
             )
 
         if args.launch_notebook:
@@ -1,6 +1,13 @@
 from .folder_or_file import FolderOrFile
+from ..entity.base.base_node import BaseNode
+from ..entity.base import Process, Material, Ingredient, Measurement
+from gemd import ProcessRun, MaterialRun, IngredientRun, MeasurementRun
 from gemd.json import GEMDJson
+from gemd.entity.link_by_uid import LinkByUID
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import os
+import time
 
 
 # TODO: extend Logging
@@ -17,12 +24,95 @@ class Workflow:
         self.encoder = GEMDJson()
         self.output_folder = kwargs['output_folder']
 
-    def thin_dumps(self):
+    def thin_dumps(self, destination=None, batch_size=500, store=None):
         """
         dumps the entire model into a JSON per object, each representing the 'thin' version' of the object
         in which pointers (i.e., true value) are replaced by links (e.g., uuid).
+        All blocks are walked once and every spec/run is written once, even when it is shared by several blocks.
+        In incremental mode (i.e., when a store is passed), objects are written to the shared content store
+        only if their thin JSON is not already there, and destination only receives a manifest referencing them.
+        Objects that have no uid yet are then given one derived from the destination folder name, their block key
+        and their position in the block, so that re-running the notebook reuses the objects it stored last time.
+        :param destination: folder to write the JSONs (or the manifest) to, defaults to the workflow's output folder
+        :param batch_size: number of serialized objects to hold in memory before writing them to disk
+        :param store: optional ContentStore shared between dumps, e.g., by all the notebooks of a chain
+        :return: a dict with the number of objects written, skipped duplicates, objects reused from the store,
+        elapsed seconds and objects/sec
         """
-        pass
+        destination = destination or self.output_folder
+        os.makedirs(destination, exist_ok=True)
+
+        start = time.perf_counter()
+        emitted_uids = set()
+        pending = []
+        manifest = []
+        nb_written = 0
+        nb_duplicates = 0
+        nb_reused = 0
+
+        if store is not None:
+            # all uids are given before anything is serialized, since thin_dumps gives random ones to linked objects
+            namespace = os.path.basename(os.path.normpath(destination))
+            for key, block in self.blocks.items():
+                for i, node in enumerate(block.base_nodes()):
+                    store.stamp(node.spec, self.encoder.scope, namespace, key, i, "spec")
+                    store.stamp(node.run, self.encoder.scope, namespace, key, i, "run")
+
+        for block in self.blocks.values():
+            for node in block.base_nodes():
+                for obj in (node.spec, node.run):
+                    # an object without a uid cannot have been serialized yet
+                    uid = obj.uids.get(self.encoder.scope)
+                    if uid is not None and uid in emitted_uids:
+                        nb_duplicates += 1
+                        continue
+                    if store is not None:
+                        entry, written = store.put_object(self.encoder, obj)
+                        emitted_uids.add(entry["uid"])
+                        manifest.append(entry)
+                        nb_written += written
+                        nb_reused += not written
+                        continue
+                    serialized = self.encoder.thin_dumps(obj, indent=3)
+                    emitted_uids.add(obj.uids[self.encoder.scope])
+                    fn = BaseNode.dump_filename(obj)
+                    pending.append((fn, serialized))
+                    if len(pending) >= batch_size:
+                        nb_written += self._write_batch(destination, pending)
+        nb_written += self._write_batch(destination, pending)
+        if store is not None:
+            store.write_manifest(destination, manifest)
+
+        elapsed = time.perf_counter() - start
+        stats = {
+            "nb_written": nb_written,
+            "nb_duplicates": nb_duplicates,
+            "nb_reused": nb_reused,
+            "seconds": elapsed,
+            "objects_per_sec": nb_written / elapsed if elapsed > 0 else float("inf"),
+        }
+        print(
+            "-- Dumped {} objects to {} in {:.2f}s ({:.0f} objects/sec), skipped {} duplicates, reused {} from store".format(
+                nb_written, store.root if store is not None else destination, elapsed,
+                stats["objects_per_sec"], nb_duplicates, nb_reused
+            )
+        )
+        return stats
+
+    @staticmethod
+    def _write_batch(destination, pending):
+        """
+        writes a batch of serialized objects to disk and empties it
+        :param destination: folder to write the JSONs to
+        :param pending: list of (filename, serialized JSON) tuples
+        :return: the number of files written
+        """
+        for fn, serialized in pending:
+            with open(os.path.join(destination, fn), "w") as fp:
+                fp.write(serialized)
+        nb_written = len(pending)
+        pending.clear()
+        return nb_written
 
     def dumps(self):
         """
@@ -30,12 +120,136 @@ class Workflow:
         """
         pass
 
-    def thin_loads(self):
+    def thin_loads(self, source=None, max_workers=None, store=None, chunk_size=256):
         """
         loads the entire model from a list of JSONs, each representing the 'thin' version' of the model object
         in which pointers (i.e., true value) are replaced by links (e.g., uuid).
+        Files are read and parsed concurrently, indexed by uid, and every link_by_uid is then replaced by the
+        object it points to in a single pass over the model. Links to objects that were not dumped (e.g., templates)
+        are left as they are. Blocks are rebuilt around each process run, keyed by its name (see _block_of_process).
+        :param source: folder containing the JSONs (or a manifest), defaults to the workflow's output folder
+        :param max_workers: number of threads reading and parsing files, see concurrent.futures.ThreadPoolExecutor
+        :param store: ContentStore to resolve the manifest of source against, for dumps made in incremental mode
+        :param chunk_size: number of files handed to a thread at once
+        :return: the workflow itself, with blocks and uid_index populated
         """
-        pass
+        source = source or self.output_folder
+
+        if store is not None:
+            paths = [
+                store.path(entry["sha256"]) for entry in store.read_manifest(source)
+            ]
+        else:
+            paths = [
+                os.path.join(dp, f)
+                for dp, dn, filenames in os.walk(source)
+                for f in filenames
+                if f.endswith(".json")
+            ]
+
+        chunks = [paths[i : i + chunk_size] for i in range(0, len(paths), chunk_size)]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            objs = [obj for chunk in executor.map(self._load_thin_jsons, chunks) for obj in chunk]
+
+        self.uid_index = {}
+        for obj in objs:
+            for scope, uid in obj.uids.items():
+                self.uid_index[(scope.lower(), uid)] = obj
+        # thin JSONs only hold links in a few known places, so they are resolved directly instead of
+        # crawling every object with gemd.util.substitute_objects
+        for obj in objs:
+            self._resolve_links(obj)
+
+        self.blocks = defaultdict()
+        self._process_blocks = {}
+        for obj in objs:
+            if isinstance(obj, ProcessRun):
+                self._block_of_process(obj).process = Process.wrap(obj.spec, obj)
+        for obj in objs:
+            if isinstance(obj, MaterialRun):
+                block = self._block_of_process(obj.process, default_name=obj.name)
+                block.material = Material.wrap(obj.spec, obj)
+            elif isinstance(obj, IngredientRun):
+                block = self._block_of_process(obj.process, default_name=obj.name)
+                block.ingredients.append(Ingredient.wrap(obj.spec, obj))
+        materials = {
+            id(block.material.run): block
+            for block in self.blocks.values()
+            if block.material is not None
+        }
+        for obj in objs:
+            if isinstance(obj, MeasurementRun):
+                block = materials.get(id(obj.material))
+                if block is None:
+                    block = self._block_of_process(None, default_name=obj.name)
+                block.measurements.append(Measurement.wrap(obj.spec, obj))
+
+        return self
+
+    def _load_thin_jsons(self, paths):
+        """
+        reads and parses thin JSONs into gemd objects whose links are still link_by_uid
+        :param paths: paths to the JSON files
+        """
+        objs = []
+        for path in paths:
+            with open(path) as fp:
+                objs.append(self.encoder.raw_loads(fp.read()))
+        return objs
+
+    _LINK_FIELDS = ("spec", "process", "material", "template")
+
+    def _resolve(self, link):
+        """
+        returns the loaded object a link_by_uid points to, or the link itself if that object was not loaded
+        :param link: a link_by_uid, or any other value which is returned as is
+        """
+        if isinstance(link, LinkByUID):
+            return self.uid_index.get((link.scope.lower(), link.id), link)
+        return link
+
+    def _resolve_links(self, obj):
+        """
+        replaces the link_by_uid of a thin object (spec, process, material, templates) by the loaded objects
+        :param obj: a gemd object returned by raw_loads
+        """
+        for field in self._LINK_FIELDS:
+            link = getattr(obj, field, None)
+            target = self._resolve(link)
+            if target is not link:
+                setattr(obj, field, target)
+        for attr_type in ("conditions", "parameters", "properties"):
+            for attr in getattr(obj, attr_type, []):
+                # material specs hold PropertyAndConditions rather than bare properties
+                for leaf in [getattr(attr, "property", attr)] + list(getattr(attr, "conditions", [])):
+                    target = self._resolve(leaf.template)
+                    if target is not leaf.template:
+                        leaf.template = target
+
+    def _block_of_process(self, process, default_name=None):
+        """
+        returns the block built around a process run, creating it if needed.
+        Blocks are keyed by process name, suffixed with the process uid when several processes share a name.
+        :param process: the process run, or a link_by_uid/None if it was not dumped
+        :param default_name: name of the block to create when process is not a loaded process run
+        """
+        from ..block.Block import Block  # Block imports this module
+
+        if isinstance(process, ProcessRun):
+            if id(process) in self._process_blocks:
+                return self._process_blocks[id(process)]
+            name = process.name
+            if name in self.blocks:
+                name = "{} {}".format(name, process.uids.get(self.encoder.scope))
+        else:
+            name = default_name
+            if name in self.blocks:
+                return self.blocks[name]
+        block = Block(name=name, workflow=self, ingredients=[], measurements=[])
+        self.blocks[name] = block
+        if isinstance(process, ProcessRun):
+            self._process_blocks[id(process)] = block
+        return block
 
     def loads(self):
         """
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+
+class ContentStore:
+    """
+    Class that represents a folder of thin JSONs shared by several dumps, e.g., by every notebook of a chain.
+    Each object is stored once under the sha256 hash of its thin JSON, and each dump only records a manifest
+    mapping its usual file names to those hashes. Dumping objects that are already in the store costs a hash
+    and a set lookup instead of a file write.
+    """
+
+    MANIFEST_FILENAME = "manifest.jsonl"
+    # not ".json", so that tools globbing a dump tree for thin JSONs (e.g., GemdModeller) skip a store placed in it
+    OBJECT_SUFFIX = ".gemd"
+    # uuid5 namespace of the uids given by stamp(), must never change
+    NAMESPACE = uuid.UUID("6f3c2a91-8d4e-4b7a-b1c5-0e9d7a2f4c38")
+
+    def __init__(self, root):
+        """
+        :param root: path to the folder holding the content-addressed JSONs, created if missing
+        """
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+        self._digests = None
+
+    @staticmethod
+    def digest(serialized):
+        """
+        returns the hash identifying a serialized object in the store
+        :param serialized: the thin JSON of the object
+        """
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def path(self, digest):
+        """
+        returns the path of the stored JSON with the given hash
+        :param digest: hash returned by digest()
+        """
+        return os.path.join(self.root, digest + self.OBJECT_SUFFIX)
+
+    def __contains__(self, digest):
+        if self._digests is None:
+            self._digests = {
+                fn[: -len(self.OBJECT_SUFFIX)]
+                for fn in os.listdir(self.root)
+                if fn.endswith(self.OBJECT_SUFFIX)
+            }
+        return digest in self._digests
+
+    def put(self, serialized):
+        """
+        adds a serialized object to the store unless an identical one is already there
+        :param serialized: the thin JSON of the object
+        :return: the hash of the object and whether it had to be written
+        """
+        digest = self.digest(serialized)
+        if digest in self:
+            return digest, False
+        # write then rename so that an interrupted dump never leaves a truncated object behind
+        tmp_path = self.path(digest) + ".tmp"
+        with open(tmp_path, "w") as fp:
+            fp.write(serialized)
+        os.replace(tmp_path, self.path(digest))
+        self._digests.add(digest)
+        return digest, True
+
+    @classmethod
+    def stamp(cls, obj, scope, *key):
+        """
+        gives an object without a uid in scope one derived from its position in the model rather than a random one,
+        so that re-running the notebook that built it gives it the same uid, and its thin JSON the same hash.
+        Objects that already have a uid (e.g., loaded back with thin_loads, or shared with a previous block) keep it.
+        :param obj: spec or run to stamp
+        :param scope: scope of the uid, i.e., the encoder's
+        :param key: parts locating the object, e.g., the dump folder name, block key and position in the block
+        """
+        if scope not in obj.uids:
+            obj.add_uid(scope, str(uuid.uuid5(cls.NAMESPACE, "/".join(str(k) for k in key))))
+
+    def put_object(self, encoder, obj):
+        """
+        serializes an object and adds it to the store
+        :param encoder: GEMDJson encoder used for the thin JSON
+        :param obj: spec or run to store
+        :return: the manifest entry of the object and whether it had to be written
+        """
+        # imported here, the entity package imports the workflow package
+        from ..entity.base.base_node import BaseNode
+
+        serialized = encoder.thin_dumps(obj, indent=3)
+        digest, written = self.put(serialized)
+        entry = {
+            "file": BaseNode.dump_filename(obj),
+            "uid": obj.uids[encoder.scope],
+            "sha256": digest,
+        }
+        return entry, written
+
+    def write_manifest(self, destination, entries):
+        """
+        writes the manifest of a dump, one JSON record per line
+        :param destination: folder of the dump, e.g., ./dumps/GBM1005
+        :param entries: list of dicts with the 'file', 'uid' and 'sha256' of each dumped object
+        """
+        os.makedirs(destination, exist_ok=True)
+        with open(os.path.join(destination, self.MANIFEST_FILENAME), "w") as fp:
+            for entry in entries:
+                fp.write(json.dumps(entry, sort_keys=True) + "\n")
+
+    @classmethod
+    def read_manifest(cls, destination):
+        """
+        reads the manifest of a dump
+        :param destination: folder of the dump
+        :return: list of dicts with the 'file', 'uid' and 'sha256' of each dumped object
+        """
+        with open(os.path.join(destination, cls.MANIFEST_FILENAME)) as fp:
+            return [json.loads(line) for line in fp if line.strip()]
+
+    def checkout(self, destination, target=None):
+        """
+        recreates the usual one-file-per-object layout of a dump from its manifest, e.g., for GemdModeller.
+        Files are hard linked from the store when possible and copied otherwise. A file that is already in target
+        is kept only if its content matches the manifest, and is replaced otherwise.
+        :param destination: folder of the dump containing the manifest
+        :param target: folder to write the JSONs to, defaults to destination
+        :return: the number of files created or replaced
+        """
+        target = target or destination
+        os.makedirs(target, exist_ok=True)
+        nb_created = 0
+        for entry in self.read_manifest(destination):
+            src = self.path(entry["sha256"])
+            dst = os.path.join(target, entry["file"])
+            if os.path.exists(dst) and (
+                os.path.samefile(src, dst) or self._file_digest(dst) == entry["sha256"]
+            ):
+                continue
+            # link or copy next to dst then rename, so that dst is never missing nor half written
+            tmp_path = dst + ".tmp"
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            try:
+                os.link(src, tmp_path)
+            except OSError:
+                shutil.copyfile(src, tmp_path)
+            os.replace(tmp_path, dst)
+            nb_created += 1
+        return nb_created
+
+    @staticmethod
+    def _file_digest(path):
+        with open(path, "rb") as fp:
+            return hashlib.sha256(fp.read()).hexdigest()
@@ -0,0 +1,230 @@
+import hashlib
+import importlib
+import json
+import os
+import re
+
+from gemd.entity.template.attribute_template import AttributeTemplate
+from gemd.json import GEMDJson
+
+from ..entity.base import Process, Material, Ingredient, Measurement, NodeRegistry, TEMPLATES
+
+
+class NotebookCache:
+    """
+    Class that snapshots the blocks built by a notebook so that downstream notebooks can reuse them
+    without executing it (and its own ancestors) again through import_ipynb.
+    A snapshot is keyed on the sha256 hash of the code of the notebook and of every notebook it imports,
+    so that it is rebuilt as soon as one of them changes. GEMD objects cannot be pickled, so snapshots are
+    full GEMD JSONs (templates included) along with the layout of the blocks dict and the class of each node.
+    Snapshots do not end in .json, so that tools globbing the dump tree for thin JSONs (e.g., GemdModeller) skip them.
+    """
+
+    SNAPSHOT_SUFFIX = ".snapshot"
+    # suffix of the snapshots written before, removed along with outdated snapshots
+    _LEGACY_SUFFIX = ".snapshot.json"
+    _IMPORT_RE = re.compile(
+        r"^\s*(?:from\s+(\w+)\s+import|import\s+(\w+))|import_workflow\(\s*['\"](\w+)['\"]", re.MULTILINE
+    )
+    _NODE_TYPES = {
+        "ingredients": Ingredient,
+        "process": Process,
+        "material": Material,
+        "measurements": Measurement,
+    }
+
+    def __init__(self, root="./dumps/.notebook_cache", notebook_dir="."):
+        """
+        :param root: path to the folder holding the snapshots, created if missing
+        :param notebook_dir: folder containing the notebooks, e.g., GBM1003.ipynb
+        """
+        self.root = root
+        self.notebook_dir = notebook_dir
+        self.encoder = GEMDJson()
+        os.makedirs(self.root, exist_ok=True)
+
+    def notebook_path(self, name):
+        """
+        returns the path of a notebook from its module name
+        :param name: name of the notebook, e.g., GBM1003
+        """
+        return os.path.join(self.notebook_dir, "{}.ipynb".format(name))
+
+    def key(self, name, _seen=None):
+        """
+        returns the hash of the code cells of a notebook and, recursively, of the notebooks it imports
+        :param name: name of the notebook, e.g., GBM1003
+        """
+        _seen = set() if _seen is None else _seen
+        _seen.add(name)
+        with open(self.notebook_path(name)) as fp:
+            cells = json.load(fp)["cells"]
+        code = "\n".join(
+            "".join(cell["source"]) for cell in cells if cell["cell_type"] == "code"
+        )
+        sha = hashlib.sha256(code.encode("utf-8"))
+        for match in self._IMPORT_RE.finditer(code):
+            ancestor = next(group for group in match.groups() if group)
+            if ancestor not in _seen and os.path.exists(self.notebook_path(ancestor)):
+                sha.update(self.key(ancestor, _seen).encode("utf-8"))
+        return sha.hexdigest()
+
+    def snapshot_path(self, name, key):
+        """
+        returns the path of the snapshot of a notebook for a given key
+        :param name: name of the notebook
+        :param key: hash returned by key()
+        """
+        return os.path.join(self.root, "{}.{}{}".format(name, key, self.SNAPSHOT_SUFFIX))
+
+    def import_workflow(self, name, variable=None, refresh=False, workflow=None):
+        """
+        returns the blocks dict built by a notebook, from its snapshot if the notebook and its ancestors are
+        unchanged, or by importing it with import_ipynb (and snapshotting the result) otherwise.
+        Used in place of `import import_ipynb; from GBM1003 import GBM1003`.
+        Changes to the builders (e.g., utils/) are not part of the key, use refresh=True after editing them.
+        :param name: name of the notebook, e.g., GBM1003
+        :param variable: name of the blocks dict in the notebook, defaults to name
+        :param refresh: ignore any existing snapshot and execute the notebook
+        :param workflow: Workflow to attach the blocks loaded from a snapshot to, see load()
+        """
+        key = self.key(name)
+        path = self.snapshot_path(name, key)
+        if not refresh and os.path.exists(path):
+            return self.load(path, workflow=workflow)
+
+        import import_ipynb  # noqa: F401, registers the notebook importer
+
+        blocks = getattr(importlib.import_module(name), variable or name)
+        self.save(path, blocks)
+        return blocks
+
+    def save(self, path, blocks):
+        """
+        writes the snapshot of a blocks dict, and removes the outdated snapshots of the same notebook
+        :param path: path returned by snapshot_path()
+        :param blocks: dict of Blocks, e.g., GBM1003
+        """
+        objs = []
+        positions = {}
+        layout = {}
+        for block_key, block in blocks.items():
+            entry = {"name": block.name, "classes": {}}
+            for slot in self._NODE_TYPES:
+                nodes = getattr(block, slot)
+                indices = []
+                classes = []
+                for node in nodes if isinstance(nodes, list) else [nodes]:
+                    if node is None:
+                        indices.append(None)
+                        classes.append(None)
+                        continue
+                    classes.append([type(node).__module__, type(node).__qualname__])
+                    # a node shared by several blocks is stored once
+                    if id(node.spec) not in positions:
+                        positions[id(node.spec)] = len(objs)
+                        objs.extend([node.spec, node.run])
+                    indices.append(positions[id(node.spec)])
+                entry[slot] = indices if isinstance(nodes, list) else indices[0]
+                entry["classes"][slot] = classes
+            layout[block_key] = entry
+
+        snapshot = {"blocks": layout, "gemd": json.loads(self.encoder.dumps(objs))}
+        # write then rename so that an interrupted save never leaves a truncated snapshot behind
+        with open(path + ".tmp", "w") as fp:
+            json.dump(snapshot, fp)
+        os.replace(path + ".tmp", path)
+
+        prefix = os.path.basename(path).split(".")[0] + "."
+        for fn in os.listdir(self.root):
+            if fn.startswith(prefix) and fn.endswith((self.SNAPSHOT_SUFFIX, self._LEGACY_SUFFIX)):
+                if os.path.join(self.root, fn) != path:
+                    os.remove(os.path.join(self.root, fn))
+
+    def load(self, path, workflow=None):
+        """
+        rebuilds a blocks dict from its snapshot. Nodes are wrapped around the loaded specs and runs as instances
+        of the BaseNode subclass that built them (e.g., the GrindingProcess of utils.base_builders), or as plain
+        Process, Material, Ingredient and Measurement BaseNodes when that class can no longer be found.
+        The templates of the loaded specs and of their attributes are replaced by the canonical ones with the same uid
+        (i.e., the TEMPLATE of the node class), so that they are not copies of them.
+        The Workflow of the original blocks is not part of the snapshot, pass it to attach the blocks to it.
+        :param path: path returned by snapshot_path()
+        :param workflow: Workflow the rebuilt blocks belong to, None (as for the notebooks' blocks) by default
+        """
+        from ..block.Block import Block  # Block imports the workflow package
+
+        with open(path) as fp:
+            snapshot = json.load(fp)
+        objs = self.encoder.loads(json.dumps(snapshot["gemd"]))
+        self._relink_templates(objs)
+
+        blocks = {}
+        for block_key, entry in snapshot["blocks"].items():
+            nodes = {}
+            for slot, NodeType in self._NODE_TYPES.items():
+                indices = entry[slot] if isinstance(entry[slot], list) else [entry[slot]]
+                classes = entry["classes"][slot]
+                wrapped = [
+                    self._node_class(cls_path, NodeType).wrap(objs[i], objs[i + 1])
+                    for i, cls_path in zip(indices, classes)
+                    if i is not None
+                ]
+                nodes[slot] = wrapped if isinstance(entry[slot], list) else (wrapped or [None])[0]
+            blocks[block_key] = Block(name=entry["name"], workflow=workflow, **nodes)
+        return blocks
+
+    def _relink_templates(self, objs):
+        """
+        replaces the templates decoded along with specs and runs by the canonical templates of TEMPLATES with the
+        same uid, and interns those that have none yet
+        :param objs: list of the specs and runs of a snapshot
+        """
+        canonical = {template.uids[TEMPLATES.scope]: template for template in TEMPLATES}
+        relinked = {}
+
+        def relink(template):
+            if id(template) not in relinked:
+                uid = template.uids.get(TEMPLATES.scope)
+                relinked[id(template)] = canonical.get(uid) or TEMPLATES.intern(template)
+            return relinked[id(template)]
+
+        for obj in objs:
+            # runs only expose the template of their spec
+            if not hasattr(obj, "spec") and getattr(obj, "template", None) is not None:
+                obj.template = relink(obj.template)
+            for attr_type in ("conditions", "parameters", "properties"):
+                for attr in getattr(obj, attr_type, None) or []:
+                    # the properties of a material spec are PropertyAndConditions
+                    for attr in [attr.property, *attr.conditions] if hasattr(attr, "property") else [attr]:
+                        if isinstance(attr.template, AttributeTemplate):
+                            attr.template = relink(attr.template)
+
+    @staticmethod
+    def _node_class(cls_path, default):
+        """
+        returns the BaseNode subclass recorded in a snapshot, or default if it cannot be found anymore
+        :param cls_path: [module, qualname] of the class, e.g., ["utils.base_builders",
+            "_grinding_process.<locals>.GrindingProcess"] for a class built by a NodeRegistry factory
+        :param default: plain BaseNode class of the slot, e.g., Process
+        """
+        module_name, qualname = cls_path
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            return default
+
+        if ".<locals>." in qualname:
+            # classes defined in a NodeRegistry factory are registered under the factory name
+            factory = qualname.split(".<locals>.")[0].lstrip("_")
+            for registry in vars(module).values():
+                if isinstance(registry, NodeRegistry) and factory in registry:
+                    cls = registry[factory]
+                    if cls.__qualname__ == qualname and issubclass(cls, default):
+                        return cls
+            return default
+
+        cls = module
+        for attr in qualname.split("."):
+            cls = getattr(cls, attr, None)
+        return cls if isinstance(cls, type) and issubclass(cls, default) else default
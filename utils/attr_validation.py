@@ -0,0 +1,232 @@
+# Service validating categorical attribute values against the bounds config
+
+### Imports ###
+
+from contextlib import contextmanager
+from typing import Iterable
+import json
+import os
+
+from utils.templates.attribute_templates import config,file_path
+
+### Category Validator ###
+
+class CategoryValidator:
+    '''
+    Validates categorical values against the categories of the bounds config, e.g., 'Location' or 'Step Type'.
+
+    Categories are indexed in one set per attribute, so that checking a value does not scan the config lists.
+    Unknown values are handled according to the policy:
+
+    'prompt': ask whether to add the value, as attr_validate always did (notebooks only)
+    'add': add the value to its category without asking
+    'reject': raise a ValueError
+    'collect': keep the value in `collected` and carry on, e.g., to review them all at the end of a headless build
+
+    New categories are written to disk right away, unless inside `batch()`, which writes them once on exit.
+    The config file is always replaced atomically, so an interrupted write never leaves it truncated.
+    '''
+
+    POLICIES = ('prompt','add','reject','collect')
+
+    def __init__(self,config:dict,path:str,policy:str='prompt'):
+        '''
+        ### Parameters
+
+        Config: bounds config, as loaded from bounds_config.json, updated in place with the new categories
+        Path: path of the bounds config file
+        Policy: how to handle unknown values, one of POLICIES
+            ex: 'collect'
+        '''
+        self.config = config
+        self.path = path
+        self.policy = policy
+        self.collected = {}     # unknown values met under the 'collect' policy, by attribute
+        self._pending = False   # whether categories were added since the last write
+        self._batch_depth = 0
+        self._index = {
+            attr:set(bounds['categories'])
+            for attr,bounds in config['BOUNDS'].items()
+            if 'categories' in bounds
+        }
+
+    @property
+    def policy(self):
+        return self._policy
+
+    @policy.setter
+    def policy(self,policy:str):
+        if policy not in self.POLICIES:
+            raise ValueError(f'policy must be one of {self.POLICIES}, but found {policy!r}.')
+        self._policy = policy
+
+    def categories(self,attr:str):
+        '''
+        Returns the set of categories of an attribute.
+        '''
+        if attr not in self._index:
+            raise KeyError(f'{attr} is not a categorical attribute of the bounds config.')
+        return self._index[attr]
+
+    def is_known(self,attr:str,value):
+        '''
+        Returns whether a value exists in the categories of an attribute, without handling it if it does not.
+        '''
+        return value in self.categories(attr)
+
+    def validate(self,attr:str,value,policy:str=None):
+        '''
+        Validates that a categorical value exists, and handles it according to the policy if it does not.
+        Returns whether the value is (now) part of the categories.
+
+        ### Parameters
+
+        Attr: Name of the categorical attribute
+            ex: 'Location'
+        Value: Value to validate
+            ex: 'Hot Lab'
+        Policy: Overrides the policy of the validator for this value
+        '''
+        if self.is_known(attr,value):
+            return True
+        return self._handle_unknown(attr,[value],policy or self.policy)[0]
+
+    def validate_many(self,values:Iterable[tuple],policy:str=None):
+        '''
+        Validates many (attribute, value) pairs at once, e.g., every field of a dataset or every step of a program.
+        Values are checked by set difference, each unknown value is handled once, and new categories are written once.
+        Under the 'reject' policy, a single ValueError lists every unknown value.
+        Returns the unknown values that were not added, by attribute.
+
+        ### Parameters
+
+        Values: Iterable of (attribute, value) pairs
+            ex: [('Location','Hot Lab'),('Equipment Used','Mortar and Pestle')]
+        Policy: Overrides the policy of the validator for these values
+        '''
+        by_attr = {}
+        for attr,value in values:
+            # dict keys keep the first occurrence order of the values
+            by_attr.setdefault(attr,{})[value] = None
+        return self.validate_columns({attr:list(vals) for attr,vals in by_attr.items()},policy)
+
+    def validate_columns(self,columns:dict,policy:str=None):
+        '''
+        Validates whole columns of values, e.g., {'Form':df['Form']}, see validate_many.
+        Returns the unknown values that were not added, by attribute.
+        '''
+        policy = policy or self.policy
+        unknown = {}
+        for attr,vals in columns.items():
+            known = self.categories(attr)
+            new = [value for value in dict.fromkeys(vals) if value not in known]
+            if new:
+                unknown[attr] = new
+
+        if policy == 'reject' and unknown:
+            found = '; '.join(f'{attr}: {vals}' for attr,vals in unknown.items())
+            raise ValueError(f'Values must exist in their categories, but found unknown values ({found}).')
+
+        left = {}
+        with self.batch():
+            for attr,vals in unknown.items():
+                added = self._handle_unknown(attr,vals,policy)
+                vals = [value for value,ok in zip(vals,added) if not ok]
+                if vals:
+                    left[attr] = vals
+        return left
+
+    def validate_program(self,program:list[dict],policy:str=None):
+        '''
+        Validates the step types of a heating program, as built by build_heating_program.
+        Returns the unknown step types that were not added.
+        '''
+        return self.validate_columns({'Step Type':[step['Type'] for step in program]},policy).get('Step Type',[])
+
+    def add(self,attr:str,values:Iterable):
+        '''
+        Adds values to the categories of an attribute, and writes the config unless inside batch().
+        '''
+        known = self.categories(attr)
+        for value in values:
+            if value not in known:
+                known.add(value)
+                self.config['BOUNDS'][attr]['categories'].append(value)
+                self._pending = True
+        if self._batch_depth == 0:
+            self.flush()
+
+    def accept_collected(self):
+        '''
+        Adds every value collected under the 'collect' policy to its category, and writes the config once.
+        '''
+        with self.batch():
+            for attr,vals in self.collected.items():
+                self.add(attr,vals)
+        self.collected = {}
+
+    @contextmanager
+    def batch(self,policy:str=None):
+        '''
+        Defers writing new categories until the end of the block, optionally under another policy.
+
+        ex:
+            with VALIDATOR.batch('collect'):
+                build_workflow()
+        '''
+        previous = self.policy
+        if policy is not None:
+            self.policy = policy
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            self.policy = previous
+            if self._batch_depth == 0:
+                self.flush()
+
+    def flush(self):
+        '''
+        Writes the config atomically if categories were added since the last write.
+        '''
+        if not self._pending:
+            return
+        # write then rename so that an interrupted write never leaves a truncated config behind
+        with open(self.path + '.tmp','w') as file:
+            json.dump(self.config,file,indent=2)
+        os.replace(self.path + '.tmp',self.path)
+        self._pending = False
+
+    def _handle_unknown(self,attr:str,values:list,policy:str):
+        '''
+        Handles values missing from the categories of an attribute. Returns whether each one was added.
+        '''
+        if policy == 'add':
+            self.add(attr,values)
+            return [True]*len(values)
+
+        if policy == 'reject':
+            raise ValueError(f'Values of {attr} must exist in its categories, but found {values}.')
+
+        if policy == 'collect':
+            collected = self.collected.setdefault(attr,[])
+            collected.extend(value for value in values if value not in collected)
+            return [False]*len(values)
+
+        added = []
+        for value in values:
+            confirm = input(f'{value} does not exist in category {attr}. Would you like to add it? (y/n)')
+            if confirm.lower() == 'y':
+                self.add(attr,[value])
+                print(f'Added {value} to category {attr}.')
+                added.append(True)
+            elif confirm.lower() == 'n':
+                print(f'Please choose a different value for {attr}')
+                added.append(False)
+            else:
+                raise ValueError('Invalid response. Please answer y/n.')
+        return added
+
+# validator shared by the spec builders, e.g., VALIDATOR.policy = 'collect' for headless builds
+VALIDATOR = CategoryValidator(config,file_path)
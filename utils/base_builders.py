@@ -8,6 +8,7 @@ from utils.provenance import Provenance
 from tools.entity.base import Process,Material,Ingredient,Measurement
 from tools.entity.base.attributes import AttrsDict
 from tools.entity.base.attributes import finalize_template,define_attribute
+from tools.entity.base.node_registry import NodeRegistry
 from tools.workflow.Workflow import Workflow
 
 from typing import ClassVar
@@ -19,8 +20,35 @@ from gemd import PerformedSource, CategoricalBounds
 
 from utils.templates.attribute_templates import ATTR_TEMPL
 
+### BaseNode Classes ###
+
+# each BaseNode subclass (and its template) is built on first use, then shared by every call of its builder
+NODE_CLASSES = NodeRegistry()
+
 ### Process BaseNodes ###
 
+@NODE_CLASSES.register
+def _grinding_process() -> type[Process]:
+
+    class GrindingProcess(Process):
+
+        TEMPLATE: ClassVar[ProcessTemplate] = ProcessTemplate(name=__name__,)
+        _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
+
+        define_attribute(
+            _ATTRS,
+            template=ATTR_TEMPL['Equipment Used']
+        )
+
+        define_attribute(
+            _ATTRS,
+            template=ATTR_TEMPL['Location']
+        )
+
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
+
+    return GrindingProcess
+
 def build_grinding_process_base(name:str,location:str,equipment:str,tags:list=[],notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
     Builds a basenode for grinding a material.
@@ -52,34 +80,40 @@ def build_grinding_process_base(name:str,location:str,equipment:str,tags:list=[]
         source= PerformedSource(prv.email,prv.date)
     )
 
-    class GrindingProcess(Process):
+    process = NODE_CLASSES['grinding_process'].from_spec_or_run(
+                name=f'{name} Grinding Process',
+                run=process_run,
+                spec=process_spec
+            )
+
+    return process
+
+@NODE_CLASSES.register
+def _heating_process() -> type[Process]:
+
+    class HeatingProcess(Process):
 
         TEMPLATE: ClassVar[ProcessTemplate] = ProcessTemplate(name=__name__,)
         _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
 
         define_attribute(
             _ATTRS,
-            template=ParameterTemplate(
-                name='Equipment Used', bounds=ATTR_TEMPL['Equipment Used'].bounds
-            )      
+            template=ATTR_TEMPL['StepsNum']
         )
 
         define_attribute(
             _ATTRS,
-            template=ConditionTemplate(
-                name='Location', bounds=ATTR_TEMPL['Location'].bounds
-            )      
+            template=ATTR_TEMPL['Step']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
+        define_attribute(
+            _ATTRS,
+            template=ATTR_TEMPL['Location']
+        )
 
-    process = GrindingProcess.from_spec_or_run(
-                name=f'{name} Grinding Process',
-                run=process_run,
-                spec=process_spec
-            )
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
-    return process
+    return HeatingProcess
 
 def build_heating_process_base(name:str,program:list[dict],location:str,tags:list=[],notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
@@ -112,41 +146,43 @@ def build_heating_process_base(name:str,program:list[dict],location:str,tags:lis
         source= PerformedSource(prv.email,prv.date)
     )
 
-    class HeatingProcess(Process):
+    process = NODE_CLASSES['heating_process'].from_spec_or_run(
+                name=f'{name} Heating Process',
+                run=process_run,
+                spec=process_spec
+            )
+
+    return process
+
+@NODE_CLASSES.register
+def _ldfz_process() -> type[Process]:
+
+    class LDFZProcess(Process):
 
         TEMPLATE: ClassVar[ProcessTemplate] = ProcessTemplate(name=__name__,)
         _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
 
+
         define_attribute(
             _ATTRS,
-            template=ParameterTemplate(
-                name='StepsNum', bounds=ATTR_TEMPL['StepsNum'].bounds
-            )      
+            template=ATTR_TEMPL['Step']
         )
 
         define_attribute(
             _ATTRS,
             template=ParameterTemplate(
-                name='Step', bounds=ATTR_TEMPL['Step'].bounds
+                name='Atmosphere', bounds=ATTR_TEMPL['Atmosphere'].bounds
             )      
         )
 
         define_attribute(
             _ATTRS,
-            template=ConditionTemplate(
-                name='Location', bounds=ATTR_TEMPL['Location'].bounds
-            )      
+            template=ATTR_TEMPL['Location']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
-    process = HeatingProcess.from_spec_or_run(
-                name=f'{name} Heating Process',
-                run=process_run,
-                spec=process_spec
-            )
-
-    return process
+    return LDFZProcess
 
 def build_ldfz_process_base(name:str,program:list[dict],atmosphere,location:str,tags:list=[],notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
@@ -180,42 +216,35 @@ def build_ldfz_process_base(name:str,program:list[dict],atmosphere,location:str,
         source= PerformedSource(prv.email,prv.date)
     )
 
-    class LDFZProcess(Process):
+    process = NODE_CLASSES['ldfz_process'].from_spec_or_run(
+                name=f'{name} LDFZ Process',
+                run=process_run,
+                spec=process_spec
+            )
 
-        TEMPLATE: ClassVar[ProcessTemplate] = ProcessTemplate(name=__name__,)
-        _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
+    return process
 
+@NODE_CLASSES.register
+def _dissolving_process() -> type[Process]:
 
-        define_attribute(
-            _ATTRS,
-            template=ParameterTemplate(
-                name='Step', bounds=ATTR_TEMPL['Step'].bounds
-            )      
-        )
+    class DissolvingProcess(Process):
+
+        TEMPLATE: ClassVar[ProcessTemplate] = ProcessTemplate(name=__name__,)
+        _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
 
         define_attribute(
             _ATTRS,
-            template=ParameterTemplate(
-                name='Atmosphere', bounds=ATTR_TEMPL['Atmosphere'].bounds
-            )      
+            template=ATTR_TEMPL['Equipment Used']
         )
 
         define_attribute(
             _ATTRS,
-            template=ConditionTemplate(
-                name='Location', bounds=ATTR_TEMPL['Location'].bounds
-            )      
+            template=ATTR_TEMPL['Location']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
-
-    process = LDFZProcess.from_spec_or_run(
-                name=f'{name} LDFZ Process',
-                run=process_run,
-                spec=process_spec
-            )
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
-    return process
+    return DissolvingProcess
 
 def build_dissolving_process_base(name:str,location:str,equipment:str,tags:list=[],notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
@@ -248,34 +277,45 @@ def build_dissolving_process_base(name:str,location:str,equipment:str,tags:list=
         source= PerformedSource(prv.email,prv.date)
     )
 
-    class DissolvingProcess(Process):
+    process = NODE_CLASSES['dissolving_process'].from_spec_or_run(
+                name=f'{name} Dissolving Process',
+                run=process_run,
+                spec=process_spec
+            )
+
+    return process
+
+@NODE_CLASSES.register
+def _pressing_process() -> type[Process]:
+
+    class PressingProcess(Process):
 
         TEMPLATE: ClassVar[ProcessTemplate] = ProcessTemplate(name=__name__,)
         _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
 
         define_attribute(
             _ATTRS,
-            template=ParameterTemplate(
-                name='Equipment Used', bounds=ATTR_TEMPL['Equipment Used'].bounds
-            )      
+            template=ATTR_TEMPL['Equipment Used']
         )
 
         define_attribute(
             _ATTRS,
-            template=ConditionTemplate(
-                name='Location', bounds=ATTR_TEMPL['Location'].bounds
-            )      
+            template=ATTR_TEMPL['Duration']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
+        define_attribute(
+            _ATTRS,
+            template=ATTR_TEMPL['Pressure']
+        )
 
-    process = DissolvingProcess.from_spec_or_run(
-                name=f'{name} Dissolving Process',
-                run=process_run,
-                spec=process_spec
-            )
+        define_attribute(
+            _ATTRS,
+            template=ATTR_TEMPL['Location']
+        )
 
-    return process
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
+
+    return PressingProcess
 
 def build_pressing_process_base(name:str,location:str,equipment:str,pressure:float,duration:float,tags:list=[],notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
@@ -310,48 +350,40 @@ def build_pressing_process_base(name:str,location:str,equipment:str,pressure:flo
         source= PerformedSource(prv.email,prv.date)
     )
 
-    class PressingProcess(Process):
+    process = NODE_CLASSES['pressing_process'].from_spec_or_run(
+                name=f'{name} Pressing Process',
+                run=process_run,
+                spec=process_spec
+            )
+
+    return process
+
+@NODE_CLASSES.register
+def _filtering_process() -> type[Process]:
+
+    class FilteringProcess(Process):
 
         TEMPLATE: ClassVar[ProcessTemplate] = ProcessTemplate(name=__name__,)
         _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
 
         define_attribute(
             _ATTRS,
-            template=ParameterTemplate(
-                name='Equipment Used', bounds=ATTR_TEMPL['Equipment Used'].bounds
-            )      
-        )
-
-        define_attribute(
-            _ATTRS,
-            template=ParameterTemplate(
-                name='Duration', bounds=ATTR_TEMPL['Duration'].bounds
-            )      
+            template=ATTR_TEMPL['Equipment Used']
         )
 
         define_attribute(
             _ATTRS,
-            template=ParameterTemplate(
-                name='Pressure', bounds=ATTR_TEMPL['Pressure'].bounds
-            )      
+            template=ATTR_TEMPL['Solvent']
         )
 
         define_attribute(
             _ATTRS,
-            template=ConditionTemplate(
-                name='Location', bounds=ATTR_TEMPL['Location'].bounds
-            )      
+            template=ATTR_TEMPL['Location']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
-
-    process = PressingProcess.from_spec_or_run(
-                name=f'{name} Pressing Process',
-                run=process_run,
-                spec=process_spec
-            )
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
-    return process
+    return FilteringProcess
 
 def build_filtering_process_base(name:str,location:str,equipment:str,solvent:str,notes:str=None,tags:list=[],workflow:Workflow=None,prv:Provenance=None):
     """
@@ -385,41 +417,40 @@ def build_filtering_process_base(name:str,location:str,equipment:str,solvent:str
         source= PerformedSource(prv.email,prv.date)
     )
 
-    class FilteringProcess(Process):
+    process = NODE_CLASSES['filtering_process'].from_spec_or_run(
+                name=f'{name} Filtering Process',
+                run=process_run,
+                spec=process_spec
+            )
+
+    return process
+
+@NODE_CLASSES.register
+def _evacuating_process() -> type[Process]:
+
+    class EvacuatingProcess(Process):
 
         TEMPLATE: ClassVar[ProcessTemplate] = ProcessTemplate(name=__name__,)
         _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
 
         define_attribute(
             _ATTRS,
-            template=ParameterTemplate(
-                name='Equipment Used', bounds=ATTR_TEMPL['Equipment Used'].bounds
-            )      
+            template=ATTR_TEMPL['Equipment Used']
         )
 
         define_attribute(
             _ATTRS,
-            template=ParameterTemplate(
-                name='Solvent', bounds=ATTR_TEMPL['Solvent'].bounds
-            )      
+            template=ATTR_TEMPL['Duration']
         )
 
         define_attribute(
             _ATTRS,
-            template=ConditionTemplate(
-                name='Location', bounds=ATTR_TEMPL['Location'].bounds
-            )      
+            template=ATTR_TEMPL['Location']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
-    process = FilteringProcess.from_spec_or_run(
-                name=f'{name} Filtering Process',
-                run=process_run,
-                spec=process_spec
-            )
-
-    return process
+    return EvacuatingProcess
 
 def build_evacuating_process_base(name:str,location:str,equipment:str,duration:float,tags:list=[],notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
@@ -453,43 +484,32 @@ def build_evacuating_process_base(name:str,location:str,equipment:str,duration:f
         source= PerformedSource(prv.email,prv.date)
     )
 
-    class EvacuatingProcess(Process):
+    process = NODE_CLASSES['evacuating_process'].from_spec_or_run(
+                name=f'{name} Evacuating Process',
+                run=process_run,
+                spec=process_spec
+            )
 
-        TEMPLATE: ClassVar[ProcessTemplate] = ProcessTemplate(name=__name__,)
-        _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
+    return process
 
-        define_attribute(
-            _ATTRS,
-            template=ParameterTemplate(
-                name='Equipment Used', bounds=ATTR_TEMPL['Equipment Used'].bounds
-            )      
-        )
+### Material BaseNodes ###
 
-        define_attribute(
-            _ATTRS,
-            template=ParameterTemplate(
-                name='Duration', bounds=ATTR_TEMPL['Duration'].bounds
-            )      
-        )
+@NODE_CLASSES.register
+def _ground_material() -> type[Material]:
+
+    class GroundMaterial(Material):
+
+        TEMPLATE: ClassVar[MaterialTemplate] = MaterialTemplate(name=__name__,)
+        _ATTRS: ClassVar[AttrsDict] = {'properties':{}}
 
         define_attribute(
             _ATTRS,
-            template=ConditionTemplate(
-                name='Location', bounds=ATTR_TEMPL['Location'].bounds
-            )      
+            template=ATTR_TEMPL['Form']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
-
-    process = EvacuatingProcess.from_spec_or_run(
-                name=f'{name} Evacuating Process',
-                run=process_run,
-                spec=process_spec
-            )
-
-    return process
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
-### Material BaseNodes ###
+    return GroundMaterial
 
 def build_ground_material_base(name:str,process_spec:ProcessSpec,process_run:ProcessRun,form:str='Powder',tags:list=[],notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
@@ -521,27 +541,30 @@ def build_ground_material_base(name:str,process_spec:ProcessSpec,process_run:Pro
         sample_type='experimental'
     )
 
-    class GroundMaterial(Material):
+    material = NODE_CLASSES['ground_material'].from_spec_or_run(
+                name=f'{name} Ground Material',
+                run=material_run,
+                spec=material_spec
+            )
+    
+    return material
+
+@NODE_CLASSES.register
+def _heated_material() -> type[Material]:
+
+    class HeatedMaterial(Material):
 
         TEMPLATE: ClassVar[MaterialTemplate] = MaterialTemplate(name=__name__,)
         _ATTRS: ClassVar[AttrsDict] = {'properties':{}}
 
         define_attribute(
             _ATTRS,
-            template=PropertyTemplate(
-                name='Form', bounds=ATTR_TEMPL['Form'].bounds
-            )
+            template=ATTR_TEMPL['Form']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
-    material = GroundMaterial.from_spec_or_run(
-                name=f'{name} Ground Material',
-                run=material_run,
-                spec=material_spec
-            )
-    
-    return material
+    return HeatedMaterial
 
 def build_heated_material_base(name:str,process_spec:ProcessSpec,process_run:ProcessRun,form:str,tags:list=[],notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
@@ -573,21 +596,7 @@ def build_heated_material_base(name:str,process_spec:ProcessSpec,process_run:Pro
         sample_type='experimental'
     )
 
-    class HeatedMaterial(Material):
-
-        TEMPLATE: ClassVar[MaterialTemplate] = MaterialTemplate(name=__name__,)
-        _ATTRS: ClassVar[AttrsDict] = {'properties':{}}
-
-        define_attribute(
-            _ATTRS,
-            template=PropertyTemplate(
-                name='Form', bounds=ATTR_TEMPL['Form'].bounds
-            )
-        )
-
-        finalize_template(_ATTRS, TEMPLATE)
-
-    material = HeatedMaterial.from_spec_or_run(
+    material = NODE_CLASSES['heated_material'].from_spec_or_run(
                 name=f'{name} Heated Material',
                 run=material_run,
                 spec=material_spec
@@ -625,27 +634,30 @@ def build_ldfz_material_base(name:str,process_spec:ProcessSpec,process_run:Proce
         sample_type='experimental'
     )
 
-    class HeatedMaterial(Material):
+    material = NODE_CLASSES['heated_material'].from_spec_or_run(
+                name=f'{name} Heated Material',
+                run=material_run,
+                spec=material_spec
+            )
+    
+    return material
+
+@NODE_CLASSES.register
+def _dissolved_material() -> type[Material]:
+
+    class DissolvedMaterial(Material):
 
         TEMPLATE: ClassVar[MaterialTemplate] = MaterialTemplate(name=__name__,)
         _ATTRS: ClassVar[AttrsDict] = {'properties':{}}
 
         define_attribute(
             _ATTRS,
-            template=PropertyTemplate(
-                name='Form', bounds=ATTR_TEMPL['Form'].bounds
-            )
+            template=ATTR_TEMPL['Form']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
-    material = HeatedMaterial.from_spec_or_run(
-                name=f'{name} Heated Material',
-                run=material_run,
-                spec=material_spec
-            )
-    
-    return material
+    return DissolvedMaterial
 
 def build_dissolved_material_base(name:str,process_spec:ProcessSpec,process_run:ProcessRun,form:str='Solution',tags:list=[],notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
@@ -677,27 +689,30 @@ def build_dissolved_material_base(name:str,process_spec:ProcessSpec,process_run:
         sample_type='experimental'
     )
 
-    class DissolvedMaterial(Material):
+    material = NODE_CLASSES['dissolved_material'].from_spec_or_run(
+                name=f'{name} Dissolved Material',
+                run=material_run,
+                spec=material_spec
+            )
+    
+    return material
+
+@NODE_CLASSES.register
+def _filtered_material() -> type[Material]:
+
+    class FilteredMaterial(Material):
 
         TEMPLATE: ClassVar[MaterialTemplate] = MaterialTemplate(name=__name__,)
         _ATTRS: ClassVar[AttrsDict] = {'properties':{}}
 
         define_attribute(
             _ATTRS,
-            template=PropertyTemplate(
-                name='Form', bounds=ATTR_TEMPL['Form'].bounds
-            )
+            template=ATTR_TEMPL['Form']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
-    material = DissolvedMaterial.from_spec_or_run(
-                name=f'{name} Dissolved Material',
-                run=material_run,
-                spec=material_spec
-            )
-    
-    return material
+    return FilteredMaterial
 
 def build_filtered_material_base(name:str,process_spec:ProcessSpec,process_run:ProcessRun,form:str,tags:list=[],notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
@@ -729,27 +744,30 @@ def build_filtered_material_base(name:str,process_spec:ProcessSpec,process_run:P
         sample_type='experimental'
     )
 
-    class FilteredMaterial(Material):
+    material = NODE_CLASSES['filtered_material'].from_spec_or_run(
+                name=f'{name} Filtered Material',
+                run=material_run,
+                spec=material_spec
+            )
+    
+    return material
+
+@NODE_CLASSES.register
+def _pressed_material() -> type[Material]:
+
+    class PressedMaterial(Material):
 
         TEMPLATE: ClassVar[MaterialTemplate] = MaterialTemplate(name=__name__,)
         _ATTRS: ClassVar[AttrsDict] = {'properties':{}}
 
         define_attribute(
             _ATTRS,
-            template=PropertyTemplate(
-                name='Form', bounds=ATTR_TEMPL['Form'].bounds
-            )
+            template=ATTR_TEMPL['Form']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
-    material = FilteredMaterial.from_spec_or_run(
-                name=f'{name} Filtered Material',
-                run=material_run,
-                spec=material_spec
-            )
-    
-    return material
+    return PressedMaterial
 
 def build_pressed_material_base(name:str,process_spec:ProcessSpec,process_run:ProcessRun,form:str='Pellet',tags:list=[],notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
@@ -781,27 +799,30 @@ def build_pressed_material_base(name:str,process_spec:ProcessSpec,process_run:Pr
         sample_type='experimental'
     )
 
-    class PressedMaterial(Material):
+    material = NODE_CLASSES['pressed_material'].from_spec_or_run(
+                name=f'{name} Pressed Material',
+                run=material_run,
+                spec=material_spec
+            )
+    
+    return material
+
+@NODE_CLASSES.register
+def _evacuated_material() -> type[Material]:
+
+    class EvacuatedMaterial(Material):
 
         TEMPLATE: ClassVar[MaterialTemplate] = MaterialTemplate(name=__name__,)
         _ATTRS: ClassVar[AttrsDict] = {'properties':{}}
 
         define_attribute(
             _ATTRS,
-            template=PropertyTemplate(
-                name='Form', bounds=ATTR_TEMPL['Form'].bounds
-            )
+            template=ATTR_TEMPL['Form']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
-    material = PressedMaterial.from_spec_or_run(
-                name=f'{name} Pressed Material',
-                run=material_run,
-                spec=material_spec
-            )
-    
-    return material
+    return EvacuatedMaterial
 
 def build_evacuated_material_base(name:str,process_spec:ProcessSpec,process_run:ProcessRun,form:str,tags:list=[],notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
@@ -833,27 +854,30 @@ def build_evacuated_material_base(name:str,process_spec:ProcessSpec,process_run:
         sample_type='experimental'
     )
 
-    class EvacuatedMaterial(Material):
+    material = NODE_CLASSES['evacuated_material'].from_spec_or_run(
+                name=f'{name} Evacuated Material',
+                run=material_run,
+                spec=material_spec
+            )
+    
+    return material
+
+@NODE_CLASSES.register
+def _terminal_material() -> type[Material]:
+
+    class TerminalMaterial(Material):
 
         TEMPLATE: ClassVar[MaterialTemplate] = MaterialTemplate(name=__name__,)
         _ATTRS: ClassVar[AttrsDict] = {'properties':{}}
 
         define_attribute(
             _ATTRS,
-            template=PropertyTemplate(
-                name='Form', bounds=ATTR_TEMPL['Form'].bounds
-            )
+            template=ATTR_TEMPL['Form']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
-    material = EvacuatedMaterial.from_spec_or_run(
-                name=f'{name} Evacuated Material',
-                run=material_run,
-                spec=material_spec
-            )
-    
-    return material
+    return TerminalMaterial
 
 def build_terminal_material_base(name:str,process_spec:ProcessSpec,process_run:ProcessRun,form:str,tags:list=[],notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
@@ -885,21 +909,7 @@ def build_terminal_material_base(name:str,process_spec:ProcessSpec,process_run:P
         sample_type='experimental'
     )
 
-    class TerminalMaterial(Material):
-
-        TEMPLATE: ClassVar[MaterialTemplate] = MaterialTemplate(name=__name__,)
-        _ATTRS: ClassVar[AttrsDict] = {'properties':{}}
-
-        define_attribute(
-            _ATTRS,
-            template=PropertyTemplate(
-                name='Form', bounds=ATTR_TEMPL['Form'].bounds
-            )
-        )
-
-        finalize_template(_ATTRS, TEMPLATE)
-
-    material = TerminalMaterial.from_spec_or_run(
+    material = NODE_CLASSES['terminal_material'].from_spec_or_run(
                 name=f'{name} Terminal Material',
                 run=material_run,
                 spec=material_spec
@@ -944,12 +954,54 @@ def build_ingredient_base(name:str,material_spec:MaterialSpec,material_run:Mater
 
 ### Measurement BaseNodes ###
 
-def build_xrd_measurement_base(name:str,duration:float,range:str,adhesive:str,material:MaterialRun,location:str='X-Ray Diffraction Panel',file=None,tags:list=[],notes:str=None,prv:Provenance=None):
+@NODE_CLASSES.register
+def _xrd_measurement() -> type[Measurement]:
+
+    class XRDMeasurement(Measurement):
+
+        TEMPLATE: ClassVar[MeasurementTemplate] = MeasurementTemplate(name=__name__,)
+        _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
+
+        define_attribute(
+            _ATTRS,
+            template=ATTR_TEMPL['Duration']
+        )
+
+        define_attribute(
+            _ATTRS,
+            template=ATTR_TEMPL['XRD Range']
+        )
+
+        define_attribute(
+            _ATTRS,
+            template=ATTR_TEMPL['XRD Adhesive']
+        )
+
+        define_attribute(
+            _ATTRS,
+            template=ATTR_TEMPL['Location']
+        )
+
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
+
+    return XRDMeasurement
+
+def build_xrd_measurement_base(name:str,duration:float,range:str,adhesive:str,material:MaterialRun,location:str='X-Ray Diffraction Panel',file=None,tags:list=[],notes:str=None,prv:Provenance=None,side_file:FileLink=None):
 
     '''
     Returns an XRD measurement BaseNode.
+
+    ### Parameters
+
+    Side File: Link returned by ArrAttrs.write_side_file for the diffraction pattern. The pattern stays in
+    the side file and ArrAttrs(measurement.run,dump_dir) only creates its GEMD properties when they are requested.
+    Its url is relative to the dump folder passed as dump_dir.
+        ex: ArrAttrs.write_side_file('GBM1003A_xrd',pd.read_csv('GBM1003A.xy'),...,dump_dir='./dumps/GBM1003')
     '''
 
+    if side_file is not None:
+        file = list(file or []) + [side_file]
+
     measurement_spec = build_xrd_meas_spec(
         name=name,
         duration=duration,
@@ -972,48 +1024,35 @@ def build_xrd_measurement_base(name:str,duration:float,range:str,adhesive:str,ma
         source=PerformedSource(prv.email,prv.date)
     )
 
-    class XRDMeasurement(Measurement):
+    measurement = NODE_CLASSES['xrd_measurement'].from_spec_or_run(
+                name=f'{name} XRD Measurement',
+                run=measurement_run,
+                spec=measurement_spec
+            )
+
+    return measurement
+
+@NODE_CLASSES.register
+def _photo_measurement() -> type[Measurement]:
+
+    class PhotoMeasurement(Measurement):
 
         TEMPLATE: ClassVar[MeasurementTemplate] = MeasurementTemplate(name=__name__,)
         _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
 
         define_attribute(
             _ATTRS,
-            template=ParameterTemplate(
-                name='Duration', bounds=ATTR_TEMPL['Duration'].bounds
-            )      
+            template=ATTR_TEMPL['Location']
         )
 
         define_attribute(
             _ATTRS,
-            template=ParameterTemplate(
-                name='XRD Range', bounds=ATTR_TEMPL['XRD Range'].bounds
-            )      
-        )
-
-        define_attribute(
-            _ATTRS,
-            template=ParameterTemplate(
-                name='XRD Adhesive', bounds=ATTR_TEMPL['XRD Adhesive'].bounds
-            )      
+            template=ATTR_TEMPL['Equipment Used']
         )
 
-        define_attribute(
-            _ATTRS,
-            template=ConditionTemplate(
-                name='Location', bounds=ATTR_TEMPL['Location'].bounds
-            )      
-        )
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
-        finalize_template(_ATTRS, TEMPLATE)
-
-    measurement = XRDMeasurement.from_spec_or_run(
-                name=f'{name} XRD Measurement',
-                run=measurement_run,
-                spec=measurement_spec
-            )
-
-    return measurement
+    return PhotoMeasurement
 
 def build_photograph_base(name:str,material:MaterialRun,equipment,location:str,file=None,tags:list=[],notes:str=None,prv:Provenance=None):
 
@@ -1042,28 +1081,7 @@ def build_photograph_base(name:str,material:MaterialRun,equipment,location:str,f
         source=PerformedSource(prv.email,prv.date)
     )
 
-    class PhotoMeasurement(Measurement):
-
-        TEMPLATE: ClassVar[MeasurementTemplate] = MeasurementTemplate(name=__name__,)
-        _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
-
-        define_attribute(
-            _ATTRS,
-            template=ConditionTemplate(
-                name='Location', bounds=ATTR_TEMPL['Location'].bounds
-            )      
-        )
-
-        define_attribute(
-            _ATTRS,
-            template=ParameterTemplate(
-                name='Equipment Used', bounds=ATTR_TEMPL['Equipment Used'].bounds
-            )      
-        )
-
-        finalize_template(_ATTRS, TEMPLATE)
-
-    measurement = PhotoMeasurement.from_spec_or_run(
+    measurement = NODE_CLASSES['photo_measurement'].from_spec_or_run(
                 name=f'{name} Photo Measurement',
                 run=measurement_run,
                 spec=measurement_spec
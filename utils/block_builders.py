@@ -10,6 +10,7 @@ from tools.entity.base.attributes import AttrsDict
 from tools.entity.base.attributes import finalize_template,define_attribute
 from tools.block.Block import Block
 from tools.workflow.Workflow import Workflow
+from utils.base_builders import NODE_CLASSES
 
 from typing import ClassVar
 
@@ -29,6 +30,57 @@ def make_ingredient_dict(name,quantity,measured,unc,units):
         'measured':UniformReal(measured-unc,measured+unc,units)
     }
 
+@NODE_CLASSES.register
+def _acquisition_process() -> type[Process]:
+
+    class AcquisitionProcess(Process):
+
+        TEMPLATE: ClassVar[ProcessTemplate] = ProcessTemplate(name=__name__,)
+        _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
+
+        define_attribute(
+            _ATTRS,
+            template=ATTR_TEMPL['Manufacturer']
+        )
+
+        define_attribute(
+            _ATTRS,
+            template=ATTR_TEMPL['Lot ID']
+        )
+
+        define_attribute(
+            _ATTRS,
+            template=ATTR_TEMPL['CAS RN']
+        )
+
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
+
+    return AcquisitionProcess
+
+@NODE_CLASSES.register
+def _acquired_material() -> type[Material]:
+
+    class AcquiredMaterial(Material):
+
+        TEMPLATE: ClassVar[MaterialTemplate] = MaterialTemplate(name=__name__,)
+        _ATTRS: ClassVar[AttrsDict] = {'properties':{}}
+
+        define_attribute(
+            _ATTRS,
+            template=ATTR_TEMPL['Form']
+        )
+
+        define_attribute(
+            _ATTRS,
+            template=PropertyTemplate(
+                name="Purity", bounds=ATTR_TEMPL['Purity Percentage'].bounds
+            ),
+        )
+
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
+
+    return AcquiredMaterial
+
 def build_acquiring_material_block(name:str,manufacturer:str,lot_id:str,cas_rn:str,form:str,purity:float,notes:str=None,workflow:Workflow=None,prv:Provenance=None):
     """
     Builds a Block for acquiring a material.
@@ -65,6 +117,7 @@ def build_acquiring_material_block(name:str,manufacturer:str,lot_id:str,cas_rn:s
         name=name,
         form=form,
         purity=purity,
+        process=process_spec,
     )
 
     ### Convert Ingredient, Process, Material, & Measurement Specs into Runs ###
@@ -86,62 +139,13 @@ def build_acquiring_material_block(name:str,manufacturer:str,lot_id:str,cas_rn:s
 
     ### Build Base Nodes ###
 
-    class AcquisitionProcess(Process):
-
-        TEMPLATE: ClassVar[ProcessTemplate] = ProcessTemplate(name=__name__,)
-        _ATTRS: ClassVar[AttrsDict] = {'conditions':{},'parameters':{}}
-
-        define_attribute(
-            _ATTRS,
-            template=ParameterTemplate(
-                name='Manufacturer', bounds=ATTR_TEMPL['Manufacturer'].bounds
-            )      
-        )
-
-        define_attribute(
-            _ATTRS,
-            template=ParameterTemplate(
-                name='Lot ID', bounds=ATTR_TEMPL['Lot ID'].bounds
-            )      
-        )
-
-        define_attribute(
-            _ATTRS,
-            template=ParameterTemplate(
-                name='CAS RN', bounds=ATTR_TEMPL['CAS RN'].bounds
-            )      
-        )
-
-        finalize_template(_ATTRS, TEMPLATE)
-
-    process = AcquisitionProcess.from_spec_or_run(
+    process = NODE_CLASSES['acquisition_process'].from_spec_or_run(
                 name=f'{name} Acquisition Process',
                 run=process_run,
                 spec=process_spec
             )
 
-    class AcquiredMaterial(Material):
-
-        TEMPLATE: ClassVar[MaterialTemplate] = MaterialTemplate(name=__name__,)
-        _ATTRS: ClassVar[AttrsDict] = {'properties':{}}
-
-        define_attribute(
-            _ATTRS,
-            template=PropertyTemplate(
-                name='Form', bounds=ATTR_TEMPL['Form'].bounds
-            )
-        )
-
-        define_attribute(
-            _ATTRS,
-            template=PropertyTemplate(
-                name="Purity", bounds=ATTR_TEMPL['Purity Percentage'].bounds
-            ),
-        )
-
-        finalize_template(_ATTRS, TEMPLATE)
-
-    material = AcquiredMaterial.from_spec_or_run(
+    material = NODE_CLASSES['acquired_material'].from_spec_or_run(
                 name=f'{name} Acquired Material Base',
                 run=material_run,
                 spec=material_spec
@@ -251,19 +255,15 @@ def build_grinding_material_block(name:str,location:str,form:str='Powder',equipm
 
         define_attribute(
             _ATTRS,
-            template=ParameterTemplate(
-                name='Equipment Used', bounds=ATTR_TEMPL['Equipment Used'].bounds
-            )      
+            template=ATTR_TEMPL['Equipment Used']
         )
 
         define_attribute(
             _ATTRS,
-            template=ConditionTemplate(
-                name='Location', bounds=ATTR_TEMPL['Location'].bounds
-            )      
+            template=ATTR_TEMPL['Location']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
     process = GrindingProcess.from_spec_or_run(
                 name=f'{name} Grinding Process',
@@ -278,12 +278,10 @@ def build_grinding_material_block(name:str,location:str,form:str='Powder',equipm
 
         define_attribute(
             _ATTRS,
-            template=PropertyTemplate(
-                name='Form', bounds=ATTR_TEMPL['Form'].bounds
-            )
+            template=ATTR_TEMPL['Form']
         )
 
-        finalize_template(_ATTRS, TEMPLATE)
+        TEMPLATE = finalize_template(_ATTRS, TEMPLATE)
 
     material = GroundMaterial.from_spec_or_run(
                 name=f'{name} Ground Material',
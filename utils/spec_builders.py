@@ -9,36 +9,21 @@ from gemd.entity.attribute import Property, Parameter, Condition, PropertyAndCon
 from utils.templates.attribute_templates import ATTR_TEMPL
 from utils.templates.object_templates import OBJ_TEMPL
 
-import json
-from utils.templates.attribute_templates import config,file_path
+from utils.attr_validation import VALIDATOR
+from utils.spec_cache import SpecCache
 
 ### Validate Attributes ###
 
-def save_config(config):
-    with open(file_path, 'w') as file:
-        json.dump(config, file, indent=2)
-
 def attr_validate(attr:str,value):
     '''
-    Validates that a categorical value exists and adds it to the attribute bounds config if requested.
-    '''
-    if value not in config['BOUNDS'][attr]['categories']:
-        confirm = input(f'{value} does not exist in category {attr}. Would you like to add it? (y/n)')
-        if confirm.lower() == 'y':
-            config['BOUNDS'][attr]['categories'].append(value)
-            print(f'Added {value} to category {attr}.')
-            save_config(config)
-        elif confirm.lower() == 'n':
-            print(f'Please choose a different value for {attr}')
-            return
-        else:
-            raise ValueError('Invalid response. Please answer y/n.')
-    else:
-        pass
+    Validates that a categorical value exists and handles it according to the policy of VALIDATOR if it does not,
+    i.e., asks whether to add it to the attribute bounds config by default. Returns whether the value exists.
+    '''
+    return VALIDATOR.validate(attr,value)
 
 ### Process Spec Builders ###
 
-PROCESS_SPECS = {}
+PROCESS_SPECS = SpecCache('PROCESS_SPECS')
 
 def build_chunking_material_proc_spec():
     pass
@@ -60,7 +45,7 @@ def build_dissolving_material_proc_spec(name:str,location:str,equipment:str,tags
     attr_validate('Equipment Used',equipment)
     attr_validate('Location',location)
 
-    PROCESS_SPECS[f'Dissolving {name} Spec'] = ProcessSpec(
+    spec = ProcessSpec(
         name=f'Dissolving {name} Spec',
         template=OBJ_TEMPL['Dissolving Material'],
         parameters=[
@@ -81,7 +66,7 @@ def build_dissolving_material_proc_spec(name:str,location:str,equipment:str,tags
         notes=notes
     )
 
-    return PROCESS_SPECS[f'Dissolving {name} Spec']
+    return PROCESS_SPECS.add(('Dissolving',name),spec)
 
 def build_filtering_material_proc_spec(name:str,location:str='Wet Lab',equipment:str='Vacuum Filter',solvent:str=None,tags:list=[],notes:str=None):
     '''
@@ -103,7 +88,7 @@ def build_filtering_material_proc_spec(name:str,location:str='Wet Lab',equipment
     attr_validate('Location',location)
     attr_validate('Solvent',solvent)
 
-    PROCESS_SPECS[f'Filtering {name} Spec'] = ProcessSpec(
+    spec = ProcessSpec(
         name=f'Filtering {name} Spec',
         template=OBJ_TEMPL['Filtering Material'],
         parameters=[
@@ -129,7 +114,7 @@ def build_filtering_material_proc_spec(name:str,location:str='Wet Lab',equipment
         notes=notes
     )
 
-    return PROCESS_SPECS[f'Filtering {name} Spec']
+    return PROCESS_SPECS.add(('Filtering',name),spec)
 
 def build_grinding_material_proc_spec(name:str,location:str,equipment:str='Mortar and Pestle',tags:list=[],notes:str=None):
     '''
@@ -148,7 +133,7 @@ def build_grinding_material_proc_spec(name:str,location:str,equipment:str='Morta
     attr_validate('Equipment Used',equipment)
     attr_validate('Location',location)
 
-    PROCESS_SPECS[f'Grinding {name} Spec'] = ProcessSpec(
+    spec = ProcessSpec(
         name=f'Grinding {name} Spec',
         template=OBJ_TEMPL['Grinding Material'],
         parameters=[
@@ -169,7 +154,7 @@ def build_grinding_material_proc_spec(name:str,location:str,equipment:str='Morta
         notes=notes
     )
 
-    return PROCESS_SPECS[f'Grinding {name} Spec']
+    return PROCESS_SPECS.add(('Grinding',name),spec)
 
 """
 Newer version below with dynamic step input
@@ -194,7 +179,7 @@ def build_heating_material_proc_spec(name:str,temperature:str,rate:float,duratio
     '''
     attr_validate('Location',location)
 
-    PROCESS_SPECS[f'Heating {name} Spec'] = ProcessSpec(
+    spec = ProcessSpec(
         name=f'Heating {name} Spec',
         template=OBJ_TEMPL['Heating Material'],
         parameters=[
@@ -223,7 +208,7 @@ def build_heating_material_proc_spec(name:str,temperature:str,rate:float,duratio
         notes=notes
     )
 
-    return PROCESS_SPECS[f'Heating {name} Spec']
+    return PROCESS_SPECS.add(('Heating',name),spec)
 """
 
 def heating_program_step(type:str,temp:float,duration:float):
@@ -243,7 +228,6 @@ def build_heating_program(program:list[tuple]):
     '''
 
     PROGRAM = []
-    i = 0
 
     for step in program:
         PROGRAM.append(
@@ -254,10 +238,8 @@ def build_heating_program(program:list[tuple]):
             }
         )
 
-        attr_validate('Step Type',PROGRAM[i]['Type'])
-        
-        i += 1
-    
+    VALIDATOR.validate_program(PROGRAM)
+
     return PROGRAM
 
 def build_heating_material_proc_spec(name:str,program:list[dict],location:str='Hot Lab',tags:list=[],notes:str=None):
@@ -277,7 +259,7 @@ def build_heating_material_proc_spec(name:str,program:list[dict],location:str='H
 
     attr_validate('Location',location)
 
-    PROCESS_SPECS[f'Heating {name} Spec'] = ProcessSpec(
+    spec = ProcessSpec(
         name=f'Heating {name} Spec',
         template=OBJ_TEMPL['Improved Heating Material'],
         parameters=[],
@@ -295,7 +277,7 @@ def build_heating_material_proc_spec(name:str,program:list[dict],location:str='H
 
     for step in program:
 
-        PROCESS_SPECS[f'Heating {name} Spec'].parameters.append(Parameter(
+        spec.parameters.append(Parameter(
             name=f'Step {i+1}',
             template=ATTR_TEMPL['Step'],
             value=NominalComposition(
@@ -306,7 +288,7 @@ def build_heating_material_proc_spec(name:str,program:list[dict],location:str='H
 
         i += 1
 
-    return PROCESS_SPECS[f'Heating {name} Spec']    
+    return PROCESS_SPECS.add(('Heating',name),spec)
 
 def ldfz_program_step(type:str,power:float,duration:float,rotation:tuple,rate:float,tags:list=[],notes:str=None):
     '''
@@ -361,7 +343,7 @@ def build_ldfz_proc_spec(name:str,program:list[dict],atmosphere,location:str='PA
     attr_validate('Location',location),
     attr_validate('Atmosphere',atmosphere)
 
-    PROCESS_SPECS[f'LDFZ {name} Spec'] = ProcessSpec(
+    spec = ProcessSpec(
         name=f'LDFZ {name} Spec',
         template=OBJ_TEMPL['LDFZ Material'],
         parameters=[],
@@ -384,7 +366,7 @@ def build_ldfz_proc_spec(name:str,program:list[dict],atmosphere,location:str='PA
 
     for step in program:
 
-        PROCESS_SPECS[f'LDFZ {name} Spec'].parameters.append(Parameter(
+        spec.parameters.append(Parameter(
             name=f'Step {i+1}',
             template=ATTR_TEMPL['Step'],
             value=NominalComposition(
@@ -395,7 +377,7 @@ def build_ldfz_proc_spec(name:str,program:list[dict],atmosphere,location:str='PA
 
         i += 1
 
-    return PROCESS_SPECS[f'LDFZ {name} Spec'] 
+    return PROCESS_SPECS.add(('LDFZ',name),spec)
 
 def build_pressing_material_proc_spec(name:str,equipment:str,pressure,duration:float,location:str,tags:list=[],notes:str=None):
     '''
@@ -416,7 +398,7 @@ def build_pressing_material_proc_spec(name:str,equipment:str,pressure,duration:f
     attr_validate('Equipment Used',equipment)
     attr_validate('Location',location)
 
-    PROCESS_SPECS[f'Pressing {name} Spec'] = ProcessSpec(
+    spec = ProcessSpec(
         name=f'Pressing {name} Spec',
         template=OBJ_TEMPL['Pressing Material'],
         parameters=[
@@ -447,7 +429,7 @@ def build_pressing_material_proc_spec(name:str,equipment:str,pressure,duration:f
         notes=notes
     )
 
-    return PROCESS_SPECS[f'Pressing {name} Spec']
+    return PROCESS_SPECS.add(('Pressing',name),spec)
 
 def build_evacuating_proc_spec(name:str,equipment:str,duration:float,location:str,tags:list=[],notes:str=None):
     '''
@@ -466,7 +448,7 @@ def build_evacuating_proc_spec(name:str,equipment:str,duration:float,location:st
     attr_validate('Equipment Used',equipment)
     attr_validate('Location',location)
 
-    PROCESS_SPECS[f'Evacuating {name} Spec'] = ProcessSpec(
+    spec = ProcessSpec(
         name=f'Evacuating {name} Spec',
         template=OBJ_TEMPL['Evacuating Material'],
         parameters=[
@@ -492,7 +474,7 @@ def build_evacuating_proc_spec(name:str,equipment:str,duration:float,location:st
         notes=notes
     )
 
-    return PROCESS_SPECS[f'Evacuating {name} Spec']
+    return PROCESS_SPECS.add(('Evacuating',name),spec)
 
 def build_acquire_raw_material_proc_spec(name:str,manufacturer:str,lot_id:str,cas_rn:str=None,tags:list=[],notes:str=None):
     '''
@@ -513,7 +495,7 @@ def build_acquire_raw_material_proc_spec(name:str,manufacturer:str,lot_id:str,ca
     attr_validate('Lot ID',lot_id)
     attr_validate('CAS RN',cas_rn)
 
-    PROCESS_SPECS[f'Purchasing {name} Spec'] = ProcessSpec(
+    spec = ProcessSpec(
         name=f'Purchasing {name} Spec',
         template=OBJ_TEMPL['Purchasing Raw Material'],
         parameters=[
@@ -534,7 +516,7 @@ def build_acquire_raw_material_proc_spec(name:str,manufacturer:str,lot_id:str,ca
         notes=notes
     )
 
-    return PROCESS_SPECS[f'Purchasing {name} Spec']
+    return PROCESS_SPECS.add(('Purchasing',name),spec)
 
 def build_quenching_tube_proc_spec():
     pass
@@ -547,7 +529,7 @@ def build_setting_pellets_proc_spec():
 
 ### Material Spec Builders ###
 
-MATERIAL_SPECS = {}
+MATERIAL_SPECS = SpecCache('MATERIAL_SPECS')
 
 def build_chunked_material_mat_spec():
     pass
@@ -565,7 +547,7 @@ def build_filtered_material_mat_spec(name:str,form:str,process:ProcessSpec,tags:
     '''
     attr_validate('Form',form)
 
-    MATERIAL_SPECS[f'{name} Filtered Material Spec'] = MaterialSpec(
+    spec = MaterialSpec(
         name=f'{name} Filtered Material Spec',
         template=OBJ_TEMPL['Filtered Material'],
         process=process,
@@ -582,7 +564,7 @@ def build_filtered_material_mat_spec(name:str,form:str,process:ProcessSpec,tags:
         notes=notes
     )
 
-    return MATERIAL_SPECS[f'{name} Filtered Material Spec']
+    return MATERIAL_SPECS.add(('Filtered Material',name),spec)
 
 def build_ground_material_mat_spec(name:str,process_spec:ProcessSpec,form:str='Powder',tags:list=[],notes:str=None):
     '''
@@ -598,7 +580,7 @@ def build_ground_material_mat_spec(name:str,process_spec:ProcessSpec,form:str='P
     '''
     attr_validate('Form',form)
 
-    MATERIAL_SPECS[f'{name} Ground Material Spec'] = MaterialSpec(
+    spec = MaterialSpec(
         name=f'{name} Ground Material Spec',
         template=OBJ_TEMPL['Ground Material'],
         properties=[
@@ -615,7 +597,7 @@ def build_ground_material_mat_spec(name:str,process_spec:ProcessSpec,form:str='P
         notes=notes
     )
 
-    return MATERIAL_SPECS[f'{name} Ground Material Spec']
+    return MATERIAL_SPECS.add(('Ground Material',name),spec)
 
 def build_heated_material_mat_spec(name:str,form:str,process:ProcessSpec,tags:list=[],notes:str=None):
     '''
@@ -631,7 +613,7 @@ def build_heated_material_mat_spec(name:str,form:str,process:ProcessSpec,tags:li
     '''
     attr_validate('Form',form)
 
-    MATERIAL_SPECS[f'{name} Heated Material Spec'] = MaterialSpec(
+    spec = MaterialSpec(
         name=f'{name} Heated Material Spec',
         template=OBJ_TEMPL['Heated Material'],
         process=process,
@@ -648,7 +630,7 @@ def build_heated_material_mat_spec(name:str,form:str,process:ProcessSpec,tags:li
         notes=notes
     )
 
-    return MATERIAL_SPECS[f'{name} Heated Material Spec']
+    return MATERIAL_SPECS.add(('Heated Material',name),spec)
 
 def build_pressed_material_mat_spec(name:str,form:str,process:ProcessSpec,tags:list=[],notes:str=None):
     '''
@@ -664,7 +646,7 @@ def build_pressed_material_mat_spec(name:str,form:str,process:ProcessSpec,tags:l
     '''
     attr_validate('Form',form)
 
-    MATERIAL_SPECS[f'{name} Pressed Material Spec'] = MaterialSpec(
+    spec = MaterialSpec(
         name=f'{name} Pressed  Material Spec',
         template=OBJ_TEMPL['Pressed Material'],
         process=process,
@@ -681,7 +663,7 @@ def build_pressed_material_mat_spec(name:str,form:str,process:ProcessSpec,tags:l
         notes=notes
     )
 
-    return MATERIAL_SPECS[f'{name} Pressed Material Spec']
+    return MATERIAL_SPECS.add(('Pressed Material',name),spec)
 
 def build_evacuated_material_mat_spec(name:str,form:str,process:ProcessSpec,tags:list=[],notes:str=None):
     '''
@@ -697,7 +679,7 @@ def build_evacuated_material_mat_spec(name:str,form:str,process:ProcessSpec,tags
     '''
     attr_validate('Form',form)
 
-    MATERIAL_SPECS[f'{name} Evacuated Material Spec'] = MaterialSpec(
+    spec = MaterialSpec(
         name=f'{name} Evacuated  Material Spec',
         template=OBJ_TEMPL['Evacuated Material'],
         process=process,
@@ -714,9 +696,9 @@ def build_evacuated_material_mat_spec(name:str,form:str,process:ProcessSpec,tags
         notes=notes
     )
 
-    return MATERIAL_SPECS[f'{name} Evacuated Material Spec']
+    return MATERIAL_SPECS.add(('Evacuated Material',name),spec)
 
-def build_raw_material_mat_spec(name:str,form:str,purity:float,tags:list=[],notes:str=None):
+def build_raw_material_mat_spec(name:str,form:str,purity:float,process:ProcessSpec=None,tags:list=[],notes:str=None):
     '''
     Builds a material spec for a Raw Material.
 
@@ -728,13 +710,14 @@ def build_raw_material_mat_spec(name:str,form:str,purity:float,tags:list=[],note
         ex: 'Powder', 'Rod'
     Purity: Purity of the material as a percent
         ex: 99.996
+    Process: Purchasing process spec of the material, as built by build_acquire_raw_material_proc_spec
     '''
     attr_validate('Form',form)
 
-    MATERIAL_SPECS[f'{name} Raw Material Spec'] = MaterialSpec(
+    spec = MaterialSpec(
         name=f'{name} Raw Material Spec',
         template=OBJ_TEMPL['Raw Material'],
-        process=PROCESS_SPECS[f'Purchasing {name} Spec'],
+        process=process,
         properties=[
             PropertyAndConditions(
                 property=Property(
@@ -756,7 +739,7 @@ def build_raw_material_mat_spec(name:str,form:str,purity:float,tags:list=[],note
     )
 
             
-    return MATERIAL_SPECS[f'{name} Raw Material Spec']
+    return MATERIAL_SPECS.add(('Raw Material',name),spec)
 
 def build_dissolved_material_mat_spec(name:str,form:str='Solution',process:ProcessSpec=None,tags:list=[],notes:str=None):
     '''
@@ -772,7 +755,7 @@ def build_dissolved_material_mat_spec(name:str,form:str='Solution',process:Proce
     '''
     attr_validate('Form',form)
 
-    MATERIAL_SPECS[f'{name} Dissolved Material Spec'] = MaterialSpec(
+    spec = MaterialSpec(
         name=f'{name} Dissolved Material Spec',
         template=OBJ_TEMPL['Solution Material'],
         process=process,
@@ -789,7 +772,7 @@ def build_dissolved_material_mat_spec(name:str,form:str='Solution',process:Proce
         notes=notes
     )
 
-    return MATERIAL_SPECS[f'{name} Dissolved Material Spec']
+    return MATERIAL_SPECS.add(('Dissolved Material',name),spec)
 
 def build_terminal_material_spec(name:str,form:str,process:ProcessSpec,tags:list=[],notes:str=None):
     '''
@@ -805,7 +788,7 @@ def build_terminal_material_spec(name:str,form:str,process:ProcessSpec,tags:list
     '''
     attr_validate('Form',form)
 
-    MATERIAL_SPECS[f'{name} Terminal Material Spec'] = MaterialSpec(
+    spec = MaterialSpec(
         name=f'{name} Terminal Material Spec',
         template=OBJ_TEMPL['Terminal Material'],
         process=process,
@@ -822,7 +805,7 @@ def build_terminal_material_spec(name:str,form:str,process:ProcessSpec,tags:list
         notes=notes
     )
 
-    return MATERIAL_SPECS[f'{name} Terminal Material Spec']
+    return MATERIAL_SPECS.add(('Terminal Material',name),spec)
 
 def build_ldfz_material_spec(name:str,form:str,process:ProcessSpec,tags:list=[],notes:str=None):
     '''
@@ -838,7 +821,7 @@ def build_ldfz_material_spec(name:str,form:str,process:ProcessSpec,tags:list=[],
     '''
     attr_validate('Form',form)
 
-    MATERIAL_SPECS[f'{name} LDFZ Material Spec'] = MaterialSpec(
+    spec = MaterialSpec(
         name=f'{name} LDFZ Material Spec',
         template=OBJ_TEMPL['LDFZ Material'],
         process=process,
@@ -855,11 +838,11 @@ def build_ldfz_material_spec(name:str,form:str,process:ProcessSpec,tags:list=[],
         notes=notes
     )
 
-    return MATERIAL_SPECS[f'{name} LDFZ Material Spec']
+    return MATERIAL_SPECS.add(('LDFZ Material',name),spec)
 
 ### Ingredient Spec Builders ###
 
-INGREDIENT_SPECS = {}
+INGREDIENT_SPECS = SpecCache('INGREDIENT_SPECS')
 
 def build_ingredient_spec(name:str,process:ProcessSpec,material:MaterialSpec,quantity,tags:list=[],notes:str=None):
     '''
@@ -876,7 +859,7 @@ def build_ingredient_spec(name:str,process:ProcessSpec,material:MaterialSpec,qua
     Units: Units of quantity 
         ex: g, mL, mm
     '''
-    INGREDIENT_SPECS[f'{name} Ingredient Spec'] = IngredientSpec(
+    spec = IngredientSpec(
         name=f'{name} Ingredient Spec',
         process=process,
         material=material,
@@ -885,11 +868,11 @@ def build_ingredient_spec(name:str,process:ProcessSpec,material:MaterialSpec,qua
         notes=notes
     )
 
-    return INGREDIENT_SPECS[f'{name} Ingredient Spec']
+    return INGREDIENT_SPECS.add(('Ingredient',name),spec)
 
 ### Measurement Spec Builders ###
 
-MEASUREMENT_SPECS = {}
+MEASUREMENT_SPECS = SpecCache('MEASUREMENT_SPECS')
 
 def build_temperature_meas_spec():
     pass
@@ -914,7 +897,7 @@ def build_xrd_meas_spec(name:str,duration:float,range:str,adhesive:str,location:
     attr_validate('Location',location)
     attr_validate('XRD Adhesive',adhesive)
 
-    MEASUREMENT_SPECS[f'{name} XRD Measurement Spec'] = MeasurementSpec(
+    spec = MeasurementSpec(
         name=f'{name} XRD Measurement Spec',
         template=OBJ_TEMPL['X-Ray Diffraction'],
         parameters=[
@@ -945,7 +928,7 @@ def build_xrd_meas_spec(name:str,duration:float,range:str,adhesive:str,location:
         notes=notes
     )
 
-    return MEASUREMENT_SPECS[f'{name} XRD Measurement Spec']
+    return MEASUREMENT_SPECS.add(('XRD Measurement',name),spec)
 
 def build_photo_meas_spec(name:str,equipment,location:str,file=None,tags:list=[],notes:str=None):
     '''
@@ -961,7 +944,7 @@ def build_photo_meas_spec(name:str,equipment,location:str,file=None,tags:list=[]
     attr_validate('Location',location)
     attr_validate('Equipment Used',equipment)
 
-    MEASUREMENT_SPECS[f'{name} Photo Measurement Spec'] = MeasurementSpec(
+    spec = MeasurementSpec(
         name=f'{name} Photo Measurement Spec',
         template=OBJ_TEMPL['Photography'],
         parameters=[
@@ -982,4 +965,4 @@ def build_photo_meas_spec(name:str,equipment,location:str,file=None,tags:list=[]
         notes=notes
     )
 
-    return MEASUREMENT_SPECS[f'{name} Photo Measurement Spec']
\ No newline at end of file
+    return MEASUREMENT_SPECS.add(('Photo Measurement',name),spec)
\ No newline at end of file
@@ -0,0 +1,146 @@
+# Bounded cache of the specs built by the spec builders
+
+### Imports ###
+
+from collections import OrderedDict
+from functools import partial
+import warnings
+import weakref
+
+### Spec Cache ###
+
+class SpecCache:
+    '''
+    Cache of built specs, keyed explicitly by (kind, name), e.g., ('Heating', 'YVO4') for the spec 'Heating YVO4 Spec'.
+
+    The cache is bounded by `maxsize`, evicting the least recently used spec, and/or holds weak references only
+    (`weak=True`), in which case a spec is dropped as soon as nothing else (e.g., a BaseNode) uses it.
+    Either way, memory stays flat when building many samples in a loop.
+
+    Adding a different spec under a key that is already cached is a collision. Collisions are expected, since
+    notebooks build several specs per key, e.g., every heating step of a sample is ('Heating', 'GBM1007'), and
+    the cache then holds the latest one. A collision is a conflict when the two specs were built with different
+    templates, i.e., two builders share a key. The templates are compared as they were when the specs were added,
+    since wrapping a spec in a BaseNode replaces its template with that of the node class. Collisions are handled according to `on_collision`:
+
+    'replace': replace the cached spec, and warn on conflicts only
+    'warn': replace the cached spec and warn on every collision
+    'raise': raise a KeyError on every collision
+    '''
+
+    COLLISION_POLICIES = ('replace','warn','raise')
+
+    def __init__(self,name:str,maxsize:int=1024,weak:bool=False,on_collision:str='replace'):
+        '''
+        ### Parameters
+
+        Name: Name of the cache, used in messages
+            ex: 'PROCESS_SPECS'
+        Maxsize: Maximum number of cached specs, or None for no limit
+        Weak: Whether to hold weak references to the specs only
+        On_collision: How to handle a different spec added under a cached key, one of COLLISION_POLICIES
+        '''
+        if maxsize is not None and maxsize < 1:
+            raise ValueError(f'maxsize must be None or at least 1, but found {maxsize}.')
+        if on_collision not in self.COLLISION_POLICIES:
+            raise ValueError(f'on_collision must be one of {self.COLLISION_POLICIES}, but found {on_collision!r}.')
+        self.name = name
+        self.maxsize = maxsize
+        self.weak = weak
+        self.on_collision = on_collision
+        self._entries = OrderedDict()
+        self._built_with = {}   # template of each cached spec when it was added, see add
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.conflicts = 0
+        self.evictions = 0
+
+    def add(self,key:tuple,spec):
+        '''
+        Caches a spec under a key and returns the spec, so that builders can end with `return CACHE.add(key,spec)`.
+
+        ### Parameters
+
+        Key: (kind, name) tuple
+            ex: ('Heating', 'YVO4')
+        Spec: the spec to cache
+        '''
+        cached = self._get(key)
+        if cached is not None and cached is not spec:
+            self.collisions += 1
+            conflict = self._built_with.get(key) is not getattr(spec,'template',None)
+            self.conflicts += conflict
+            if self.on_collision == 'raise':
+                raise KeyError(f'{self.name} already holds a different spec under {key}.')
+            if self.on_collision == 'warn' or conflict:
+                reason = 'with another template ' if conflict else ''
+                warnings.warn(f'{self.name} already holds a different spec {reason}under {key}, it is replaced.',stacklevel=3)
+
+        self._entries[key] = weakref.ref(spec,partial(self._on_collected,key)) if self.weak else spec
+        self._built_with[key] = getattr(spec,'template',None)
+        self._entries.move_to_end(key)
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            evicted,_ = self._entries.popitem(last=False)
+            del self._built_with[evicted]
+            self.evictions += 1
+        return spec
+
+    def __getitem__(self,key:tuple):
+        spec = self._get(key)
+        if spec is None:
+            self.misses += 1
+            raise KeyError(f'{self.name} holds no spec under {key}, it was either never built or evicted.')
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return spec
+
+    def get(self,key:tuple,default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def _get(self,key:tuple):
+        '''
+        Returns the spec cached under a key, or None, without counting a hit or a miss.
+        '''
+        entry = self._entries.get(key)
+        if self.weak and entry is not None:
+            return entry()
+        return entry
+
+    def _on_collected(self,key:tuple,ref:weakref.ref):
+        '''
+        Drops the entry of a weakly cached spec that was garbage collected, unless another spec replaced it.
+        '''
+        if self._entries.get(key) is ref:
+            del self._entries[key]
+            del self._built_with[key]
+            self.evictions += 1
+
+    def __contains__(self,key:tuple):
+        return self._get(key) is not None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def clear(self):
+        self._entries.clear()
+        self._built_with.clear()
+
+    def stats(self):
+        '''
+        Returns the number of cached specs, hits, misses, collisions, conflicts and evictions.
+        '''
+        return {
+            'size':len(self),
+            'hits':self.hits,
+            'misses':self.misses,
+            'collisions':self.collisions,
+            'conflicts':self.conflicts,
+            'evictions':self.evictions,
+        }
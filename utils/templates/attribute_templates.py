@@ -7,6 +7,8 @@ from gemd.entity.bounds import CategoricalBounds, RealBounds, IntegerBounds, Com
 import json
 import os
 
+from tools.entity.base.template_store import LazyTemplates
+
 ### Load Bounds Config ###
 
 script_path = os.path.abspath(__file__)
@@ -14,25 +16,44 @@ script_dir = os.path.dirname(script_path)
 file_path = os.path.join(script_dir, 'bounds_config.json')
 
 def load_config():
+    '''
+    Loads the bounds config and checks that each attribute has a list of unique categories,
+    so that templates built later from it (on first access of ATTR_TEMPL) cannot fail on a malformed entry.
+    '''
     with open(file_path, 'r') as file:
         config = json.load(file)
+    validate_config(config)
     return config
 
+def validate_config(config:dict):
+    '''
+    Raises a ValueError if the bounds config is malformed.
+    '''
+    if not isinstance(config.get('BOUNDS'),dict):
+        raise ValueError(f'The bounds config must have a BOUNDS dict, but found {type(config.get("BOUNDS")).__name__}.')
+    for attr,bounds in config['BOUNDS'].items():
+        categories = bounds.get('categories')
+        if not isinstance(categories,list) or not all(isinstance(category,str) for category in categories):
+            raise ValueError(f'The categories of {attr} must be a list of str, but found {categories!r}.')
+        if len(set(categories)) != len(categories):
+            raise ValueError(f'The categories of {attr} must be unique, but found {len(categories) - len(set(categories))} duplicates.')
+
 config = load_config()
 
-ATTR_TEMPL = {}
+# templates are built (and interned in TEMPLATES) on first access
+ATTR_TEMPL = LazyTemplates()
 
 ### Property Templates ###
 
 name = 'Form'
-ATTR_TEMPL[name] = PropertyTemplate(
+ATTR_TEMPL[name] = lambda name=name: PropertyTemplate(
     name,
     bounds=CategoricalBounds(config['BOUNDS'][name]['categories']),
     description='The form of a particular material'
 )
 
 name = 'Purity Percentage'
-ATTR_TEMPL[name] = PropertyTemplate(
+ATTR_TEMPL[name] = lambda name=name: PropertyTemplate(
     name,
     bounds=RealBounds(0.0,100.0,''),
     description='The purity of a particular material as a percentage, also known as percent weight'
@@ -41,7 +62,7 @@ ATTR_TEMPL[name] = PropertyTemplate(
 ### Parameter Templates ###
 
 name = 'XRD Adhesive'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=CategoricalBounds(config['BOUNDS'][name]['categories']),
     description='The adhesive agent used to prepare a sample for XRD'
@@ -49,14 +70,14 @@ ATTR_TEMPL[name] = ParameterTemplate(
 
 # TODO: Maybe add categorical bounds like in Lot ID?
 name = 'CAS RN'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=CategoricalBounds(config['BOUNDS'][name]['categories']),
     description='The CAS Registry Number (RN) for a particular reagent'
 )
 
 name = 'Duration'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=RealBounds(0,96,'hr'),
     description='Duration of any process, measurement, etc. In our case, it is often used for durations of dwell and ramp up/down times in heating phases, but can also be used to specify measurement/process duration',
@@ -64,70 +85,70 @@ ATTR_TEMPL[name] = ParameterTemplate(
 )
 
 name = 'Equipment Used'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=CategoricalBounds(config['BOUNDS'][name]['categories']),
     description='A parameter describing the equipment used in a particular process or measurement',
 )
 
 name = 'Furnace Rate'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=RealBounds(0,100,'degC'),
     description='The rate at which the furnace is heated/cooled during a heating phase expressed in degC/hr',
 )
 
 name = 'Furnace Temperature'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=RealBounds(0,1100,'degC'),
     description="The temperature of a heating phase in a furnace. Can be dynamic with a schedule or fixed like a pre-heating temperature",
 )
 
 name = 'Laser Power'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=RealBounds(0.,100.,''),
     description='The power of the diode lasers in the LDFZ expressed as a percentage'
 )
 
 name = 'Laser Rate'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=RealBounds(0.,100.,''),
     description='The power ramp rate of the diode lasers in the LDFZ expressed as a percentage/hr'
 )
 
 name = 'Lot ID'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=CategoricalBounds(config['BOUNDS'][name]['categories']),
     description='The particular Lot of a material purchased from a manufacturer',
 )
 
 name = 'Manufacturer'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=CategoricalBounds(config['BOUNDS'][name]['categories']),
     description='The name of the manufacturer from which a raw material was ordered'
 )
 
 name = 'Pressure'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=RealBounds(0,500,'MPa'),
     description='The pressure at which a sample is held during a given process. In our case, it is often used for pressing rods or pellets',
 )
 
 name = 'Solvent'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=CategoricalBounds(config['BOUNDS'][name]['categories']),
     description='The solvent used to wash a filtration'
 )
 
 name = 'Step'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=CompositionBounds(
         components=['Number','Type','Temp','Duration']
@@ -136,21 +157,21 @@ ATTR_TEMPL[name] = ParameterTemplate(
 )
 
 name = 'StepsNum'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=IntegerBounds(1,100),
     description='The number of steps in a process'
 )
 
 name = 'Time of Event'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=RealBounds(0,96,'hr'),
     description='Time at which an event occurs. Can be relative to the start/end of a process, or absolute, however specified',
 )
 
 name = 'XRD Range'
-ATTR_TEMPL[name] = ParameterTemplate(
+ATTR_TEMPL[name] = lambda name=name: ParameterTemplate(
     name,
     bounds=CategoricalBounds(config['BOUNDS'][name]['categories']),
     description='The range of angles at which an X-ray Diffraction measurement is taken, usually expressed as 2*theta',
@@ -159,14 +180,14 @@ ATTR_TEMPL[name] = ParameterTemplate(
 ### Condition Templates ###
 
 name = 'Atmosphere'
-ATTR_TEMPL[name] = ConditionTemplate(
+ATTR_TEMPL[name] = lambda name=name: ConditionTemplate(
     name,
     bounds=CategoricalBounds(config['BOUNDS'][name]['categories']),
     description='A condition describing the atmosphere in which a process occurs',
 )
 
 name = 'Location'
-ATTR_TEMPL[name] = ConditionTemplate(
+ATTR_TEMPL[name] = lambda name=name: ConditionTemplate(
     name,
     bounds=CategoricalBounds(config['BOUNDS'][name]['categories']),
     description='A condition describing the location in which a process or measurement is performed',
@@ -5,13 +5,15 @@
 from gemd.entity.bounds import RealBounds
 from gemd.entity.template import ProcessTemplate, MaterialTemplate, MeasurementTemplate
 from .attribute_templates import ATTR_TEMPL
+from tools.entity.base.template_store import LazyTemplates
 
-OBJ_TEMPL = {}
+# templates are built (and interned in TEMPLATES) on first access
+OBJ_TEMPL = LazyTemplates()
 
 ### Material Templates ###
 
 name = 'Chunked Material'
-OBJ_TEMPL[name] = MaterialTemplate(
+OBJ_TEMPL[name] = lambda name=name: MaterialTemplate(
     name,
     description='A material chunked into small pieces to attain specific mass and/or volume',
     properties=[
@@ -20,7 +22,7 @@ OBJ_TEMPL[name] = MaterialTemplate(
 )
 
 name = 'Filtered Material'
-OBJ_TEMPL[name] = MaterialTemplate(
+OBJ_TEMPL[name] = lambda name=name: MaterialTemplate(
     name,
     description='A material filtered out of a solution',
     properties=[
@@ -29,7 +31,7 @@ OBJ_TEMPL[name] = MaterialTemplate(
 )
 
 name = 'Ground Material'
-OBJ_TEMPL[name] = MaterialTemplate(
+OBJ_TEMPL[name] = lambda name=name: MaterialTemplate(
     name,
     description='A material ground into a powder',
     properties=[
@@ -38,7 +40,7 @@ OBJ_TEMPL[name] = MaterialTemplate(
 )
 
 name = 'Heated Material'
-OBJ_TEMPL[name] = MaterialTemplate(
+OBJ_TEMPL[name] = lambda name=name: MaterialTemplate(
     name,
     description='A material produced from a Partlow heating process, whether for purification, synthesis or else',
     properties=[
@@ -47,7 +49,7 @@ OBJ_TEMPL[name] = MaterialTemplate(
 )
 
 name = 'Pressed Material'
-OBJ_TEMPL[name] = MaterialTemplate(
+OBJ_TEMPL[name] = lambda name=name: MaterialTemplate(
     name,
     description='A material pressed into a rod or pellet using a press',
     properties=[
@@ -56,7 +58,7 @@ OBJ_TEMPL[name] = MaterialTemplate(
 )
 
 name = 'Raw Material'
-OBJ_TEMPL[name] = MaterialTemplate(
+OBJ_TEMPL[name] = lambda name=name: MaterialTemplate(
     name,
     description='A raw material purchased from a manufacturer',
     properties=[
@@ -66,7 +68,7 @@ OBJ_TEMPL[name] = MaterialTemplate(
 )
 
 name = 'Solution Material'
-OBJ_TEMPL[name] = MaterialTemplate(
+OBJ_TEMPL[name] = lambda name=name: MaterialTemplate(
     name,
     description='A solution of one or more constiuent materials',
     properties=[
@@ -75,7 +77,7 @@ OBJ_TEMPL[name] = MaterialTemplate(
 )
 
 name = 'Evacuated Material'
-OBJ_TEMPL[name] = MaterialTemplate(
+OBJ_TEMPL[name] = lambda name=name: MaterialTemplate(
     name,
     description='A material under vacuum',
     properties=[
@@ -84,7 +86,7 @@ OBJ_TEMPL[name] = MaterialTemplate(
 )
 
 name = 'Terminal Material'
-OBJ_TEMPL[name] = MaterialTemplate(
+OBJ_TEMPL[name] = lambda name=name: MaterialTemplate(
     name,
     description='The final material in a synthesis process',
     properties=[
@@ -95,13 +97,13 @@ OBJ_TEMPL[name] = MaterialTemplate(
 ### Process Templates ###
 
 name = 'Chunking Material'
-OBJ_TEMPL[name] = ProcessTemplate(
+OBJ_TEMPL[name] = lambda name=name: ProcessTemplate(
     name,
     description='Chunking mass of a material to match some mass, volume or other characteristic'
 )
 
 name = 'Dissolving Material'
-OBJ_TEMPL[name] = ProcessTemplate(
+OBJ_TEMPL[name] = lambda name=name: ProcessTemplate(
     name,
     description='Dissolving a material into a solution',
     conditions=[
@@ -113,7 +115,7 @@ OBJ_TEMPL[name] = ProcessTemplate(
 )
 
 name = 'Filtering Material'
-OBJ_TEMPL[name] = ProcessTemplate(
+OBJ_TEMPL[name] = lambda name=name: ProcessTemplate(
     name,
     description='Filtering a solid material out of a solution',
     conditions=[
@@ -125,7 +127,7 @@ OBJ_TEMPL[name] = ProcessTemplate(
 )
 
 name = 'Grinding Material'
-OBJ_TEMPL[name] = ProcessTemplate(
+OBJ_TEMPL[name] = lambda name=name: ProcessTemplate(
     name,
     description='Grinding a material into a powder',
     conditions=[
@@ -137,7 +139,7 @@ OBJ_TEMPL[name] = ProcessTemplate(
 )
 
 name = 'Heating Material'
-OBJ_TEMPL[name] = ProcessTemplate(
+OBJ_TEMPL[name] = lambda name=name: ProcessTemplate(
     name,
     description='Heating something in the box furnace with a max temperature and tuning of ramp up/down',
     parameters=[
@@ -151,7 +153,7 @@ OBJ_TEMPL[name] = ProcessTemplate(
 )
 
 name = 'Improved Heating Material'
-OBJ_TEMPL[name] = ProcessTemplate(
+OBJ_TEMPL[name] = lambda name=name: ProcessTemplate(
     name,
     description='Heating a material in a box furnace with a series of steps',
     parameters=[
@@ -163,7 +165,7 @@ OBJ_TEMPL[name] = ProcessTemplate(
 )
 
 name = 'LDFZ Material'
-OBJ_TEMPL[name] = ProcessTemplate(
+OBJ_TEMPL[name] = lambda name=name: ProcessTemplate(
     name,
     description='Heating a material in the laser-diode floating zone furnace',
     parameters=[
@@ -179,7 +181,7 @@ OBJ_TEMPL[name] = ProcessTemplate(
 )
 
 name = 'Pressing Material'
-OBJ_TEMPL[name] = ProcessTemplate(
+OBJ_TEMPL[name] = lambda name=name: ProcessTemplate(
     name,
     description='Pressing materials with pressing equipment to transform into rods or pellets',
     conditions=[
@@ -193,7 +195,7 @@ OBJ_TEMPL[name] = ProcessTemplate(
 )
 
 name = 'Evacuating Material'
-OBJ_TEMPL[name] = ProcessTemplate(
+OBJ_TEMPL[name] = lambda name=name: ProcessTemplate(
     name,
     description='Putting a material under vacuum.',
     conditions=[
@@ -206,7 +208,7 @@ OBJ_TEMPL[name] = ProcessTemplate(
 )
 
 name = 'Purchasing Raw Material'
-OBJ_TEMPL[name] = ProcessTemplate(
+OBJ_TEMPL[name] = lambda name=name: ProcessTemplate(
     name,
     description='Purchasing any particular raw material from a manufacturer',
     parameters=[
@@ -217,7 +219,7 @@ OBJ_TEMPL[name] = ProcessTemplate(
 )
 
 name = 'Quenching Tube'
-OBJ_TEMPL[name] = ProcessTemplate(
+OBJ_TEMPL[name] = lambda name=name: ProcessTemplate(
     name,
     description='''Removing tube from tube furnacew with tongs to grab the tube wrapped with wire and submerge in water''',
     conditions=[
@@ -230,7 +232,7 @@ OBJ_TEMPL[name] = ProcessTemplate(
 )
 
 name = 'Sealing Vessel'
-OBJ_TEMPL[name] = ProcessTemplate(
+OBJ_TEMPL[name] = lambda name=name: ProcessTemplate(
     name,
     description='Sealing vessel of reaction according to desired lay out',
     conditions=[
@@ -242,7 +244,7 @@ OBJ_TEMPL[name] = ProcessTemplate(
 )
 
 name = 'Setting Pellets'
-OBJ_TEMPL[name] = ProcessTemplate(
+OBJ_TEMPL[name] = lambda name=name: ProcessTemplate(
     name,
     description = 'Setting up pellets for experience with appropriate location, distance, or equipment specifications',
     conditions = [
@@ -256,7 +258,7 @@ OBJ_TEMPL[name] = ProcessTemplate(
 ### Measurement Templates ###
 
 name = 'Temperature Measurement'
-OBJ_TEMPL[name] = MeasurementTemplate(
+OBJ_TEMPL[name] = lambda name=name: MeasurementTemplate(
     name,
     description = 'Measuring the temperature of pellets (=temperature gradient of tube) in a tube furnace heating ',
     conditions = [
@@ -268,7 +270,7 @@ OBJ_TEMPL[name] = MeasurementTemplate(
 )
 
 name = 'X-Ray Diffraction'
-OBJ_TEMPL[name] = MeasurementTemplate(
+OBJ_TEMPL[name] = lambda name=name: MeasurementTemplate(
     name,
     description = 'Applying x-ray diffraction to discover structure and properties of a material ',
     conditions = [
@@ -282,7 +284,7 @@ OBJ_TEMPL[name] = MeasurementTemplate(
 )
 
 name = 'Photography'
-OBJ_TEMPL[name] = MeasurementTemplate(
+OBJ_TEMPL[name] = lambda name=name: MeasurementTemplate(
     name,
     description = 'Takign photographs of a sample',
     parameters = [
@@ -291,4 +293,4 @@ OBJ_TEMPL[name] = MeasurementTemplate(
     conditions = [
         ATTR_TEMPL['Location']
     ]
-)
\ No newline at end of file
+)